@@ -12,6 +12,7 @@ Usage:
     python auto_update_and_push.py
 """
 
+import os
 import subprocess
 import sys
 from datetime import datetime
@@ -63,7 +64,10 @@ except subprocess.CalledProcessError as e:
 print("\n[4/5] Committing changes...")
 try:
     # Stage files
-    subprocess.run(["git", "add", "dashboard.html", "index.html"], check=True)
+    # assets/ holds the content-hashed CSS/JS when the dashboard is built in hashed mode,
+    # data/ the lazily loaded race chart history
+    publish_paths = ["dashboard.html", "index.html"] + [d for d in ("assets", "data") if os.path.isdir(d)]
+    subprocess.run(["git", "add", *publish_paths], check=True)
 
     # Create commit message with timestamp
     timestamp = datetime.now().strftime('%B %d, %Y at %H:%M:%S')
@@ -0,0 +1,3 @@
+"""
+AVU Top Campaigns dashboard package
+"""
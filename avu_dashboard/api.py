@@ -0,0 +1,260 @@
+"""
+Read-only JSON API for the local dashboard server
+
+DashboardAPI answers from the scored campaign frame and the winners history
+of the last run, held in memory:
+
+    /api/winners?window=7&k=10   top k campaigns started in the last `window` days (0 = all), optionally
+                                 of one segment: &price_tier=luxury, &stock_tier=blue, &min_stock=50
+                                 (tier names: filters.PRICE_TIERS / STOCK_TIERS)
+    /api/campaign/<no>           one campaign
+    /api/history?campaign=<no>   that campaign's rank and score in every history snapshot
+    /api/tiers                   campaign count, sales and conversion per price / stock tier
+
+Each distinct query is serialised once and cached until update() loads the
+next run or the date changes (windows count calendar days up to today).
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any
+from urllib.parse import parse_qs, unquote
+
+import pandas as pd
+
+from avu_dashboard.filters import FilterIndex, at_least, price_tier, since, stock_tier
+
+DEFAULT_K = 10
+MAX_K = 1000
+
+# Campaign record fields: (JSON key, frame column, type); keys match the All Campaigns blob
+API_FIELDS = [
+    ('overall_position', 'Overall_Position', 'int'),
+    ('campaign_no', 'Campaign_No', 'text'),
+    ('delayed', 'Delayed_Sending', 'bool'),
+    ('price_tier', 'Price_Tier', 'text'),
+    ('stock_tier', 'Stock_Tier', 'text'),
+    ('wine', 'Wine', 'text'),
+    ('vintage', 'Vintage', 'int'),
+    ('producer', 'Producer_Name', 'text'),
+    ('starting_date', 'Starting_Date', 'date'),
+    ('email_sent', 'Email_Sent', 'int'),
+    ('unique_bought', 'Unique_Bought', 'int'),
+    ('conversion_rate', 'Conversion_Rate_%', 'float'),
+    ('total_sales', 'Total_Sales_Amount_LCY', 'float'),
+    ('weighted_score', 'Weighted_Score', 'float'),
+    ('bottle_price', 'Main_Bottle_Price_LCY', 'float'),
+    ('stock_quantity', 'stock_quantity', 'int'),
+    ('main_item_no', 'Main_Item_No', 'int'),
+]
+
+# History entry fields copied from each snapshot's top_15_winners records
+HISTORY_FIELDS = ('rank', 'weighted_score', 'conversion_rate', 'total_sales', 'unique_customers', 'price_tier')
+
+
+class APIError(Exception):
+    """Client error with the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def column_values(frame, column, kind):
+    """One frame column as a JSON-ready list"""
+    values = frame[column] if column in frame.columns else pd.Series(index=frame.index, dtype=object)
+    if kind == 'int':
+        return pd.to_numeric(values, errors='coerce').fillna(0).astype(int).tolist()
+    if kind == 'float':
+        return pd.to_numeric(values, errors='coerce').fillna(0).round(4).tolist()
+    if kind == 'date':
+        return pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m-%d').fillna('').tolist()
+    if kind == 'bool':
+        return (values == True).tolist()
+    return values.fillna('').astype(str).tolist()
+
+
+@dataclass
+class APIData:
+    """Indexes over one dashboard run; update() replaces the whole object, never its fields"""
+    build_id: Any = None
+    as_of: Any = None
+    rows: int = 0
+    columns: dict = field(default_factory=dict)
+    filters: FilterIndex = field(default_factory=lambda: FilterIndex(pd.DataFrame()))
+    campaign_index: dict = field(default_factory=dict)
+    history_index: dict = field(default_factory=dict)
+    snapshot_count: int = 0
+
+    def record(self, position):
+        """Campaign record at one ranked position"""
+        return {key: self.columns[key][position] for key, _, _ in API_FIELDS}
+
+    def winners(self, window, k, today, price_tier_name=None, stock_tier_name=None, min_stock=None):
+        """Top k of the campaigns started in the `window` calendar days up to today, optionally of one segment"""
+        rules = []
+        segment = {}
+        try:
+            if price_tier_name:
+                rules.append(price_tier(price_tier_name, column='price_tier'))
+                segment['price_tier'] = price_tier_name
+            if stock_tier_name:
+                rules.append(stock_tier(stock_tier_name, column='stock_tier'))
+                segment['stock_tier'] = stock_tier_name
+        except ValueError as e:
+            raise APIError(400, str(e))
+        if min_stock is not None:
+            rules.append(at_least('stock_quantity', min_stock))
+            segment['min_stock'] = min_stock
+        if window:
+            # Midnight cutoff: the rule (and its cached bitset) stays the same all day
+            rules.append(since('starting_date', today - timedelta(days=window)))
+        positions = self.filters.rows(*rules)[:k] if rules else range(min(k, self.rows))
+        return {'window': window, 'k': k, **segment, 'winners': [self.record(int(position)) for position in positions]}
+
+    def campaign(self, campaign_no):
+        position = self.campaign_index.get(campaign_no)
+        if position is None:
+            raise APIError(404, f"Unknown campaign: {campaign_no}")
+        return {'campaign': self.record(position)}
+
+    def history(self, campaign_no):
+        if campaign_no not in self.campaign_index and campaign_no not in self.history_index:
+            raise APIError(404, f"Unknown campaign: {campaign_no}")
+        return {'campaign_no': campaign_no, 'snapshots': self.snapshot_count,
+                'history': self.history_index.get(campaign_no, [])}
+
+    def tiers(self):
+        frame = pd.DataFrame({key: self.columns[key] for key in
+                              ('price_tier', 'stock_tier', 'total_sales', 'conversion_rate')})
+        result = {}
+        for kind in ('price_tier', 'stock_tier'):
+            grouped = frame.groupby(kind, sort=False).agg(
+                campaigns=('total_sales', 'size'),
+                total_sales=('total_sales', 'sum'),
+                mean_conversion=('conversion_rate', 'mean'),
+            ).round(4)
+            result[kind] = [{'tier': tier, **row} for tier, row in zip(grouped.index, grouped.to_dict('records'))]
+        return result
+
+    def route(self, path, params, today):
+        """Dispatch one API path to its view"""
+        parts = [unquote(part) for part in path.split('/') if part][1:]  # drop the leading "api"
+        if parts == ['winners']:
+            window = int_param(params, 'window', 0, minimum=0)
+            return self.winners(window, int_param(params, 'k', DEFAULT_K, minimum=1, maximum=MAX_K), today,
+                                params.get('price_tier'), params.get('stock_tier'), int_param(params, 'min_stock', None))
+        if len(parts) == 2 and parts[0] == 'campaign':
+            return self.campaign(parts[1])
+        if parts == ['history']:
+            if not params.get('campaign'):
+                raise APIError(400, "Missing campaign parameter")
+            return self.history(params['campaign'])
+        if parts == ['tiers']:
+            return self.tiers()
+        raise APIError(404, f"Unknown endpoint: {path}")
+
+
+class DashboardAPI:
+    """The current run's APIData, swapped whole by update(), with a per-query response cache"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._cache_day = None
+        self.data = APIData()
+
+    @property
+    def build_id(self):
+        return self.data.build_id
+
+    @property
+    def rows(self):
+        return self.data.rows
+
+    @property
+    def snapshot_count(self):
+        return self.data.snapshot_count
+
+    def update(self, campaigns, snapshots, build_id=None):
+        """Load a new run: campaigns is the scored frame (with Price_Tier / Stock_Tier), snapshots the history"""
+        ranked = campaigns.sort_values('Weighted_Score', ascending=False, kind='stable')
+        columns = {key: column_values(ranked, column, kind) for key, column, kind in API_FIELDS}
+        # Segment filters: rule bitsets over the ranked rows, built as queries first use them
+        filters = FilterIndex(pd.DataFrame({
+            'starting_date': pd.to_datetime(ranked['Starting_Date'], errors='coerce').to_numpy(dtype='datetime64[ns]'),
+            'price_tier': pd.Categorical(columns['price_tier']),
+            'stock_tier': pd.Categorical(columns['stock_tier']),
+            'stock_quantity': columns['stock_quantity'],
+        }))
+        # First (best scoring) row wins when a campaign number repeats
+        campaign_index = {}
+        for position, campaign_no in enumerate(columns['campaign_no']):
+            campaign_index.setdefault(campaign_no, position)
+
+        history_index = {}
+        for snapshot in snapshots:
+            for winner in snapshot.get('top_15_winners', []):
+                entry = {'date': snapshot.get('date'), 'analysis_date': snapshot.get('analysis_date')}
+                entry.update({name: winner.get(name) for name in HISTORY_FIELDS})
+                history_index.setdefault(str(winner.get('campaign_no')), []).append(entry)
+
+        as_of = datetime.now()
+        data = APIData(build_id=build_id or as_of.strftime('%Y%m%d%H%M%S'), as_of=as_of, rows=len(ranked),
+                       columns=columns, filters=filters, campaign_index=campaign_index,
+                       history_index=history_index, snapshot_count=len(snapshots))
+        with self._lock:
+            self.data = data
+            self._cache = {}
+
+    def handle(self, path, query):
+        """(status, JSON body bytes, ETag) for one request; successful bodies are cached per query and day"""
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        key = (path.rstrip('/'), tuple(sorted(params.items())))
+        today = datetime.combine(date.today(), time.min)
+        # One build per request: a concurrent update() swaps self.data, never the object read here
+        with self._lock:
+            data = self.data
+            if self._cache_day != today:
+                # Windowed answers move with the date
+                self._cache, self._cache_day = {}, today
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        if data.build_id is None:
+            return error_response(503, "Dashboard data not loaded yet")
+        try:
+            payload = data.route(path, params, today)
+        except APIError as e:
+            return error_response(e.status, str(e))
+
+        body = json.dumps({'build': data.build_id, 'as_of': data.as_of.strftime('%Y-%m-%d'), **payload},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        response = (200, body, f'"{hashlib.sha256(body).hexdigest()[:20]}"')
+        with self._lock:
+            # A response computed while update() swapped in a new run (or the day turned) is not cached
+            if self.data is data and self._cache_day == today:
+                self._cache[key] = response
+        return response
+
+
+def int_param(params, name, default, minimum=None, maximum=None):
+    """Integer query parameter, clamped to maximum; APIError(400) when invalid"""
+    raw = params.get(name)
+    if raw in (None, ''):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise APIError(400, f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise APIError(400, f"{name} must be >= {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def error_response(status, message):
+    body = json.dumps({'error': message}).encode('utf-8')
+    return status, body, None
@@ -0,0 +1,386 @@
+"""
+Benchmark suite: every pipeline step at 1×, 10× and 100× today's data
+
+Times the steps of the pipeline one by one (snapshot loading, the
+HORECA/TRADE/Lead filter, scoring, period selection, producer resolution,
+history append and export, the race chart pivot, chart rendering, the HTML
+page and the GIF) on synthetic data (avu_dashboard.synthetic) scaled from
+today's 153 campaigns, 4,698 stock items and 46 history snapshots, then
+compares the medians with a stored baseline.
+
+    python -m avu_dashboard.benchmark                         1× 10× 100×, compare with the baseline
+    python -m avu_dashboard.benchmark --scales 1 --only score periods
+    python -m avu_dashboard.benchmark --save-baseline         record the baseline (on the reference machine)
+    python -m avu_dashboard.benchmark --only html --save-baseline   re-record one step after an intended change
+    python -m avu_dashboard.benchmark --full                  also the GIF above 1× (minutes: one frame per snapshot)
+
+Each step runs until it has --repeat timings or has used --max-time seconds
+(at least once); inputs it consumes are prepared again, untimed, before
+every run. The generated data sets are kept in .benchmark_data and reused
+while their parameters match. Results go to .benchmark_data/latest.json
+(--json elsewhere) with the commit they were measured at.
+
+Exit status 1 when a step's median is more than --threshold slower than the
+baseline (and by more than MIN_REGRESSION_SECONDS).
+"""
+import argparse
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+from avu_dashboard.config import HISTORY_FILE, RACE_CHART_FILE, PageOptions
+from avu_dashboard.logs import configure
+from avu_dashboard.staging import STAGED_HISTORICAL, STAGED_SNAPSHOTS
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = REPO_DIR / ".benchmark_data"
+BASELINE_FILE = Path(__file__).resolve().parent / "benchmark_baseline.json"
+RESULTS_FILE = "latest.json"
+DATA_PARAMS_FILE = "params.json"
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 5
+DEFAULT_MAX_TIME = 10.0         # seconds per step and scale, after the first run
+DEFAULT_THRESHOLD = 0.25        # 25% slower than the baseline fails
+MIN_REGRESSION_SECONDS = 0.005  # below this, differences are timer noise
+SEED = 46
+BENCH_NOW = datetime(2026, 1, 15, 12, 0)  # fixed, so every machine generates the same data
+
+
+@dataclass
+class Benchmark:
+    """One timed step: setup(data) prepares the arguments (untimed, before every run), run(*args) is timed"""
+    name: str
+    run: Callable
+    setup: Callable = lambda data: (data,)
+    max_scale: Optional[int] = None  # skipped above this scale unless --full
+
+
+@dataclass
+class BenchmarkResult:
+    scale: int
+    benchmark: str
+    median_s: float
+    min_s: float
+    runs_s: List[float] = field(default_factory=list)
+
+
+@dataclass
+class Comparison:
+    scale: int
+    benchmark: str
+    median_s: float
+    baseline_s: Optional[float]
+
+    @property
+    def ratio(self):
+        return self.median_s / self.baseline_s if self.baseline_s else None
+
+    def regressed(self, threshold):
+        return (self.baseline_s is not None and self.median_s > self.baseline_s * (1 + threshold)
+                and self.median_s - self.baseline_s > MIN_REGRESSION_SECONDS)
+
+
+@dataclass
+class BenchData:
+    """One scale's synthetic data set and the stage results the later steps start from"""
+    scale: int
+    data_dir: Path
+    work_dir: Path
+    raw_campaigns: Any = None
+    snapshots: Any = None
+    scores: Any = None
+    periods: Any = None
+    history: Any = None
+    charts: Any = None
+
+    @property
+    def snap_dir(self):
+        return self.data_dir / STAGED_SNAPSHOTS
+
+    @property
+    def historical_dir(self):
+        return self.data_dir / STAGED_HISTORICAL
+
+
+def data_params(scale):
+    """Parameters of a scale's synthetic data set"""
+    from avu_dashboard.synthetic import REFERENCE_CAMPAIGNS, REFERENCE_SNAPSHOTS, REFERENCE_STOCK_ITEMS
+    return {'campaigns': REFERENCE_CAMPAIGNS * scale, 'stock_items': REFERENCE_STOCK_ITEMS * scale,
+            'snapshots': REFERENCE_SNAPSHOTS * scale, 'seed': SEED, 'now': BENCH_NOW.isoformat()}
+
+
+def ensure_data(data_root, scale):
+    """The scale's data set folder, generated unless an identical one is already there"""
+    from avu_dashboard.synthetic import DEFAULT_DAYS, generate_history, generate_snapshots, write_dataset
+
+    data_dir = Path(data_root) / f"scale_{scale}"
+    params = data_params(scale)
+    params_file = data_dir / DATA_PARAMS_FILE
+    if params_file.exists() and json.loads(params_file.read_text(encoding='utf-8')) == params:
+        return data_dir
+    print(f"🧪 Generating the {scale}× data set ({params['campaigns']:,} campaigns, "
+          f"{params['stock_items']:,} stock items, {params['snapshots']:,} snapshots)...")
+    data = generate_snapshots(params['campaigns'], params['stock_items'], seed=SEED, now=BENCH_NOW,
+                              days=max(DEFAULT_DAYS, params['snapshots'] + 30))
+    write_dataset(data_dir, data, generate_history(data, params['snapshots'], now=BENCH_NOW), BENCH_NOW)
+    params_file.write_text(json.dumps(params, indent=2), encoding='utf-8')
+    return data_dir
+
+
+def prepare(data_root, scale):
+    """BenchData with every stage result computed once, for the steps that start from them"""
+    import pandas as pd
+
+    from avu_dashboard.config import CAMPAIGN_STATS_FILE
+    from avu_dashboard.stages.charts import render_charts
+    from avu_dashboard.stages.load import load_snapshots
+    from avu_dashboard.stages.periods import attach_stock
+    from avu_dashboard.stages.score import score_campaigns
+
+    data = BenchData(scale=scale, data_dir=ensure_data(data_root, scale),
+                     work_dir=Path(data_root) / f"work_{scale}")
+    shutil.rmtree(data.work_dir, ignore_errors=True)
+    data.work_dir.mkdir(parents=True)
+    data.raw_campaigns = pd.read_pickle(data.snap_dir / CAMPAIGN_STATS_FILE)
+    data.snapshots = load_snapshots(data.snap_dir)
+    data.scores = score_campaigns(data.snapshots)
+    data.periods = attach_stock(data.scores, data.snapshots, now=BENCH_NOW)
+    data.history = run_history(*fresh_history(data))
+    data.charts = render_charts(data.periods)
+    return data
+
+
+# ---- The timed steps ----
+
+def run_load(data):
+    from avu_dashboard.stages.load import load_snapshots
+    return load_snapshots(data.snap_dir)
+
+
+def run_filter(data):
+    from avu_dashboard.stages.load import filter_campaigns
+    return filter_campaigns(data.raw_campaigns)
+
+
+def run_score(data):
+    from avu_dashboard.stages.score import score_campaigns
+    return score_campaigns(data.snapshots)
+
+
+def run_periods(data):
+    from avu_dashboard.stages.periods import attach_stock
+    return attach_stock(data.scores, data.snapshots, now=BENCH_NOW)
+
+
+def run_producers(data):
+    from avu_dashboard.stages.periods import fill_producers
+    return [fill_producers(period_top, data.snapshots) for period_top in data.periods.period_winners.values()]
+
+
+def fresh_history(data):
+    """A copy of the data set's history files to append to"""
+    historical_dir = data.work_dir / "historical"
+    shutil.rmtree(historical_dir, ignore_errors=True)
+    historical_dir.mkdir()
+    for name in (HISTORY_FILE, RACE_CHART_FILE):
+        shutil.copy(data.historical_dir / name, historical_dir / name)
+    return data.scores, historical_dir
+
+
+def run_history(scores, historical_dir):
+    from avu_dashboard.stages.history import record_history
+    return record_history(scores, historical_dir, now=BENCH_NOW)
+
+
+def run_race_pivot(data):
+    from avu_dashboard.stages.history import race_chart_table
+    return race_chart_table(data.history.historical_data['snapshots'])
+
+
+def run_charts(data):
+    from avu_dashboard.stages.charts import render_charts
+    return render_charts(data.periods)
+
+
+def run_html(data):
+    from avu_dashboard.stages.page import build_page
+    options = PageOptions(size_warn={})  # the scaled-up pages are over the default budgets by design
+    return build_page(data.scores, data.periods, data.history, data.charts, data.work_dir / "dashboard", options)
+
+
+def run_gif(data):
+    from avu_dashboard.stages.gif import render_race_gif
+    return render_race_gif(data.history.race_chart_data, data.work_dir / "race.gif", verbose=False)
+
+
+BENCHMARKS = [
+    Benchmark('load', run_load),
+    Benchmark('filter', run_filter),
+    Benchmark('score', run_score),
+    Benchmark('periods', run_periods),
+    Benchmark('producers', run_producers),
+    Benchmark('history', run_history, setup=fresh_history),
+    Benchmark('race_pivot', run_race_pivot),
+    Benchmark('charts', run_charts),
+    Benchmark('html', run_html),
+    Benchmark('gif', run_gif, max_scale=1),
+]
+BENCHMARK_NAMES = [benchmark.name for benchmark in BENCHMARKS]
+
+
+def time_benchmark(benchmark, data, repeat=DEFAULT_REPEAT, max_time=DEFAULT_MAX_TIME):
+    """BenchmarkResult of up to `repeat` runs, stopping once `max_time` seconds are used"""
+    runs = []
+    spent = 0.0
+    while len(runs) < repeat and (not runs or spent < max_time):
+        args = benchmark.setup(data)
+        started = time.perf_counter()
+        benchmark.run(*args)
+        runs.append(time.perf_counter() - started)
+        spent += runs[-1]
+    return BenchmarkResult(scale=data.scale, benchmark=benchmark.name, median_s=round(statistics.median(runs), 6),
+                           min_s=round(min(runs), 6), runs_s=[round(run, 6) for run in runs])
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, only=None, repeat=DEFAULT_REPEAT, max_time=DEFAULT_MAX_TIME,
+                   full=False, data_root=DATA_DIR):
+    """BenchmarkResult per scale and step"""
+    configure('warning')
+    results = []
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='Glyph')  # emoji chart titles, missing from the default font
+        for scale in scales:
+            data = prepare(data_root, scale)
+            for benchmark in BENCHMARKS:
+                if only and benchmark.name not in only:
+                    continue
+                if benchmark.max_scale and scale > benchmark.max_scale and not full:
+                    continue
+                result = time_benchmark(benchmark, data, repeat, max_time)
+                print(f"   {scale:>4}× {result.benchmark:<12} {result.median_s:>10.4f} s  ({len(result.runs_s)} runs)")
+                results.append(result)
+    return results
+
+
+def git_commit():
+    """Current commit (short hash, '+dirty' with uncommitted changes), None outside a git checkout"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ('+dirty' if dirty else '')
+
+
+def results_document(results, scales):
+    """Results with the commit, machine and data sizes they were measured with"""
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'data': {str(scale): data_params(scale) for scale in scales},
+        'results': [asdict(result) for result in results],
+    }
+
+
+def merge_baseline(baseline, document):
+    """The new results document, keeping the baseline's entries for the steps and scales it did not measure"""
+    measured = {(entry['scale'], entry['benchmark']) for entry in document['results']}
+    kept = [entry for entry in baseline.get('results', []) if (entry['scale'], entry['benchmark']) not in measured]
+    return {**document, 'data': {**baseline.get('data', {}), **document['data']},
+            'results': sorted(kept + document['results'],
+                              key=lambda entry: (entry['scale'], BENCHMARK_NAMES.index(entry['benchmark'])
+                                                 if entry['benchmark'] in BENCHMARK_NAMES else len(BENCHMARK_NAMES)))}
+
+
+def compare(results, baseline):
+    """Comparison per result against a baseline results document"""
+    reference = {(entry['scale'], entry['benchmark']): entry['median_s'] for entry in baseline.get('results', [])}
+    return [Comparison(scale=result.scale, benchmark=result.benchmark, median_s=result.median_s,
+                       baseline_s=reference.get((result.scale, result.benchmark))) for result in results]
+
+
+def print_comparison(comparisons, threshold, baseline):
+    print(f"\n📊 BENCHMARK vs BASELINE ({baseline.get('commit')}, {baseline.get('created')}; "
+          f"threshold +{threshold:.0%})")
+    print("="*78)
+    print(f"{'scale':>5} {'step':<12} {'median s':>10} {'baseline s':>11} {'ratio':>7}  result")
+    for comparison in comparisons:
+        if comparison.baseline_s is None:
+            print(f"{comparison.scale:>4}× {comparison.benchmark:<12} {comparison.median_s:>10.4f} {'-':>11} {'-':>7}  🆕")
+            continue
+        status = "❌ slower" if comparison.regressed(threshold) else "✅"
+        print(f"{comparison.scale:>4}× {comparison.benchmark:<12} {comparison.median_s:>10.4f} "
+              f"{comparison.baseline_s:>11.4f} {comparison.ratio:>6.2f}×  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard pipeline steps at several data scales")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="multiples of today's data (default: 1 10 100)")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARK_NAMES, metavar='STEP',
+                        help=f"steps to run ({', '.join(BENCHMARK_NAMES)})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timings per step (median reported)")
+    parser.add_argument('--max-time', type=float, default=DEFAULT_MAX_TIME, metavar='SECONDS',
+                        help="stop repeating a step after this long (default: %(default)g)")
+    parser.add_argument('--full', action='store_true', help="run the GIF above 1× too")
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help="where the generated data sets are kept")
+    parser.add_argument('--json', type=Path, help=f"results file (default: <data-dir>/{RESULTS_FILE})")
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help="baseline results to compare with")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, 0.25 = 25%% (default: %(default)g)")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results as the new baseline")
+    args = parser.parse_args(argv)
+
+    print(f"⏱️ Benchmarking at {', '.join(f'{scale}×' for scale in args.scales)}")
+    results = run_benchmarks(args.scales, args.only, args.repeat, args.max_time, args.full, args.data_dir)
+    document = results_document(results, args.scales)
+
+    results_file = args.json or args.data_dir / RESULTS_FILE
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    results_file.write_text(json.dumps(document, indent=2), encoding='utf-8')
+    print(f"💾 Results saved to {results_file}")
+
+    if args.save_baseline:
+        if args.baseline.exists():
+            document = merge_baseline(json.loads(args.baseline.read_text(encoding='utf-8')), document)
+        args.baseline.write_text(json.dumps(document, indent=2), encoding='utf-8')
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"⚠️ No baseline at {args.baseline} - run with --save-baseline to record one")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    changed = [scale for scale in args.scales
+               if str(scale) in baseline.get('data', {}) and baseline['data'][str(scale)] != data_params(scale)]
+    if changed:
+        print(f"⚠️ The baseline's data sets differ at {', '.join(f'{scale}×' for scale in changed)} "
+              f"- save a new baseline before trusting the comparison")
+    comparisons = compare(results, baseline)
+    print_comparison(comparisons, args.threshold, baseline)
+    regressions = [comparison for comparison in comparisons if comparison.regressed(args.threshold)]
+    if regressions:
+        print(f"\n❌ {len(regressions)} step(s) slower than the baseline: "
+              + ", ".join(f"{c.benchmark} at {c.scale}× ({c.ratio:.2f}×)" for c in regressions))
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
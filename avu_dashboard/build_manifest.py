@@ -0,0 +1,35 @@
+"""
+Build manifest and live-reload payloads
+
+Each run writes the parts of the page that change between builds as small
+versioned JSON files under data/ (tables, charts, campaigns) and finally a
+build.json manifest listing them with the build id. The local server watches
+build.json and tells open pages about the new build; the pages fetch only
+the payloads whose url (content hash) changed.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from avu_dashboard.html_builder import DATA_SUBDIR, HASH_LENGTH
+
+BUILD_MANIFEST = "build.json"
+
+
+def write_payload(output_dir, name, text):
+    """Write one payload to output_dir/data/name; returns its url versioned by content hash"""
+    data_dir = Path(output_dir) / DATA_SUBDIR
+    data_dir.mkdir(parents=True, exist_ok=True)
+    body = text.encode('utf-8')
+    (data_dir / name).write_bytes(body)
+    return f"{DATA_SUBDIR}/{name}?v={hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}"
+
+
+def write_build_manifest(output_dir, build_info):
+    """Write build.json atomically; it is written last, so watchers only ever see complete builds"""
+    target = Path(output_dir) / BUILD_MANIFEST
+    temporary = target.with_name(target.name + '.tmp')
+    temporary.write_text(json.dumps(build_info, ensure_ascii=False, indent=2), encoding='utf-8')
+    os.replace(temporary, target)
+    return target
@@ -0,0 +1,151 @@
+"""
+Command line for the dashboard pipeline (used by run_dashboard.py)
+
+    python run_dashboard.py                       build the dashboard (load → html)
+    python run_dashboard.py --serve               ... and serve it until Ctrl+C
+    python run_dashboard.py --until periods       run the first stages only
+    python run_dashboard.py --snap-dir D:\\data\\snapshots --output-dir out
+    python run_dashboard.py --force               rebuild every stage, ignoring the build cache
+    python run_dashboard.py --watch --serve       rebuild whenever new snapshots land, and serve
+    python run_dashboard.py --log-json            scheduled runs: JSON events, no console tables
+    python run_dashboard.py --config linux.toml --stage-dir /var/tmp/avu   folders from a config file,
+                                                  inputs copied to local storage first
+
+Defaults come from dashboard.toml and the AVU_* environment variables (see
+avu_dashboard.config); flags override both.
+"""
+import argparse
+import os
+import sys
+import traceback
+from dataclasses import asdict, replace
+from pathlib import Path
+
+# Non-interactive matplotlib backend, picked up when a chart stage first imports pyplot
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from avu_dashboard.config import (
+    ASSET_MODES, CONFIG_ENV, CONFIG_FILE, RACE_DATA_MODES, DashboardPaths, load_settings,
+)
+from avu_dashboard.logs import DEFAULT_LOG_LEVEL, LOG_LEVELS, configure, console, event, say
+from avu_dashboard.pipeline import STAGES, run_pipeline
+from avu_dashboard.watch import DEFAULT_DEBOUNCE, DEFAULT_POLL_INTERVAL, watch_snapshots
+
+
+def config_parser():
+    """--config alone, read before the full parser so the config file can supply its defaults"""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--config', type=Path,
+                        help=f"settings file (default: ${CONFIG_ENV}, else {CONFIG_FILE} here or next to the scripts)")
+    return parser
+
+
+def build_parser(settings):
+    defaults = settings.paths
+    parser = argparse.ArgumentParser(description="Build (and optionally serve) the AVU top campaigns dashboard",
+                                     parents=[config_parser()])
+    parser.add_argument('--snap-dir', type=Path, default=defaults.snap_dir, help="folder with the snapshot pickles")
+    parser.add_argument('--historical-dir', type=Path, default=defaults.historical_dir,
+                        help="folder with the top 15 history and race chart data")
+    parser.add_argument('--output-dir', type=Path, default=defaults.output_dir, help="dashboard output folder")
+    parser.add_argument('--cache-dir', type=Path, default=defaults.cache_dir,
+                        help="build cache for incremental reruns (default: .pipeline_cache next to the scripts)")
+    parser.add_argument('--stage-dir', type=Path, default=defaults.stage_dir,
+                        help="copy the snapshots and history to this local folder before running")
+    parser.add_argument('--no-stage', action='store_true', help="read the synced folders directly (ignore stage_dir)")
+    parser.add_argument('--show-config', action='store_true', help="print the resolved settings and exit")
+    parser.add_argument('--no-cache', action='store_true', help="run every stage without reading or writing the cache")
+    parser.add_argument('--force', action='store_true', help="rerun every stage and refresh the cache")
+    parser.add_argument('--until', choices=STAGES, default='html', help="last stage to run (default: html)")
+    parser.add_argument('--serve', action='store_true', help="serve the dashboard after building it (--until serve)")
+    parser.add_argument('--port', type=int, default=settings.port)
+    parser.add_argument('--gif', action='store_true', help="also render race_chart_animated.gif after the html stage")
+    parser.add_argument('--no-browser', action='store_true', help="do not open a browser when serving")
+    parser.add_argument('--asset-mode', choices=ASSET_MODES, default=settings.options.asset_mode)
+    parser.add_argument('--race-data-mode', choices=RACE_DATA_MODES, default=settings.options.race_data_mode)
+    parser.add_argument('--no-race-gzip', action='store_true', help="skip data/race_chart_data.json.gz")
+    parser.add_argument('--no-precompress', action='store_true', help="skip the .gz/.br siblings")
+    parser.add_argument('--no-live-reload', action='store_true', help="skip data/*.json payloads and build.json")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild whenever the snapshot pickles change")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE, metavar='SECONDS',
+                        help=f"watch: quiet time before a rebuild (default: {DEFAULT_DEBOUNCE:g})")
+    parser.add_argument('--poll-interval', type=float, default=DEFAULT_POLL_INTERVAL, metavar='SECONDS',
+                        help=f"watch: seconds between folder scans when polling (default: {DEFAULT_POLL_INTERVAL:g})")
+    parser.add_argument('--polling', action='store_true', help="watch: poll even where inotify is available")
+    parser.add_argument('--on-build', metavar='COMMAND',
+                        help='watch: shell command run after each rebuild of the page, e.g. "python auto_update_and_push.py"')
+    parser.add_argument('--profile', action='store_true',
+                        help="dump cProfile stats per stage to <output-dir>/profile/<stage>.prof")
+    parser.add_argument('--tracemalloc', action='store_true', help="add per-stage tracemalloc peaks to the run report")
+    parser.add_argument('--quiet', action='store_true', help="skip the per-stage summaries and tables")
+    parser.add_argument('--log-level', choices=LOG_LEVELS, default=DEFAULT_LOG_LEVEL,
+                        help="console detail: debug also prints the notebook tables, warning only problems")
+    parser.add_argument('--verbose', '-v', action='store_true', help="same as --log-level debug")
+    parser.add_argument('--log-json', action='store_true',
+                        help="one JSON event per line (stage timings, warnings) instead of console text")
+    return parser
+
+
+def main(argv=None):
+    config_args, _ = config_parser().parse_known_args(argv)
+    try:
+        settings = load_settings(config_args.config)
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"❌ Settings: {e}", file=sys.stderr)
+        return 2
+    args = build_parser(settings).parse_args(argv)
+    configure('debug' if args.verbose else args.log_level, json_logs=args.log_json)
+    paths = DashboardPaths(snap_dir=args.snap_dir, historical_dir=args.historical_dir, output_dir=args.output_dir,
+                           cache_dir=None if args.no_cache else args.cache_dir,
+                           stage_dir=None if args.no_stage else args.stage_dir)
+    options = replace(
+        settings.options,
+        asset_mode=args.asset_mode,
+        race_data_mode=args.race_data_mode,
+        race_data_gzip=settings.options.race_data_gzip and not args.no_race_gzip,
+        precompress=settings.options.precompress and not args.no_precompress,
+        live_reload=settings.options.live_reload and not args.no_live_reload,
+    )
+
+    if args.show_config:
+        print(f"⚙️ Settings from: {', '.join(settings.sources)} (then command line flags)")
+        for name, value in [*asdict(paths).items(), *asdict(options).items(), ('port', args.port)]:
+            print(f"   {name:<16} {value}")
+        return 0
+
+    say("=" * 80)
+    say("🚀 STARTING DASHBOARD GENERATION")
+    say("=" * 80)
+    say()
+
+    if args.watch:
+        until = 'html' if args.serve or args.until == 'serve' else args.until
+        watch_snapshots(paths, options, debounce=args.debounce, poll_interval=args.poll_interval, polling=args.polling,
+                        until=until, report=not args.quiet, gif=args.gif, serve=args.serve, port=args.port,
+                        open_browser=not args.no_browser, on_build=args.on_build)
+        return 0
+
+    try:
+        run_pipeline(paths, options, until='serve' if args.serve else args.until, report=not args.quiet,
+                     port=args.port, open_browser=not args.no_browser, gif=args.gif, force=args.force,
+                     profile=args.profile, trace_memory=args.tracemalloc)
+    except Exception as e:
+        say()
+        say("=" * 80)
+        say(f"❌ ERROR: {e}", level='error')
+        say("=" * 80)
+        event('failed', level='error', error=repr(e), traceback=traceback.format_exc())
+        if console('error'):
+            traceback.print_exc()
+        return 1
+
+    say()
+    say("=" * 80)
+    say("✅ DASHBOARD GENERATION COMPLETED SUCCESSFULLY")
+    say("=" * 80)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Precompressed build artifacts
+
+Every HTML/JSON/JS/CSS file the page loads (the page itself, assets/ and
+data/) gets a gzip (.gz) sibling at maximum compression, and a brotli (.br)
+sibling when the optional brotli package is installed. Run records next to
+them (build.json, run_report.json, profile/) are left alone. The local server picks the variant the browser
+accepts instead of compressing on every request.
+"""
+import gzip
+import os
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip siblings are written without it
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES = ('.html', '.json', '.js', '.css')
+
+# Content-Encoding -> sibling suffix, in order of preference
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    """Encodings this build can write"""
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+
+def compress_bytes(data, encoding):
+    """Compress data at the maximum level of the given Content-Encoding"""
+    if encoding == 'gzip':
+        # mtime=0 keeps the output identical for identical input
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def precompress_file(path):
+    """Write the compressed siblings of one file; returns {encoding: compressed size}
+
+    A sibling newer than its source is kept as is.
+    """
+    path = Path(path)
+    source_mtime = path.stat().st_mtime
+    data = None
+    sizes = {}
+    for encoding in available_encodings():
+        target = path.with_name(path.name + ENCODINGS[encoding])
+        if not target.exists() or target.stat().st_mtime < source_mtime:
+            if data is None:
+                data = path.read_bytes()
+            # Renamed into place, as the server may read the sibling while it is rewritten
+            temporary = target.with_name(target.name + '.tmp')
+            temporary.write_bytes(compress_bytes(data, encoding))
+            os.replace(temporary, target)
+        sizes[encoding] = target.stat().st_size
+    return sizes
+
+
+def is_sibling(path):
+    """True for a .gz/.br written next to a compressible file"""
+    return path.suffix in ENCODINGS.values() and path.with_suffix('').suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def precompress_tree(root, targets):
+    """Precompress the artifacts named by targets (files or folders directly under root)
+
+    Siblings whose source is gone, and siblings of root-level files that are
+    not targets, are removed. Returns {relative path: {'raw': size, 'gzip': size, 'br': size}}.
+    """
+    root = Path(root)
+    report = {}
+    for entry in root.iterdir():
+        if entry.is_file() and is_sibling(entry) and entry.with_suffix('').name not in targets:
+            entry.unlink()
+    for target in targets:
+        target = root / target
+        if target.is_file():
+            paths = [target]
+        else:
+            paths = [Path(directory) / name for directory, _, files in os.walk(target) for name in files]
+        for path in paths:
+            if is_sibling(path):
+                if not path.with_suffix('').exists():
+                    path.unlink()
+            elif path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+                report[path.relative_to(root).as_posix()] = {'raw': path.stat().st_size, **precompress_file(path)}
+    return report
+
+
+def parse_accept_encoding(header):
+    """Content-codings an Accept-Encoding header allows (q > 0)"""
+    accepted = set()
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding)
+    if '*' in accepted:
+        accepted.update(ENCODINGS)
+    return accepted
+
@@ -0,0 +1,236 @@
+"""
+Dashboard settings: folders, snapshot file names and page/server options
+
+Plain values only (no pandas or matplotlib), so the command line can parse
+its arguments and the pipeline can decide which stages to skip without
+importing the stages themselves.
+
+load_settings() layers the settings, later layers winning:
+
+    built-in defaults (the OneDrive IRON_DATA folders)
+    → dashboard.toml ([paths], [page], [serve]; see dashboard.example.toml)
+    → AVU_* environment variables (ENV_SETTINGS)
+    → command line flags (applied by avu_dashboard.cli)
+
+The config file is the one named by --config or AVU_DASHBOARD_CONFIG, else
+dashboard.toml in the working folder or next to the scripts. Relative
+paths in it are relative to the file; "~" and $VARIABLES are expanded.
+"""
+import os
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from avu_dashboard.incremental import DEFAULT_CACHE_DIR, PACKAGE_DIR
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: the tomli backport, if installed
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+IRON_DATA_DIR = Path(r"C:\Users\Marco.Africani\OneDrive - AVU SA\AVU CPI Campaign\Puzzle_control_Reports\IRON_DATA")
+
+CONFIG_FILE = "dashboard.toml"
+CONFIG_ENV = "AVU_DASHBOARD_CONFIG"
+
+CAMPAIGN_STATS_FILE = "campaign_statistics.pkl"
+STOCK_FILE = "detailed_stock_list.pkl"
+OMT_FILE = "omt_main_offer.pkl"
+HISTORY_FILE = "top_15_winners_matrix.json"
+RACE_CHART_FILE = "race_chart_data.json"
+
+ASSET_MODES = ('inline', 'hashed')
+RACE_DATA_MODES = ('lazy', 'inline')
+
+# Page size breakdown sections (avu_dashboard.page_size); budget keys are these, or these + "_gzip"
+SIZE_SECTIONS = ('charts', 'race_data', 'tables', 'campaigns', 'styles', 'scripts', 'shell', 'page', 'total')
+DEFAULT_SIZE_WARN = {'page': 1_200_000, 'page_gzip': 750_000, 'total': 1_500_000}
+
+DEFAULT_PORT = 8080
+
+
+@dataclass
+class DashboardPaths:
+    """Input snapshots, historical matrix and dashboard output folders, plus the build cache (None: off)
+
+    stage_dir: local folder the snapshots and the historical matrix are
+    copied to before a run (see avu_dashboard.staging); None reads and
+    writes the synced folders directly.
+    """
+    snap_dir: Path = IRON_DATA_DIR / "snapshots"
+    historical_dir: Path = IRON_DATA_DIR / "historical"
+    output_dir: Path = IRON_DATA_DIR / "dashboard"
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR
+    stage_dir: Optional[Path] = None
+
+
+@dataclass
+class PageOptions:
+    """Output settings of the HTML stage"""
+    # "inline" = one self-contained HTML file, "hashed" = CSS/JS in content-hashed files under assets/
+    asset_mode: str = "inline"
+    # "lazy" = data/race_chart_data.json fetched on demand, "inline" = embedded in the page
+    race_data_mode: str = "lazy"
+    race_data_gzip: bool = True
+    # .gz (and .br with brotli installed) next to every HTML/JSON/JS/CSS file
+    precompress: bool = True
+    # data/*.json payloads plus build.json for pages open on the local server
+    live_reload: bool = True
+    # Byte budgets {section or section_gzip: bytes}: over size_warn warns, over size_fail stops the build
+    size_warn: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_SIZE_WARN))
+    size_fail: Dict[str, int] = field(default_factory=dict)
+
+
+# Environment variable -> (section, key) of the config file
+ENV_SETTINGS = {
+    'AVU_IRON_DATA_DIR': ('paths', 'iron_data_dir'),
+    'AVU_SNAP_DIR': ('paths', 'snap_dir'),
+    'AVU_HISTORICAL_DIR': ('paths', 'historical_dir'),
+    'AVU_OUTPUT_DIR': ('paths', 'output_dir'),
+    'AVU_CACHE_DIR': ('paths', 'cache_dir'),
+    'AVU_STAGE_DIR': ('paths', 'stage_dir'),
+    'AVU_PORT': ('serve', 'port'),
+}
+
+# Folders below iron_data_dir when snap_dir / historical_dir / output_dir are not set themselves
+IRON_DATA_SUBDIRS = {'snap_dir': "snapshots", 'historical_dir': "historical", 'output_dir': "dashboard"}
+PATH_KEYS = ('iron_data_dir',) + tuple(item.name for item in fields(DashboardPaths))
+PAGE_KEYS = tuple(item.name for item in fields(PageOptions))
+SERVE_KEYS = ('port',)
+OPTIONAL_PATHS = ('cache_dir', 'stage_dir')  # "" turns these off
+
+
+@dataclass
+class Settings:
+    """Folders, page options and server port, with the layers they came from"""
+    paths: DashboardPaths = field(default_factory=DashboardPaths)
+    options: PageOptions = field(default_factory=PageOptions)
+    port: int = DEFAULT_PORT
+    sources: List[str] = field(default_factory=lambda: ["defaults"])
+
+
+def find_config_file(config_file=None, environ=None):
+    """The config file to read: explicit, $AVU_DASHBOARD_CONFIG, ./dashboard.toml or the one next to the scripts"""
+    environ = os.environ if environ is None else environ
+    explicit = config_file or environ.get(CONFIG_ENV)
+    if explicit:
+        path = Path(explicit).expanduser()
+        if not path.is_file():
+            raise FileNotFoundError(f"Config file not found: {path}")
+        return path
+    for candidate in (Path.cwd() / CONFIG_FILE, PACKAGE_DIR.parent / CONFIG_FILE):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def read_config_file(path):
+    """{section: {key: value}} from a TOML config file, checked against the known sections and keys"""
+    if tomllib is None:
+        raise RuntimeError(f"Reading {path} needs Python 3.11+ or the tomli package")
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    known = {'paths': PATH_KEYS, 'page': PAGE_KEYS, 'serve': SERVE_KEYS}
+    for section, values in config.items():
+        if section not in known or not isinstance(values, dict):
+            raise ValueError(f"{path}: unknown section [{section}] (expected {', '.join(known)})")
+        for key in values:
+            if key not in known[section]:
+                raise ValueError(f"{path}: unknown key {key} in [{section}] (expected {', '.join(known[section])})")
+    return config
+
+
+def resolve_path(value, base=None):
+    """A configured folder as a Path: ~ and $VARIABLES expanded, relative to `base` when given"""
+    path = Path(os.path.expandvars(str(value))).expanduser()
+    if base is not None and not path.is_absolute():
+        path = Path(os.path.normpath(base / path))
+    return path
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('1', 'true', 'yes', 'on'):
+        return True
+    if text in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+def check_size_budgets(budgets):
+    """ValueError unless budgets maps known size sections (optionally + "_gzip") to byte counts"""
+    if not isinstance(budgets, dict):
+        raise ValueError(f"Size budgets must be a table of section = bytes, not {budgets!r}")
+    for key, value in budgets.items():
+        if key.removesuffix('_gzip') not in SIZE_SECTIONS:
+            raise ValueError(f"Unknown size budget: {key} (expected one of {', '.join(SIZE_SECTIONS)}, "
+                             f"optionally with _gzip)")
+        if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+            raise ValueError(f"Size budget {key} must be a positive number of bytes, not {value!r}")
+
+
+def expand_iron_data_dir(paths):
+    """One layer's paths with its iron_data_dir replaced by the folders below it
+
+    Within a layer an explicit snap_dir / historical_dir / output_dir wins;
+    across layers the later one wins, whichever way it was given.
+    """
+    paths = dict(paths)
+    iron_data_dir = paths.pop('iron_data_dir', None)
+    if iron_data_dir:
+        for key, subdir in IRON_DATA_SUBDIRS.items():
+            paths.setdefault(key, iron_data_dir / subdir)
+    return paths
+
+
+def load_settings(config_file=None, environ=None):
+    """Settings from the defaults, the config file and the AVU_* environment variables (see module docstring)"""
+    environ = os.environ if environ is None else environ
+    paths, page, serve = {}, {}, {}
+    sources = ["defaults"]
+
+    path = find_config_file(config_file, environ)
+    if path:
+        config = read_config_file(path)
+        base = path.resolve().parent
+        paths.update(expand_iron_data_dir({key: value if value == "" else resolve_path(value, base)
+                                           for key, value in config.get('paths', {}).items()}))
+        page.update(config.get('page', {}))
+        serve.update(config.get('serve', {}))
+        sources.append(str(path))
+
+    env_paths = {}
+    for name, (section, key) in ENV_SETTINGS.items():
+        value = environ.get(name)
+        if value is None:
+            continue
+        if section == 'paths':
+            env_paths[key] = value if value == "" else resolve_path(value)
+        else:
+            serve[key] = value
+        sources.append(f"${name}")
+    paths.update(expand_iron_data_dir(env_paths))
+
+    for key in OPTIONAL_PATHS:
+        if paths.get(key) == "":
+            paths[key] = None
+    if any(paths.get(key) == "" for key in IRON_DATA_SUBDIRS):
+        raise ValueError("snap_dir, historical_dir and output_dir cannot be empty")
+
+    defaults = PageOptions()
+    options = PageOptions(**{key: parse_bool(value) if isinstance(getattr(defaults, key), bool) else value
+                             for key, value in page.items()})
+    if options.asset_mode not in ASSET_MODES:
+        raise ValueError(f"Unknown asset_mode: {options.asset_mode} (expected one of {', '.join(ASSET_MODES)})")
+    if options.race_data_mode not in RACE_DATA_MODES:
+        raise ValueError(f"Unknown race_data_mode: {options.race_data_mode} "
+                         f"(expected one of {', '.join(RACE_DATA_MODES)})")
+    for budgets in (options.size_warn, options.size_fail):
+        check_size_budgets(budgets)
+    return Settings(paths=DashboardPaths(**paths), options=options, port=int(serve.get('port', DEFAULT_PORT)),
+                    sources=sources)
@@ -0,0 +1,152 @@
+"""
+Filter engine: cached row bitsets per filter rule, combined by intersection
+
+A Rule is one condition on one column: membership ("in" / "not_in") for
+text columns such as type, sub-type or the price / stock tier emojis, and
+comparisons (">=", ">", "<=", "<") for numbers and dates. FilterIndex
+evaluates each rule over its frame once and caches the rows it keeps as a
+packed bitset. A combination of rules is the AND of their bitsets, so a
+segment such as "Luxury with stock >= 50 in the last 7 days" costs no
+table scan once its rules have been seen.
+
+Membership rules on a categorical column compare its integer codes. Give
+columns that many different rules read (tiers) the category dtype; a text
+column read once (type / sub-type in the global filter) is cheaper to
+match directly than to factorize.
+
+    index = FilterIndex(periods.winners_with_stock)
+    rows = index.rows(since('Starting_Date_dt', cutoff), price_tier('luxury'), at_least('stock_quantity', 50))
+
+Row positions are in the frame's order, so on a ranked frame the first k
+rows of a result are its top k.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Tier names -> the emoji formatting.get_price_emoji / get_stock_emoji give (Price_Tier / Stock_Tier columns)
+PRICE_TIERS = {
+    'extra_luxury': '🟣',
+    'luxury': '🟨',
+    'premium': '💎',
+    'mid_range': '🩷',
+    'budget': '🟢',
+    'unknown': '⚪',
+}
+STOCK_TIERS = {
+    'purple': '🟣',
+    'gold': '🟨',
+    'blue': '🟦',
+    'pink': '🩷',
+    'green': '🟢',
+    'unknown': '⚪',
+}
+
+COMPARISONS = {'>=': np.greater_equal, '>': np.greater, '<=': np.less_equal, '<': np.less}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One condition: column op value ("in" / "not_in" take a tuple of values)"""
+    column: str
+    op: str
+    value: Any
+
+
+def only(column, values):
+    return Rule(column, 'in', tuple(values))
+
+
+def exclude(column, values):
+    return Rule(column, 'not_in', tuple(values))
+
+
+def since(column, cutoff):
+    """Dates on or after cutoff (missing dates never match)"""
+    return Rule(column, '>=', pd.Timestamp(cutoff))
+
+
+def at_least(column, minimum):
+    return Rule(column, '>=', minimum)
+
+
+def below(column, limit):
+    return Rule(column, '<', limit)
+
+
+def price_tier(name, column='Price_Tier'):
+    """Rule keeping one price tier (a PRICE_TIERS name); ValueError for unknown names"""
+    if name not in PRICE_TIERS:
+        raise ValueError(f"Unknown price tier {name!r} (one of {', '.join(PRICE_TIERS)})")
+    return only(column, [PRICE_TIERS[name]])
+
+
+def stock_tier(name, column='Stock_Tier'):
+    """Rule keeping one stock band (a STOCK_TIERS name); ValueError for unknown names"""
+    if name not in STOCK_TIERS:
+        raise ValueError(f"Unknown stock tier {name!r} (one of {', '.join(STOCK_TIERS)})")
+    return only(column, [STOCK_TIERS[name]])
+
+
+class FilterIndex:
+    """Rule bitsets over one frame, each computed on first use and then kept"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.rows_total = len(frame)
+        self._values = {}
+        self._bits = {}
+        self._all = np.packbits(np.ones(self.rows_total, dtype=bool))
+
+    def values(self, column, dates=False):
+        """A column as a numeric (or datetime64) array, unparseable values as NaN / NaT"""
+        key = (column, dates)
+        if key not in self._values:
+            series = self.frame[column]
+            if dates:
+                if not pd.api.types.is_datetime64_any_dtype(series):
+                    series = pd.to_datetime(series, errors='coerce')
+                self._values[key] = series.to_numpy(dtype='datetime64[ns]')
+            else:
+                self._values[key] = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+        return self._values[key]
+
+    def evaluate(self, rule):
+        """Boolean mask of one rule over every row"""
+        if rule.op in ('in', 'not_in'):
+            column = self.frame[rule.column]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                wanted = column.cat.categories.get_indexer(list(rule.value))
+                mask = np.isin(column.cat.codes.to_numpy(), wanted[wanted >= 0])
+            else:
+                mask = column.isin(rule.value).to_numpy()
+            return ~mask if rule.op == 'not_in' else mask
+        if rule.op in COMPARISONS:
+            if isinstance(rule.value, datetime):
+                return COMPARISONS[rule.op](self.values(rule.column, dates=True), np.datetime64(rule.value, 'ns'))
+            return COMPARISONS[rule.op](self.values(rule.column), rule.value)
+        raise ValueError(f"Unknown filter op {rule.op!r}")
+
+    def bits(self, rule):
+        """Packed bitset of the rows a rule keeps (cached per rule)"""
+        bits = self._bits.get(rule)
+        if bits is None:
+            bits = self._bits[rule] = np.packbits(self.evaluate(rule))
+        return bits
+
+    def mask(self, *rules):
+        """Boolean mask of the rows every rule keeps (all rows without rules)"""
+        bits = self._all
+        for rule in rules:
+            bits = np.bitwise_and(bits, self.bits(rule))
+        return np.unpackbits(bits, count=self.rows_total).astype(bool)
+
+    def rows(self, *rules):
+        """Positions of the rows every rule keeps, in frame order"""
+        return np.flatnonzero(self.mask(*rules))
+
+    def count(self, *rules):
+        return int(self.mask(*rules).sum())
@@ -0,0 +1,109 @@
+"""
+Formatting helpers shared by the pipeline stages
+
+Swiss number formatting, the price and stock tier emojis used in every
+table, and show(), which displays a DataFrame in a notebook, prints it in
+verbose runs and does nothing otherwise.
+"""
+import pandas as pd
+
+from avu_dashboard.logs import event, in_notebook, say, settings, verbose
+
+
+def format_swiss_number(number):
+    """Format numbers in Swiss style with apostrophes (82'723.98)"""
+    if pd.isna(number) or number == 0:
+        return "0.00"
+
+    # Round to 2 decimal places
+    number = round(float(number), 2)
+
+    # Split into integer and decimal parts
+    integer_part = int(abs(number))
+    decimal_part = f"{abs(number) - integer_part:.2f}"[2:]  # Get decimal part (2 digits)
+
+    # Format integer part with apostrophes
+    formatted_int = f"{integer_part:,}".replace(",", "'")
+    result = f"{formatted_int}.{decimal_part}"
+
+    return f"-{result}" if number < 0 else result
+
+
+def get_price_emoji(price):
+    """Return emoji based on updated price tier ranges"""
+    if pd.isna(price) or price <= 0: return "⚪"  # Unknown/No price
+    if price >= 750.01: return "🟣"  # Purple: Extra luxury wines (CHF 750.01+)
+    if price >= 300.01: return "🟨"  # Gold: Luxury wines (CHF 300.01-750.00)
+    if price >= 100.01: return "💎"  # Blue: Premium wines (CHF 100.01-300.00)
+    if price >= 50.01:  return "🩷"  # Pink: Mid-range wines (CHF 50.01-100.00)
+    return "🟢"  # Green: Budget wines (MAX CHF 50)
+
+
+def get_stock_emoji(quantity):
+    """Return emoji based on refined stock quantity ranges"""
+    if pd.isna(quantity) or quantity <= 0:
+        return "⚪"  # White: Unknown/No stock
+    elif 1 <= quantity <= 12:
+        return "🟣"  # Purple: 1-12
+    elif 13 <= quantity <= 49:
+        return "🟨"  # Gold: 13-49
+    elif 50 <= quantity <= 199:
+        return "🟦"  # Blue: 50-199
+    elif 200 <= quantity <= 499:
+        return "🩷"  # Pink: 200-499
+    elif quantity >= 500:
+        return "🟢"  # Green: 500+
+    else:
+        return "⚪"  # Default: Unknown
+
+
+def get_stock_status(quantity):
+    """Return stock status description based on refined ranges"""
+    if pd.isna(quantity) or quantity <= 0:
+        return "Unknown/No stock"
+    elif 1 <= quantity <= 12:
+        return f"Purple ({int(quantity)} bottles)"
+    elif 13 <= quantity <= 49:
+        return f"Gold ({int(quantity)} bottles)"
+    elif 50 <= quantity <= 199:
+        return f"Blue ({int(quantity)} bottles)"
+    elif 200 <= quantity <= 499:
+        return f"Pink ({int(quantity)} bottles)"
+    elif quantity >= 500:
+        return f"Green ({int(quantity)} bottles)"
+    else:
+        return f"Other ({int(quantity)} bottles)"
+
+
+def format_vintage(values):
+    """Vintage column as year strings ('' for missing / 0)"""
+    return pd.to_numeric(values, errors='coerce').fillna(0).astype(int).astype(str).replace('0', '')
+
+
+def format_date(values):
+    """Date column as YYYY-MM-DD strings ('' when unparseable)"""
+    return pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m-%d').fillna('')
+
+
+def delayed_campaign_no(frame):
+    """Campaign_No with a "-D" suffix where Delayed_Sending is True"""
+    return frame.apply(
+        lambda row: f"{row['Campaign_No']}-D" if row['Delayed_Sending'] == True else str(row['Campaign_No']),
+        axis=1
+    )
+
+
+def show(frame, name=None):
+    """display() a table in a notebook, print it in verbose runs ('table' event in JSON mode); otherwise skip it
+
+    Callers check displaying() before building a display-only frame.
+    """
+    if in_notebook():
+        from IPython.display import display
+        display(frame)
+    elif verbose():
+        if settings.json:
+            event('table', level='debug', table=name, rows=len(frame),
+                  data=frame.reset_index(drop=True).to_dict('records'))
+        else:
+            say(frame.to_string(), level='debug')
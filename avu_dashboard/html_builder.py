@@ -0,0 +1,334 @@
+"""
+HTML builder for the AVU dashboard
+
+The page shell, period table and top 25 table are plain HTML templates
+(string.Template, $placeholders) compiled once per process; the CSS and
+JavaScript live as static files and are inserted verbatim, so they need no
+brace escaping. Table rows are accumulated in lists and joined once.
+
+Two asset modes are supported: "inline" embeds the CSS/JS in one
+self-contained page, "hashed" writes them to content-hashed files under
+assets/ and links them from a slim shell so browsers can cache them across
+updates.
+
+The race chart history is either inlined or written to data/ as its own
+JSON file (plus an optional gzip copy) that the page fetches on demand.
+"""
+import gzip
+import hashlib
+import html
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from string import Template
+
+import pandas as pd
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+TEMPLATE_DIR = PACKAGE_DIR / "templates"
+STATIC_DIR = PACKAGE_DIR / "static"
+
+DASHBOARD_FILE = "avu_top_campaigns_dashboard.html"
+
+ASSET_SUBDIR = "assets"
+HASH_LENGTH = 10
+
+DATA_SUBDIR = "data"
+RACE_DATA_FILE = "race_chart_data.json"
+
+# Static files split out in hashed mode, in page order
+DASHBOARD_ASSETS = ('dashboard.css', 'campaign_worker.js', 'dashboard.js')
+
+# Page section -> the shell placeholders it fills (size breakdown, see avu_dashboard.page_size)
+PAGE_SECTIONS = {
+    'charts': ('chart_7_days', 'chart_21_days', 'chart_overall', 'chart_data'),
+    'race_data': ('race_chart_json',),
+    'tables': ('top25_table', 'period_tables'),
+    'campaigns': ('all_campaigns_json',),
+    'styles': ('styles',),
+    'scripts': ('worker_script', 'dashboard_script'),
+}
+
+# Period table columns: display label, sortTable data-type, raw column used for data-sort-value
+PERIOD_TABLE_COLUMNS = {
+    'Period_Rank': ('Rank', 'number', 'Period_Rank'),
+    '🎨': ('🎨', 'number', 'Main_Bottle_Price_LCY'),
+    '📦': ('📦', 'number', 'stock_quantity'),
+    'Campaign_No': ('Campaign', 'text', 'Campaign_No'),
+    'Wine': ('Wine', 'text', 'Wine'),
+    'Vintage': ('Vintage', 'number', 'Vintage'),
+    'Producer_Name': ('Producer', 'text', 'Producer_Name'),
+    'Starting_Date': ('Start Date', 'date', 'Starting_Date'),
+    'Total_Sales_Amount_LCY': ('Sales', 'number', 'Total_Sales_Amount_LCY'),
+    'Unique_Bought': ('Unique Buyers', 'number', 'Unique_Bought'),
+    'Conversion_Rate_%': ('Conv. %', 'number', 'Conversion_Rate_%'),
+    'Weighted_Score': ('Score', 'number', 'Weighted_Score'),
+    'Stock_Status': ('Stock Status', 'number', 'stock_quantity'),
+    'Main_Item_No': ('Item No.', 'number', 'Main_Item_No'),
+    'Overall_Position': ('Overall Pos.', 'number', 'Overall_Position'),
+}
+
+# Period table cell classes (columns not listed get a plain <td>)
+PERIOD_CELL_CLASSES = {
+    'Period_Rank': 'rank-cell',
+    '🎨': 'emoji-cell',
+    '📦': 'emoji-cell',
+    'Weighted_Score': 'number-cell',
+    'Conversion_Rate_%': 'number-cell',
+}
+
+# Top 25 table sort keys, in the same order as the <th> row of top25_table.html
+TOP25_SORT_KEYS = [
+    ('Overall_Position', 'number'), ('Campaign_No', 'text'), ('Main_Bottle_Price_LCY', 'number'),
+    ('Wine', 'text'), ('Vintage', 'number'), ('Producer_Name', 'text'), ('Starting_Date', 'date'),
+    ('Multiple', 'text'), ('Email_Sent', 'number'), ('Unique_Bought', 'number'),
+    ('Conversion_Rate_%', 'number'), ('Total_Sales_Amount_LCY', 'number'),
+    ('Norm_Conversion', 'number'), ('Norm_Sales', 'number'), ('Weighted_Score', 'number'),
+]
+
+# Top 25 table cells: (cell class, formatter over one display row)
+TOP25_CELLS = [
+    ('rank-cell', lambda row: f"#{row['Overall_Position']}"),
+    ('', lambda row: row['Campaign_No']),
+    ('emoji-cell', lambda row: row['🎨']),
+    ('', lambda row: row['Wine']),
+    ('number-cell', lambda row: row['Vintage']),
+    ('', lambda row: row['Producer_Name'] if pd.notna(row['Producer_Name']) else ""),
+    ('', lambda row: row['Starting_Date']),
+    ('', lambda row: "Yes" if row['Multiple'] else "No"),
+    ('number-cell', lambda row: f"{row['Email_Sent']:,.0f}"),
+    ('number-cell', lambda row: f"{row['Unique_Bought']:,.0f}"),
+    ('number-cell', lambda row: f"{row['Conversion_Rate_%']:.2f}%"),
+    ('number-cell', lambda row: row['Total_Sales_Formatted']),
+    ('number-cell', lambda row: f"{row['Norm_Conversion']:.4f}"),
+    ('number-cell', lambda row: f"{row['Norm_Sales']:.4f}"),
+    ('number-cell', lambda row: f"{row['Weighted_Score']:.4f}"),
+]
+
+
+@lru_cache(maxsize=None)
+def load_static(name):
+    """Read a static CSS/JS file once per process"""
+    return (STATIC_DIR / name).read_text(encoding='utf-8')
+
+
+@lru_cache(maxsize=None)
+def load_template(name):
+    """Read and compile an HTML template once per process"""
+    return Template((TEMPLATE_DIR / name).read_text(encoding='utf-8'))
+
+
+def build_sort_keys(raw_data, key_specs):
+    """Pre-compute data-sort-value keys per column (raw numbers, ISO dates, lowercase text)"""
+    sort_keys = []
+    for source_col, data_type in key_specs:
+        if source_col not in raw_data.columns:
+            values = pd.Series('', index=raw_data.index)
+        elif data_type == 'number':
+            values = pd.to_numeric(raw_data[source_col], errors='coerce').fillna(0).map(lambda v: f"{v:.10g}")
+        elif data_type == 'date':
+            values = pd.to_datetime(raw_data[source_col], errors='coerce').dt.strftime('%Y-%m-%d').fillna('')
+        else:
+            values = raw_data[source_col].fillna('').astype(str).str.lower().map(lambda v: html.escape(v, quote=True))
+        sort_keys.append(values.tolist())
+    return sort_keys
+
+
+def render_cell(value, sort_value, cell_class=''):
+    """Render one <td> with its data-sort-value"""
+    class_attr = f' class="{cell_class}"' if cell_class else ''
+    return f'<td{class_attr} data-sort-value="{sort_value}">{html.escape(str(value), quote=False)}</td>'
+
+
+def render_period_table(title, display, raw):
+    """Render one multi-period table; raw holds the unformatted values on the same index as display"""
+    column_specs = [PERIOD_TABLE_COLUMNS.get(col, (col, 'text', col)) for col in display.columns]
+    header_cells = ''.join(
+        f'<th onclick="sortTable(this, {col_index})" data-type="{data_type}">{label}</th>'
+        for col_index, (label, data_type, _) in enumerate(column_specs)
+    )
+
+    sort_keys = build_sort_keys(raw.loc[display.index], [(source_col, data_type) for _, data_type, source_col in column_specs])
+    cell_classes = [PERIOD_CELL_CLASSES.get(col, '') for col in display.columns]
+    rank_index = list(display.columns).index('Period_Rank') if 'Period_Rank' in display.columns else -1
+
+    rows = []
+    for row_position, values in enumerate(display.itertuples(index=False, name=None)):
+        cells = []
+        for col_index, value in enumerate(values):
+            text = '' if pd.isna(value) else str(value)
+            if col_index == rank_index:
+                text = f"#{text}"
+            cells.append(render_cell(text, sort_keys[col_index][row_position], cell_classes[col_index]))
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+
+    return load_template('period_table.html').substitute(
+        title=html.escape(title, quote=False),
+        header_cells=header_cells,
+        rows=''.join(rows),
+    )
+
+
+def render_top25_rows(display, raw):
+    """Render the top 25 table rows; raw holds the unformatted values on the same index as display"""
+    sort_keys = build_sort_keys(raw.loc[display.index], TOP25_SORT_KEYS)
+    rows = []
+    for row_position, row in enumerate(display.to_dict('records')):
+        cells = [
+            render_cell(formatter(row), sort_keys[col_index][row_position], cell_class)
+            for col_index, (cell_class, formatter) in enumerate(TOP25_CELLS)
+        ]
+        rows.append(f"<tr>{''.join(cells)}</tr>")
+    return ''.join(rows)
+
+
+def render_top25_table(rows_html):
+    """Wrap the top 25 rows in the top 25 table section"""
+    return load_template('top25_table.html').substitute(rows=rows_html)
+
+
+def hashed_asset_name(name, content):
+    """dashboard.css -> dashboard.<hash>.css, the hash taken over the file content"""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    stem, suffix = name.rsplit('.', 1)
+    return f"{stem}.{digest}.{suffix}"
+
+
+def write_hashed_assets(output_dir, names=DASHBOARD_ASSETS):
+    """Write static files as content-hashed assets under output_dir/assets; returns {name: relative url}
+
+    Unchanged files keep their name (and stay cached); older hashes of the same
+    file are removed so the published folder holds only the current build.
+    """
+    asset_dir = Path(output_dir) / ASSET_SUBDIR
+    asset_dir.mkdir(parents=True, exist_ok=True)
+
+    urls = {}
+    for name in names:
+        content = load_static(name)
+        hashed_name = hashed_asset_name(name, content)
+        target = asset_dir / hashed_name
+        if not target.exists():
+            target.write_text(content, encoding='utf-8')
+
+        stem, suffix = name.rsplit('.', 1)
+        stale_pattern = re.compile(rf"{re.escape(stem)}\.[0-9a-f]{{{HASH_LENGTH}}}\.{re.escape(suffix)}")
+        for existing in asset_dir.iterdir():
+            if existing.name != hashed_name and stale_pattern.fullmatch(existing.name):
+                existing.unlink()
+
+        urls[name] = f"{ASSET_SUBDIR}/{hashed_name}"
+    return urls
+
+
+def write_race_data(output_dir, race_chart_json, gzip_copy=False):
+    """Write the race history to output_dir/data as compact JSON (plus .gz); returns its urls
+
+    The urls carry a content hash (?v=...) so a new snapshot is never served
+    from a stale cache while an unchanged history stays cached.
+    """
+    data_dir = Path(output_dir) / DATA_SUBDIR
+    data_dir.mkdir(parents=True, exist_ok=True)
+
+    payload = json.dumps(json.loads(race_chart_json), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    version = hashlib.sha256(payload).hexdigest()[:HASH_LENGTH]
+    target = data_dir / RACE_DATA_FILE
+    target.write_bytes(payload)
+
+    gzip_target = target.with_name(target.name + '.gz')
+    if gzip_copy:
+        gzip_target.write_bytes(gzip.compress(payload, compresslevel=9, mtime=0))
+    elif gzip_target.exists():
+        gzip_target.unlink()
+
+    urls = {'src': f"{DATA_SUBDIR}/{RACE_DATA_FILE}?v={version}"}
+    if gzip_copy:
+        urls['src_gz'] = f"{DATA_SUBDIR}/{RACE_DATA_FILE}.gz?v={version}"
+    return urls
+
+
+def render_race_data_attrs(race_data_urls=None):
+    """data-race-src attributes on the race section (empty when the race data is inlined)"""
+    if race_data_urls is None:
+        return ''
+    attrs = f' data-race-src="{html.escape(race_data_urls["src"])}"'
+    if 'src_gz' in race_data_urls:
+        attrs += f' data-race-src-gz="{html.escape(race_data_urls["src_gz"])}"'
+    return attrs
+
+
+def render_asset_tags(asset_urls=None):
+    """Style, worker and script blocks for the page shell: inline when asset_urls is None, else linked"""
+    if asset_urls is None:
+        return {
+            'styles': f"    <style>\n{load_static('dashboard.css')}\n    </style>",
+            'worker_script': ('            <script type="text/js-worker" id="campaign-worker-source">\n'
+                              f"{load_static('campaign_worker.js')}\n            </script>"),
+            'dashboard_script': f"    <script>\n{load_static('dashboard.js')}\n    </script>",
+        }
+    return {
+        'styles': f'    <link rel="stylesheet" href="{asset_urls["dashboard.css"]}">',
+        'worker_script': (f'            <script type="text/js-worker" id="campaign-worker-source" '
+                          f'data-src="{asset_urls["campaign_worker.js"]}"></script>'),
+        'dashboard_script': f'    <script src="{asset_urls["dashboard.js"]}"></script>',
+    }
+
+
+def build_chart_data(chart_7_days, chart_21_days, chart_overall):
+    """Rotating chart slots: [title, image src, alt text, chart type]"""
+    return [
+        ["LAST 7 DAYS WINNERS - FEATURED", f"data:image/png;base64,{chart_7_days}", "Last 7 Days Winners Chart", "7days"],
+        ["LAST 21 DAYS WINNERS", f"data:image/png;base64,{chart_21_days}", "Last 21 Days Winners Chart", "21days"],
+        ["OVERALL TOP WINNERS", f"data:image/png;base64,{chart_overall}", "Overall Winners Chart", "overall"],
+    ]
+
+
+def static_version():
+    """Hash over the templates and static files; a page with another version needs a full reload"""
+    digest = hashlib.sha256()
+    for directory in (TEMPLATE_DIR, STATIC_DIR):
+        for path in sorted(p for p in directory.iterdir() if p.is_file()):
+            digest.update(path.name.encode('utf-8'))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:HASH_LENGTH]
+
+
+def dashboard_page_values(current_time, top25_table, period_tables, chart_7_days, chart_21_days, chart_overall,
+                          all_campaigns_json, race_chart_json, count_7_days, count_21_days, count_overall,
+                          count_campaigns, asset_urls=None, race_data_urls=None, build_info=None):
+    """Placeholder values of the page shell: the build data plus the CSS/JS (inline, or linked when asset_urls is given)
+
+    With race_data_urls the race history is fetched by the page and race_chart_json is not embedded.
+    build_info (build id + payload urls) enables live reload in the page.
+    """
+    chart_data = json.dumps(build_chart_data(chart_7_days, chart_21_days, chart_overall))
+
+    return dict(
+        **render_asset_tags(asset_urls),
+        current_time=current_time,
+        top25_table=top25_table,
+        period_tables=period_tables,
+        chart_7_days=chart_7_days,
+        chart_21_days=chart_21_days,
+        chart_overall=chart_overall,
+        chart_data=chart_data,
+        all_campaigns_json=all_campaigns_json,
+        race_chart_json='null' if race_data_urls is not None else race_chart_json,
+        race_data_attrs=render_race_data_attrs(race_data_urls),
+        build_info=json.dumps(build_info, ensure_ascii=False).replace('</', '<\\/'),
+        count_7_days=count_7_days,
+        count_21_days=count_21_days,
+        count_overall=count_overall,
+        count_campaigns=count_campaigns,
+    )
+
+
+def fill_dashboard_page(values):
+    """The page shell filled with dashboard_page_values()"""
+    return load_template('dashboard.html').substitute(values)
+
+
+def render_dashboard_page(**kwargs):
+    """The complete page (see dashboard_page_values for the arguments)"""
+    return fill_dashboard_page(dashboard_page_values(**kwargs))
@@ -0,0 +1,174 @@
+"""
+Incremental rebuilds
+
+Every pipeline stage declares what it reads: snapshot file digests, the
+digests of the upstream stage results, its options and its own source
+files. The stage key (a hash over those) and a digest of what the stage
+produced are recorded in a small manifest in the cache folder, next to the
+pickled stage results. On the next run a stage whose key is unchanged, and
+whose written files still have the recorded digests, is skipped; its
+pickled result is only loaded when a later stage that does run needs it.
+
+A stage that reruns but produces an identical result keeps its digest, so
+the stages after it are still skipped.
+"""
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+MANIFEST_VERSION = 1
+PACKAGE_DIR = Path(__file__).resolve().parent
+# Local (not synced) by default: next to the scripts, ignored by git
+DEFAULT_CACHE_DIR = PACKAGE_DIR.parent / ".pipeline_cache"
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    """Hex sha256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def result_digest(result, exclude=()):
+    """Hex sha256 over the pickled fields of a stage result dataclass (fields in `exclude` left out)"""
+    digest = hashlib.sha256()
+    for item in fields(result):
+        if item.name not in exclude:
+            digest.update(item.name.encode('utf-8'))
+            digest.update(pickle.dumps(getattr(result, item.name), protocol=pickle.HIGHEST_PROTOCOL))
+    return digest.hexdigest()
+
+
+def write_atomic(path, data):
+    """Write bytes through a temporary file so readers never see a partial file"""
+    temporary = path.with_name(path.name + '.tmp')
+    temporary.write_bytes(data)
+    os.replace(temporary, path)
+
+
+class BuildCache:
+    """Stage manifest and pickled stage results in cache_dir
+
+    With cache_dir=None nothing is read or written and every stage runs;
+    force=True runs every stage but still records the new results.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, force=False):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.force = force
+        self.manifest = {'version': MANIFEST_VERSION, 'files': {}, 'stages': {}}
+        self.digests = {}  # stage -> result digest for this run
+        self.changed = False  # manifest needs saving
+        if self.cache_dir and (self.cache_dir / MANIFEST_FILE).exists():
+            try:
+                manifest = json.loads((self.cache_dir / MANIFEST_FILE).read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                manifest = None  # unreadable manifest: rebuild everything
+            if manifest and manifest.get('version') == MANIFEST_VERSION:
+                self.manifest = manifest
+
+    @property
+    def enabled(self):
+        return self.cache_dir is not None
+
+    def file_digest(self, path):
+        """Content digest of a file (None when missing), rehashed only when its size or mtime changed"""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        entry = self.manifest['files'].get(str(path))
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+        digest = sha256_file(path)
+        self.manifest['files'][str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        self.changed = True
+        return digest
+
+    def source_digest(self, sources):
+        """Digest of package source files and folders (paths relative to avu_dashboard/)"""
+        digest = hashlib.sha256()
+        for source in sources:
+            path = PACKAGE_DIR / source
+            files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+            for file in files:
+                digest.update(file.relative_to(PACKAGE_DIR).as_posix().encode('utf-8'))
+                digest.update((self.file_digest(file) or '').encode('ascii'))
+        return digest.hexdigest()
+
+    def stage_key(self, stage, inputs):
+        """Hash over everything a stage reads"""
+        text = json.dumps({'stage': stage, 'inputs': inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def is_fresh(self, stage, key, now=None):
+        """True when the stage last ran with this key and its outputs are untouched (skip it)"""
+        if not self.enabled or self.force:
+            return False
+        entry = self.manifest['stages'].get(stage)
+        if not entry or entry['key'] != key:
+            return False
+        valid_until = entry.get('valid_until')
+        if valid_until and datetime.fromisoformat(valid_until) <= (now or datetime.now()):
+            return False
+        if entry.get('result') and not (self.cache_dir / entry['result']).exists():
+            return False
+        if any(self.file_digest(path) != digest for path, digest in entry.get('outputs', {}).items()):
+            return False
+        self.digests[stage] = entry['digest']
+        return True
+
+    def last_built(self, stage):
+        """When a stage last ran (ISO timestamp), None if never"""
+        return self.manifest['stages'].get(stage, {}).get('built')
+
+    def load(self, stage):
+        """Unpickle the result recorded for a skipped stage"""
+        with open(self.cache_dir / self.manifest['stages'][stage]['result'], 'rb') as f:
+            return pickle.load(f)
+
+    def record(self, stage, key, result=None, exclude=(), outputs=(), valid_until=None, seconds=None):
+        """Record a stage that ran; returns the digest later stages key on
+
+        The digest covers the result (minus `exclude`) and the content of
+        the files the stage wrote.
+        """
+        output_digests = {str(path): self.file_digest(path) for path in outputs}
+        digest = hashlib.sha256()
+        digest.update(result_digest(result, exclude).encode('ascii') if result is not None else key.encode('ascii'))
+        for path in sorted(output_digests):
+            digest.update((output_digests[path] or '').encode('ascii'))
+        self.digests[stage] = digest.hexdigest()
+
+        if self.enabled:
+            self.changed = True
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            result_file = None
+            if result is not None:
+                result_file = f"{stage}.pkl"
+                write_atomic(self.cache_dir / result_file, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+            self.manifest['stages'][stage] = {
+                'key': key,
+                'digest': self.digests[stage],
+                'result': result_file,
+                'outputs': output_digests,
+                'valid_until': valid_until.isoformat() if valid_until else None,
+                'built': datetime.now().isoformat(timespec='seconds'),
+                'seconds': round(seconds, 3) if seconds is not None else None,
+            }
+        return self.digests[stage]
+
+    def save(self):
+        """Write the manifest (after the stages ran) if anything changed"""
+        if self.enabled and self.changed:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.cache_dir / MANIFEST_FILE,
+                         json.dumps(self.manifest, indent=2, ensure_ascii=False).encode('utf-8'))
@@ -0,0 +1,390 @@
+"""
+Load test for the local dashboard server
+
+Starts a server over a dashboard output folder in a child process and drives
+it with an asyncio HTTP/1.1 client: every virtual viewer keeps one
+connection open and loops over a weighted mix of what the page really
+requests (HTML shell, race chart JSON, chart images, assets, conditional
+revalidations and, where the server has them, API queries). Reports
+throughput and p50/p95/p99 latency, overall and per request kind.
+
+Before the load, each server is asked once for the dashboard page
+(uncompressed); the servers are only compared when they all return the
+page's full size.
+
+    python -m avu_dashboard.loadtest <dashboard_dir> --server both --concurrency 50 --duration 10
+
+--server simple   the original Cell 6 server (socketserver.TCPServer + SimpleHTTPRequestHandler)
+--server dashboard  DashboardServer, with a DashboardAPI loaded from data/campaigns.json
+--url http://host:port  an already running server instead of starting one
+"""
+import argparse
+import asyncio
+import functools
+import http.client
+import http.server
+import json
+import multiprocessing
+import random
+import socket
+import socketserver
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from avu_dashboard.api import API_FIELDS, DashboardAPI
+from avu_dashboard.build_manifest import BUILD_MANIFEST
+from avu_dashboard.server import DEFAULT_DOCUMENT, DashboardServer
+
+SERVER_MODES = ('simple', 'dashboard')
+
+DEFAULT_CONCURRENCY = 20
+DEFAULT_DURATION = 10.0     # seconds per server
+REQUEST_TIMEOUT = 30.0
+ACCEPT_ENCODING = "gzip, deflate, br"
+
+# Request kind -> relative weight in the mix
+MIX_WEIGHTS = {
+    'html': 25,
+    'html_revalidate': 20,
+    'race_json': 10,
+    'chart_images': 10,
+    'asset_revalidate': 15,
+    'api': 20,
+}
+
+
+class SimpleHandler(http.server.SimpleHTTPRequestHandler):
+    """The Cell 6 handler before DashboardServer, kept for comparison"""
+
+    def log_message(self, format, *args):
+        return
+
+
+def decode_column(column):
+    """Plain list from a payload column (dictionary-encoded ones are {'values', 'codes'})"""
+    if isinstance(column, dict):
+        return [column['values'][code] for code in column['codes']]
+    return column
+
+
+def load_api(directory, history_path=None):
+    """DashboardAPI over the All Campaigns payload of an output folder (and an optional history file)"""
+    payload = json.loads((Path(directory) / 'data' / 'campaigns.json').read_text(encoding='utf-8'))
+    frame = pd.DataFrame({column: decode_column(payload['columns'][key]) for key, column, _ in API_FIELDS
+                          if key in payload['columns']})
+    snapshots = []
+    if history_path:
+        snapshots = json.loads(Path(history_path).read_text(encoding='utf-8')).get('snapshots', [])
+    api = DashboardAPI()
+    api.update(frame, snapshots)
+    return api
+
+
+def run_server(mode, directory, port, history_path=None):
+    """Child process entry point: serve directory on 127.0.0.1:port until terminated"""
+    if mode == 'simple':
+        handler = functools.partial(SimpleHandler, directory=str(directory))
+        httpd = socketserver.TCPServer(("127.0.0.1", port), handler)
+    else:
+        api = load_api(directory, history_path) if (Path(directory) / 'data' / 'campaigns.json').exists() else None
+        httpd = DashboardServer(("127.0.0.1", port), directory, api=api)
+    with httpd:
+        httpd.serve_forever()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start within {timeout:.0f}s")
+
+
+def build_mix(directory, with_api):
+    """{kind: [url paths]} for the files present in the output folder"""
+    directory = Path(directory)
+    manifest = {}
+    if (directory / BUILD_MANIFEST).exists():
+        manifest = json.loads((directory / BUILD_MANIFEST).read_text(encoding='utf-8'))
+    payloads = manifest.get('payloads', {})
+
+    race = (payloads.get('race') or {}).get('src')
+    if race is None and (directory / 'data' / 'race_chart_data.json').exists():
+        race = 'data/race_chart_data.json'
+    assets = sorted(path.relative_to(directory).as_posix() for path in (directory / 'assets').glob('*')
+                    if path.suffix not in ('.gz', '.br')) if (directory / 'assets').is_dir() else []
+
+    mix = {
+        # The page itself: "/" is a directory listing for the simple server (the folder has no index.html)
+        'html': [f'/{DEFAULT_DOCUMENT}'],
+        'html_revalidate': [f'/{DEFAULT_DOCUMENT}'],
+        'race_json': [f'/{race}'] if race else [],
+        # Chart PNGs travel as data URIs in charts.json (or inline in the HTML)
+        'chart_images': [f"/{payloads['charts']}"] if 'charts' in payloads else [],
+        'asset_revalidate': [f'/{asset}' for asset in assets],
+        'api': [],
+    }
+    if with_api and (directory / 'data' / 'campaigns.json').exists():
+        campaigns = json.loads((directory / 'data' / 'campaigns.json').read_text(encoding='utf-8'))
+        numbers = campaigns['columns'].get('campaign_no', [])[:20]
+        mix['api'] = (['/api/winners?window=7&k=10', '/api/winners?window=21&k=25', '/api/tiers']
+                      + [f'/api/campaign/{number}' for number in numbers]
+                      + [f'/api/history?campaign={number}' for number in numbers[:5]])
+    return {kind: urls for kind, urls in mix.items() if urls}
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened when the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, path, headers):
+        """(status, headers dict, body length)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f"GET {path} HTTP/1.1", f"Host: {self.host}:{self.port}", f"Accept-Encoding: {ACCEPT_ENCODING}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Server closed the connection")
+        version, status = status_line.decode('latin-1').split()[:2]
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        status = int(status)
+        keep_alive = version == 'HTTP/1.1' and response_headers.get('connection', '').lower() != 'close'
+        if status == 304:
+            length = 0
+        elif 'content-length' in response_headers:
+            length = int(response_headers['content-length'])
+            await self.reader.readexactly(length)
+        else:
+            length = len(await self.reader.read())
+            keep_alive = False
+        if not keep_alive:
+            await self.close()
+        return status, response_headers, length
+
+
+class LoadResult:
+    """Latencies and counts of one load-test run"""
+
+    def __init__(self, label):
+        self.label = label
+        self.latencies = {}     # kind -> [seconds]
+        self.kind_bytes = {}    # kind -> body bytes received
+        self.document_bytes = None  # uncompressed size of the page as this server sends it
+        self.statuses = {}
+        self.errors = 0
+        self.bytes = 0
+        self.elapsed = 0.0
+
+    def record(self, kind, latency, status, length):
+        self.latencies.setdefault(kind, []).append(latency)
+        self.kind_bytes[kind] = self.kind_bytes.get(kind, 0) + length
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes += length
+
+    @property
+    def requests(self):
+        return sum(len(values) for values in self.latencies.values())
+
+    def summary(self):
+        everything = [latency for values in self.latencies.values() for latency in values]
+        return {
+            'server': self.label,
+            'requests': self.requests,
+            'errors': self.errors,
+            'seconds': round(self.elapsed, 2),
+            'requests_per_second': round(self.requests / self.elapsed, 1) if self.elapsed else 0,
+            'megabytes_per_second': round(self.bytes / self.elapsed / 1e6, 2) if self.elapsed else 0,
+            'document_bytes': self.document_bytes,
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+            'latency_ms': percentiles(everything),
+            'by_kind': {kind: {'requests': len(values), 'bytes': self.kind_bytes.get(kind, 0), **percentiles(values)}
+                        for kind, values in sorted(self.latencies.items())},
+        }
+
+
+def percentiles(latencies):
+    """p50/p95/p99 in milliseconds (nearest rank)"""
+    if not latencies:
+        return {'p50': None, 'p95': None, 'p99': None}
+    ordered = sorted(latencies)
+    pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99)}
+
+
+def fetch_document(host, port):
+    """Body length of the dashboard page, requested once without compression; RuntimeError unless 200"""
+    connection = http.client.HTTPConnection(host, port, timeout=REQUEST_TIMEOUT)
+    try:
+        connection.request('GET', f'/{DEFAULT_DOCUMENT}', headers={'Accept-Encoding': 'identity'})
+        response = connection.getresponse()
+        body = response.read()
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"GET /{DEFAULT_DOCUMENT} on {host}:{port} answered {response.status}")
+    return len(body)
+
+
+async def viewer(host, port, mix, deadline, result, seed):
+    """One virtual viewer: requests from the mix back to back until the deadline"""
+    rng = random.Random(seed)
+    kinds = list(mix)
+    weights = [MIX_WEIGHTS[kind] for kind in kinds]
+    validators = {}     # path -> conditional headers from its last 200
+    connection = Connection(host, port)
+    while time.monotonic() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        path = rng.choice(mix[kind])
+        headers = validators.get(path, {}) if kind.endswith('_revalidate') else {}
+        started = time.perf_counter()
+        try:
+            status, response_headers, length = await asyncio.wait_for(
+                connection.request(path, headers), REQUEST_TIMEOUT)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            result.errors += 1
+            await connection.close()
+            await asyncio.sleep(0.05)
+            continue
+        result.record(kind, time.perf_counter() - started, status, length)
+        if status == 200:
+            conditional = {}
+            if 'etag' in response_headers:
+                conditional['If-None-Match'] = response_headers['etag']
+            if 'last-modified' in response_headers:
+                conditional['If-Modified-Since'] = response_headers['last-modified']
+            validators[path] = conditional
+    await connection.close()
+
+
+async def drive(host, port, mix, concurrency, duration, label):
+    result = LoadResult(label)
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(*(viewer(host, port, mix, deadline, result, seed) for seed in range(concurrency)))
+    result.elapsed = time.monotonic() - started
+    return result
+
+
+def run_load(directory, mode=None, url=None, concurrency=DEFAULT_CONCURRENCY, duration=DEFAULT_DURATION,
+             history_path=None):
+    """Load-test one server (started locally for mode, or the running one at url); returns the summary"""
+    server = None
+    if url:
+        parts = urlsplit(url)
+        host, port = parts.hostname, parts.port or 80
+        label = url
+    else:
+        host, port, label = "127.0.0.1", free_port(), mode
+        server = multiprocessing.Process(target=run_server, args=(mode, str(directory), port, history_path),
+                                         daemon=True)
+        server.start()
+    try:
+        if server is not None:
+            wait_for_port(port)
+        mix = build_mix(directory, with_api=mode != 'simple')
+        document_bytes = fetch_document(host, port)
+        result = asyncio.run(drive(host, port, mix, concurrency, duration, label))
+        result.document_bytes = document_bytes
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+    return result.summary()
+
+
+def print_summary(summary):
+    latency = summary['latency_ms']
+    print(f"\n📈 {summary['server']}: {summary['requests']:,} requests in {summary['seconds']}s "
+          f"→ {summary['requests_per_second']:,} req/s, {summary['megabytes_per_second']} MB/s, "
+          f"{summary['errors']} errors")
+    print(f"   Latency p50 {latency['p50']} ms | p95 {latency['p95']} ms | p99 {latency['p99']} ms")
+    print(f"   Page: {summary['document_bytes']:,} bytes uncompressed | Statuses: {summary['statuses']}")
+    print(f"   {'Kind':<18}{'Requests':>10}{'MB':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, stats in summary['by_kind'].items():
+        print(f"   {kind:<18}{stats['requests']:>10,}{stats['bytes'] / 1e6:>10.1f}"
+              f"{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}")
+
+
+def page_size_mismatches(summaries, expected):
+    """[(server, bytes)] of the servers that did not send the page's `expected` size"""
+    return [(summary['server'], summary['document_bytes']) for summary in summaries
+            if summary['document_bytes'] != expected]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard server")
+    parser.add_argument('directory', type=Path, help="dashboard output folder to serve")
+    parser.add_argument('--server', choices=SERVER_MODES + ('both',), default='both')
+    parser.add_argument('--url', help="test an already running server instead of starting one")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help="simultaneous viewers")
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="seconds per server")
+    parser.add_argument('--history', type=Path, help="top_15_winners_matrix.json for /api/history")
+    parser.add_argument('--json', type=Path, help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if not (args.directory / DEFAULT_DOCUMENT).exists():
+        parser.error(f"{args.directory} has no {DEFAULT_DOCUMENT}; run the dashboard first")
+
+    print(f"🔥 Load test: {args.concurrency} viewers, {args.duration:g}s per server")
+    if args.url:
+        summaries = [run_load(args.directory, url=args.url, concurrency=args.concurrency, duration=args.duration)]
+    else:
+        modes = SERVER_MODES if args.server == 'both' else (args.server,)
+        summaries = [run_load(args.directory, mode, concurrency=args.concurrency, duration=args.duration,
+                              history_path=args.history) for mode in modes]
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2), encoding='utf-8')
+        print(f"\n💾 Results saved to {args.json}")
+
+    expected = (args.directory / DEFAULT_DOCUMENT).stat().st_size
+    mismatches = page_size_mismatches(summaries, expected)
+    if mismatches:
+        for server, size in mismatches:
+            print(f"❌ {server} sent {size:,} bytes for /{DEFAULT_DOCUMENT}, the file has {expected:,}")
+        print("❌ The servers did not serve the same page; results not compared")
+        return 1
+    for summary in summaries:
+        print_summary(summary)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Console output and structured logging
+
+The stages talk to the console through say() and warn() instead of
+print(). In the default text mode these print exactly what the notebook
+cells always printed; `level` hides lines below it ('warning' keeps only
+problems), and JSON mode replaces the console text with one JSON event
+per line (event(): a name plus fields, e.g. a stage's timings) for
+schedulers and log collectors.
+
+Display-only tables (the formatted period tables, the top 15 table and
+the race chart table) are debug output: report code builds them only when
+displaying() is True - in a notebook, or when verbose (debug) output is
+on - so a headless run never spends time formatting frames nobody sees.
+"""
+import json
+import sys
+from datetime import datetime
+
+LOG_LEVELS = {'debug': 10, 'info': 20, 'warning': 30, 'error': 40}
+DEFAULT_LOG_LEVEL = 'info'
+
+
+class LogSettings:
+    """Process-wide output settings (see configure())"""
+    level = LOG_LEVELS[DEFAULT_LOG_LEVEL]
+    json = False
+    stream = None  # None: sys.stdout at the time of writing (notebooks swap it)
+
+
+settings = LogSettings()
+
+
+def configure(level=DEFAULT_LOG_LEVEL, json_logs=False, stream=None):
+    """Set the output level ('debug' = verbose, 'info', 'warning', 'error') and text or JSON lines"""
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Unknown log level: {level} (expected one of {', '.join(LOG_LEVELS)})")
+    settings.level = LOG_LEVELS[level]
+    settings.json = json_logs
+    settings.stream = stream
+
+
+def enabled(level='info'):
+    """True when output at `level` is shown"""
+    return LOG_LEVELS[level] >= settings.level
+
+
+def console(level='info'):
+    """True when human-readable lines at `level` are printed (text mode only)"""
+    return not settings.json and enabled(level)
+
+
+def verbose():
+    """True when debug output (display-only tables) is on"""
+    return enabled('debug')
+
+
+def in_notebook():
+    """True inside an IPython kernel (IPython is never imported just to find out)"""
+    ipython = sys.modules.get('IPython')
+    return ipython is not None and getattr(ipython, 'get_ipython', lambda: None)() is not None
+
+
+def displaying():
+    """True when display-only tables are worth building: in a notebook or in verbose mode"""
+    return in_notebook() or verbose()
+
+
+def write(line):
+    stream = settings.stream or sys.stdout
+    stream.write(line + '\n')
+
+
+def say(message='', level='info'):
+    """A console line (print() in text mode); in JSON mode warnings and errors become 'message' events"""
+    if not enabled(level):
+        return
+    if settings.json:
+        if LOG_LEVELS[level] >= LOG_LEVELS['warning'] and message.strip():
+            event('message', level=level, message=message.strip())
+        return
+    write(message)
+
+
+def warn(message):
+    """say() at warning level"""
+    say(message, level='warning')
+
+
+def event(name, /, level='info', **fields):
+    """A structured log event: one JSON line in JSON mode, nothing in text mode"""
+    if not settings.json or not enabled(level):
+        return
+    record = {'time': datetime.now().isoformat(timespec='milliseconds'), 'level': level, 'event': name, **fields}
+    write(json.dumps(record, ensure_ascii=False, default=str))
+
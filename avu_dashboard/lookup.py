@@ -0,0 +1,69 @@
+"""
+Sorted-key lookups: integer key -> row position, resolved in one vectorized call
+
+KeyIndex is built once over a key column (item numbers of the stock list
+or of the campaigns) and resolves a whole column of query keys at once,
+instead of a merge that hashes and copies both frames:
+
+    stock_index = KeyIndex(stock_ids)
+    stock_quantity = stock_index.take(stock['stock'], winners['Main_Item_No'])
+
+Keys are held as a sorted array searched with np.searchsorted, or, when
+they span at most DENSE_SPAN_FACTOR times their count (item numbers
+usually do), as a dense array indexed by key - smallest key. The first
+row wins when a key repeats, like drop_duplicates(keep='first').
+"""
+import numpy as np
+import pandas as pd
+
+DENSE_SPAN_FACTOR = 4
+MISSING = -1
+
+
+class KeyIndex:
+    """Row position of every distinct integer key (first occurrence)"""
+
+    def __init__(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        self.size = len(keys)
+        self.low = int(keys.min()) if self.size else 0
+        span = int(keys.max()) - self.low + 1 if self.size else 0
+        if span <= DENSE_SPAN_FACTOR * max(self.size, 1):
+            # dense[key - low] = first (smallest) row of key, MISSING for numbers that are not keys
+            self.dense = np.full(span, self.size, dtype=np.int64)
+            np.minimum.at(self.dense, keys - self.low, np.arange(self.size, dtype=np.int64))
+            self.dense[self.dense == self.size] = MISSING
+            self.keys = self.rows = None
+        else:
+            self.dense = None
+            self.keys, self.rows = np.unique(keys, return_index=True)
+
+    @property
+    def first_rows(self):
+        """Row positions of each key's first occurrence, in row order"""
+        rows = self.dense[self.dense != MISSING] if self.dense is not None else self.rows
+        return np.sort(rows)
+
+    def positions(self, query):
+        """Row position of each query key, MISSING (-1) for keys not in the index"""
+        query = np.asarray(query, dtype=np.int64)
+        if self.dense is not None:
+            offsets = query - self.low
+            found = (offsets >= 0) & (offsets < len(self.dense))
+            positions = np.full(len(query), MISSING, dtype=np.int64)
+            positions[found] = self.dense[offsets[found]]
+            return positions
+        if not len(self.keys):
+            return np.full(len(query), MISSING, dtype=np.int64)
+        slots = np.minimum(np.searchsorted(self.keys, query), len(self.keys) - 1)
+        return np.where(self.keys[slots] == query, self.rows[slots], MISSING)
+
+    def take(self, values, query):
+        """values (a Series in key row order) at each query key, NaN where the key is missing
+
+        Returns a Series on the query's index (when query is a Series) named like values.
+        """
+        positions = self.positions(query)
+        taken = values.array.take(positions, allow_fill=True)
+        index = query.index if isinstance(query, pd.Series) else None
+        return pd.Series(taken, index=index, name=values.name)
@@ -0,0 +1,151 @@
+"""
+Request metrics for the local dashboard server
+
+ServerMetrics counts requests, bytes and latencies per route and renders
+them in the Prometheus text exposition format for /metrics. Routes are
+grouped (/assets/*, /data/*, /api/campaign/<no>, ...) so the number of
+series stays bounded while hashed file names change from build to build.
+Recording a request costs one perf_counter() call, one bisect and one
+lock acquisition.
+"""
+import threading
+import time
+from bisect import bisect_left
+
+# Latency histogram upper bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+API_ROUTES = ('/api/winners', '/api/history', '/api/tiers')
+
+
+def route_label(path, default_document):
+    """Bounded route name for a request path"""
+    if path in ('/', f'/{default_document}'):
+        return '/'
+    if path in ('/events', '/metrics', '/build.json') or path in API_ROUTES:
+        return path
+    if path.startswith('/api/campaign/'):
+        return '/api/campaign/<no>'
+    if path.startswith('/api/'):
+        return '/api/other'
+    if path.startswith('/assets/'):
+        return '/assets/*'
+    if path.startswith('/data/'):
+        return '/data/*'
+    return '/other'
+
+
+class RouteStats:
+    """Latency histogram and byte count of one route"""
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.count = 0
+        self.bytes = 0
+
+
+class ServerMetrics:
+    """Thread-safe counters behind /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}          # (route, method, status) -> count
+        self.routes = {}            # route -> RouteStats
+        self.in_flight = 0
+        self.event_streams = 0
+        self.conditional_requests = 0
+        self.not_modified = 0
+
+    def request_started(self, streaming=False):
+        """Mark a request in flight; returns its start time"""
+        with self._lock:
+            self.in_flight += 1
+            if streaming:
+                self.event_streams += 1
+        return time.perf_counter()
+
+    def request_finished(self, started, route, method, status, sent_bytes, conditional, streaming=False):
+        """Record a finished request (event streams are counted but not timed)"""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            key = (route, method, status)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = RouteStats()
+            stats.bytes += sent_bytes
+            if streaming:
+                self.event_streams -= 1
+            else:
+                stats.bucket_counts[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+                stats.latency_sum += elapsed
+                stats.count += 1
+            if conditional:
+                self.conditional_requests += 1
+                if status == 304:
+                    self.not_modified += 1
+
+    def render(self, cached_artifacts=0):
+        """Prometheus text exposition of the current values"""
+        with self._lock:
+            requests = sorted(self.requests.items())
+            routes = sorted((route, stats.bucket_counts[:], stats.latency_sum, stats.count, stats.bytes)
+                            for route, stats in self.routes.items())
+            in_flight, event_streams = self.in_flight, self.event_streams
+            conditional, not_modified = self.conditional_requests, self.not_modified
+
+        lines = [
+            "# HELP avu_dashboard_requests_total Requests served by route, method and status.",
+            "# TYPE avu_dashboard_requests_total counter",
+        ]
+        lines += [f'avu_dashboard_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}'
+                  for (route, method, status), count in requests]
+
+        lines += [
+            "# HELP avu_dashboard_response_bytes_total Response body bytes sent by route.",
+            "# TYPE avu_dashboard_response_bytes_total counter",
+        ]
+        lines += [f'avu_dashboard_response_bytes_total{{route="{route}"}} {sent}' for route, _, _, _, sent in routes]
+
+        lines += [
+            "# HELP avu_dashboard_request_duration_seconds Time to answer a request, by route.",
+            "# TYPE avu_dashboard_request_duration_seconds histogram",
+        ]
+        for route, bucket_counts, latency_sum, count, _ in routes:
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'avu_dashboard_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'avu_dashboard_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {count}')
+            lines.append(f'avu_dashboard_request_duration_seconds_sum{{route="{route}"}} {latency_sum:.6f}')
+            lines.append(f'avu_dashboard_request_duration_seconds_count{{route="{route}"}} {count}')
+
+        lines += [
+            "# HELP avu_dashboard_conditional_requests_total Requests carrying If-None-Match or If-Modified-Since.",
+            "# TYPE avu_dashboard_conditional_requests_total counter",
+            f"avu_dashboard_conditional_requests_total {conditional}",
+            "# HELP avu_dashboard_not_modified_total Conditional requests answered with 304 Not Modified.",
+            "# TYPE avu_dashboard_not_modified_total counter",
+            f"avu_dashboard_not_modified_total {not_modified}",
+            "# HELP avu_dashboard_conditional_hit_ratio Share of conditional requests answered with 304.",
+            "# TYPE avu_dashboard_conditional_hit_ratio gauge",
+            f"avu_dashboard_conditional_hit_ratio {not_modified / conditional if conditional else 0:.4f}",
+            "# HELP avu_dashboard_in_flight_requests Requests currently being served (event streams included).",
+            "# TYPE avu_dashboard_in_flight_requests gauge",
+            f"avu_dashboard_in_flight_requests {in_flight}",
+            "# HELP avu_dashboard_event_streams Open live-reload event streams.",
+            "# TYPE avu_dashboard_event_streams gauge",
+            f"avu_dashboard_event_streams {event_streams}",
+            "# HELP avu_dashboard_cached_artifacts Files held in memory.",
+            "# TYPE avu_dashboard_cached_artifacts gauge",
+            f"avu_dashboard_cached_artifacts {cached_artifacts}",
+            "# HELP avu_dashboard_start_time_seconds Server start time (Unix epoch).",
+            "# TYPE avu_dashboard_start_time_seconds gauge",
+            f"avu_dashboard_start_time_seconds {self.started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
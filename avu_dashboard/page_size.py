@@ -0,0 +1,88 @@
+"""
+Size breakdown of the dashboard page and its byte budgets
+
+Every section of the page (charts, race data, tables, the All Campaigns
+payload, styles, scripts) is measured as the browser loads it on first
+visit: the bytes it fills into the HTML plus the files the page fetches
+for it (the race data in lazy mode, the CSS/JS in hashed mode). "shell" is
+the template markup around the sections, "page" the HTML file alone and
+"total" the page plus those files. Each size is reported raw and gzipped
+(sections compressed on their own, so their gzip sizes add up to a little
+more than the page's).
+
+Budgets are {key: bytes} with keys like "page", "race_data" or
+"page_gzip" (see config.SIZE_SECTIONS); PageOptions.size_warn budgets warn,
+PageOptions.size_fail budgets stop the build before the page is written.
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from avu_dashboard.compression import compress_bytes
+from avu_dashboard.html_builder import PAGE_SECTIONS, fill_dashboard_page
+
+GZIP_SUFFIX = "_gzip"
+
+
+class BudgetExceeded(RuntimeError):
+    """A page section is over its size_fail budget"""
+
+
+@dataclass
+class SectionSize:
+    inline: int     # bytes in the HTML
+    external: int   # bytes of the files the page fetches for the section
+    gzip: int
+    br: Optional[int] = None  # the page's brotli sibling, when precompressed with brotli
+
+    @property
+    def raw(self):
+        return self.inline + self.external
+
+
+def gzip_size(data):
+    return len(compress_bytes(data, 'gzip')) if data else 0
+
+
+def page_sizes(values, html_content, external_files=None):
+    """{section: SectionSize} for the page sections, shell, page and total
+
+    values: dashboard_page_values() of the page; external_files: {section: [paths]} it fetches.
+    """
+    external_files = external_files or {}
+    sizes = {}
+    external_bytes = external_gzip = 0
+    for section, placeholders in PAGE_SECTIONS.items():
+        inline = ''.join(str(values[name]) for name in placeholders).encode('utf-8')
+        files = [Path(path).read_bytes() for path in external_files.get(section, ())]
+        files_gzip = sum(gzip_size(data) for data in files)
+        sizes[section] = SectionSize(inline=len(inline), external=sum(len(data) for data in files),
+                                     gzip=gzip_size(inline) + files_gzip)
+        external_bytes += sizes[section].external
+        external_gzip += files_gzip
+
+    shell = fill_dashboard_page({**values, **{name: '' for names in PAGE_SECTIONS.values() for name in names}})
+    shell = shell.encode('utf-8')
+    sizes['shell'] = SectionSize(inline=len(shell), external=0, gzip=gzip_size(shell))
+
+    page = html_content.encode('utf-8')
+    sizes['page'] = SectionSize(inline=len(page), external=0, gzip=gzip_size(page))
+    sizes['total'] = SectionSize(inline=len(page), external=external_bytes, gzip=sizes['page'].gzip + external_gzip)
+    return sizes
+
+
+def budget_violations(sizes, budgets):
+    """[(key, size, budget)] of the budgets the sizes exceed"""
+    violations = []
+    for key, budget in budgets.items():
+        section = key[:-len(GZIP_SUFFIX)] if key.endswith(GZIP_SUFFIX) else key
+        size = sizes[section].gzip if key.endswith(GZIP_SUFFIX) else sizes[section].raw
+        if size > budget:
+            violations.append((key, size, budget))
+    return violations
+
+
+def sizes_report(sizes):
+    """JSON-ready {section: {raw, inline, external, gzip[, br]}}"""
+    return {section: {'raw': size.raw, **{key: value for key, value in asdict(size).items() if value is not None}}
+            for section, size in sizes.items()}
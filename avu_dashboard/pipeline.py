@@ -0,0 +1,271 @@
+"""
+Dashboard pipeline
+
+run_pipeline() runs the stages of avu_dashboard.stages in order, handing
+each stage the typed results of the earlier ones:
+
+    load → score → periods → history → charts → html (→ gif) → serve
+
+`until` stops after any stage, so the early stages can be run (and
+inspected) without writing the dashboard or starting a server.
+
+Runs are incremental (see avu_dashboard.incremental): STAGE_INPUTS lists
+what each stage reads, and a stage whose inputs are unchanged since the
+last run is skipped. A stock-only change reruns periods, charts and html
+but not score or history; an unchanged snapshot folder skips everything.
+Stage modules are imported when their stage runs, so a run that skips
+everything never loads pandas or matplotlib.
+
+Every run is profiled per stage (avu_dashboard.profiling): run_report.json
+next to the dashboard (with the page size breakdown when the html stage
+ran) and a summary table at the end. Console output goes
+through avu_dashboard.logs; in JSON log mode the run is a stream of
+'stage' events and a closing 'run' event instead.
+"""
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from avu_dashboard.config import (
+    CAMPAIGN_STATS_FILE, DEFAULT_PORT, OMT_FILE, STOCK_FILE, DashboardPaths, PageOptions,
+)
+from avu_dashboard.incremental import BuildCache
+from avu_dashboard.logs import console, event, say, verbose, warn
+from avu_dashboard.profiling import PROFILE_SUBDIR, RUN_REPORT_FILE, StageProfiler, count_rows, peak_rss_bytes
+from avu_dashboard.staging import publish_history, stage_inputs
+
+if TYPE_CHECKING:
+    from avu_dashboard.stages.charts import Charts
+    from avu_dashboard.stages.gif import RaceGif
+    from avu_dashboard.stages.history import History
+    from avu_dashboard.stages.load import Snapshots
+    from avu_dashboard.stages.page import Page
+    from avu_dashboard.stages.periods import Periods
+    from avu_dashboard.stages.score import Scores
+
+STAGES = ('load', 'score', 'periods', 'history', 'charts', 'html', 'serve')
+
+# Snapshot files ('campaigns', 'stock', 'omt') and earlier stages each stage reads
+STAGE_INPUTS = {
+    'score': ('campaigns',),
+    'periods': ('score', 'stock'),
+    'history': ('score',),
+    'charts': ('periods',),
+    'html': ('score', 'periods', 'history', 'charts'),
+    'gif': ('history',),
+}
+
+# Package sources behind each stage (paths relative to avu_dashboard/); editing them reruns the stage
+STAGE_SOURCES = {
+    'score': ('stages/score.py', 'stages/load.py', 'filters.py', 'lookup.py', 'formatting.py'),
+    'periods': ('stages/periods.py', 'filters.py', 'lookup.py', 'formatting.py'),
+    'history': ('stages/history.py',),
+    'charts': ('stages/charts.py', 'formatting.py'),
+    'html': ('stages/page.py', 'html_builder.py', 'build_manifest.py', 'compression.py', 'page_size.py',
+             'formatting.py', 'templates', 'static'),
+    'gif': ('stages/gif.py',),
+}
+
+
+@dataclass
+class PipelineResult:
+    """Results of the stages that ran (or were loaded from the build cache)"""
+    paths: DashboardPaths = field(default_factory=DashboardPaths)
+    snapshots: Optional['Snapshots'] = None
+    scores: Optional['Scores'] = None
+    periods: Optional['Periods'] = None
+    history: Optional['History'] = None
+    charts: Optional['Charts'] = None
+    page: Optional['Page'] = None
+    gif: Optional['RaceGif'] = None
+    ran: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    cache: Optional[BuildCache] = field(default=None, repr=False)
+
+    def stage(self, stage):
+        """A stage's result: from this run, or unpickled from the build cache when it was skipped"""
+        value = getattr(self, RESULT_FIELDS[stage])
+        if value is None:
+            value = self.cache.load(stage)
+            setattr(self, RESULT_FIELDS[stage], value)
+        return value
+
+
+# Stage -> PipelineResult field
+RESULT_FIELDS = {'score': 'scores', 'periods': 'periods', 'history': 'history', 'charts': 'charts',
+                 'html': 'page', 'gif': 'gif'}
+
+
+class PipelineRun:
+    """One run of the stages: skips the fresh ones and loads their results only when needed"""
+
+    def __init__(self, paths, options, cache, report, profiler):
+        self.paths = paths
+        self.options = options
+        self.cache = cache
+        self.report = report
+        self.profiler = profiler
+        self.result = PipelineResult(paths=paths, cache=cache)
+        self.snapshot_digests = {
+            'campaigns': cache.file_digest(Path(paths.snap_dir) / CAMPAIGN_STATS_FILE),
+            'stock': cache.file_digest(Path(paths.snap_dir) / STOCK_FILE),
+            'omt': cache.file_digest(Path(paths.snap_dir) / OMT_FILE),
+        }
+
+    def snapshots(self):
+        """The snapshot frames, read on first use"""
+        if self.result.snapshots is None:
+            from avu_dashboard.stages.load import load_snapshots, report_snapshots
+            with self.profiler.stage('load') as timing:
+                self.result.snapshots = load_snapshots(self.paths.snap_dir)
+                timing.rows = count_rows(self.result.snapshots)
+            if self.report:
+                report_snapshots(self.result.snapshots)
+            say()
+        return self.result.snapshots
+
+    def get(self, stage):
+        """A stage's result (see PipelineResult.stage)"""
+        return self.result.stage(stage)
+
+    def stage_inputs(self, stage):
+        """Digests of what the stage reads, plus its settings and source files"""
+        inputs = {name: self.snapshot_digests[name] if name in self.snapshot_digests else self.cache.digests[name]
+                  for name in STAGE_INPUTS[stage]}
+        inputs['sources'] = self.cache.source_digest(STAGE_SOURCES[stage])
+        if stage == 'history':
+            inputs['historical_dir'] = str(self.paths.historical_dir)
+        elif stage == 'html':
+            inputs['output_dir'] = str(self.paths.output_dir)
+            inputs['options'] = asdict(self.options)
+        elif stage == 'gif':
+            inputs['output_dir'] = str(self.paths.output_dir)
+        return inputs
+
+    def run(self, stage):
+        """Run one stage unless its inputs are unchanged; returns True when it ran"""
+        key = self.cache.stage_key(stage, self.stage_inputs(stage))
+        if self.cache.is_fresh(stage, key):
+            say(f"⏭️ {stage}: inputs unchanged since {self.cache.last_built(stage)} - skipped")
+            self.profiler.skipped(stage)
+            self.result.skipped.append(stage)
+            return False
+
+        # Inputs first, so each timing covers the stage's own work
+        for name in STAGE_INPUTS[stage]:
+            if name in self.snapshot_digests:
+                self.snapshots()
+            elif getattr(self.result, RESULT_FIELDS[name]) is None:
+                with self.profiler.stage(name, status='loaded') as timing:
+                    timing.rows = count_rows(self.get(name))
+
+        with self.profiler.stage(stage) as timing:
+            value, outputs, exclude, valid_until = getattr(self, f"build_{stage}")()
+            timing.rows = count_rows(value)
+        setattr(self.result, RESULT_FIELDS[stage], value)
+        self.cache.record(stage, key, value, exclude=exclude, outputs=outputs, valid_until=valid_until,
+                          seconds=timing.wall_seconds)
+        self.result.ran.append(stage)
+        say()
+        return True
+
+    # Each build_<stage> returns (result, files written, result fields left out of the digest, valid until)
+
+    def build_score(self):
+        from avu_dashboard.stages.score import report_scores, score_campaigns
+        scores = score_campaigns(self.snapshots())
+        if self.report:
+            report_scores(scores)
+        return scores, (), (), None
+
+    def build_periods(self):
+        from avu_dashboard.stages.periods import attach_stock, report_periods, selection_expires
+        periods = attach_stock(self.get('score'), self.snapshots())
+        if self.report:
+            report_periods(periods, self.snapshots())
+        # The clock only matters through the period cutoffs
+        return periods, (), ('now',), selection_expires(periods)
+
+    def build_history(self):
+        from avu_dashboard.stages.history import record_history, report_history
+        history = record_history(self.get('score'), self.paths.historical_dir)
+        if self.report:
+            report_history(history, self.get('score'))
+        return history, (history.historical_file, history.race_chart_file), (), None
+
+    def build_charts(self):
+        from avu_dashboard.stages.charts import render_charts
+        return render_charts(self.get('periods')), (), (), None
+
+    def build_html(self):
+        from avu_dashboard.stages.page import build_page, report_page
+        page = build_page(self.get('score'), self.get('periods'), self.get('history'), self.get('charts'),
+                          self.paths.output_dir, self.options)
+        if self.report:
+            report_page(page, self.get('charts'))
+        # A deleted payload, asset or sibling reruns the stage: the page links them all
+        return page, page.files, (), None
+
+    def build_gif(self):
+        from avu_dashboard.stages.gif import write_race_gif
+        race_gif = write_race_gif(self.get('history'), self.paths.output_dir)
+        return race_gif, (race_gif.gif_file,), (), None
+
+
+def run_pipeline(paths=None, options=None, until='html', report=True, port=None, open_browser=True,
+                 gif=False, force=False, profile=False, trace_memory=False):
+    """Run the stages from load up to and including `until`; returns the PipelineResult
+
+    report=False skips the notebook summaries and tables; gif=True also
+    renders the animated race chart after the html stage; force=True reruns
+    every stage; profile=True dumps cProfile stats per stage under
+    <output>/profile and trace_memory=True adds tracemalloc peaks to the run
+    report; with paths.stage_dir set the inputs are staged locally first (see
+    avu_dashboard.staging); the serve stage blocks until interrupted.
+    """
+    if until not in STAGES:
+        raise ValueError(f"Unknown stage: {until} (expected one of {', '.join(STAGES)})")
+    paths = paths or DashboardPaths()
+    last = STAGES.index(until)
+    cache = BuildCache(paths.cache_dir, force=force)
+    profiler = StageProfiler(trace_memory=trace_memory,
+                             cprofile_dir=Path(paths.output_dir) / PROFILE_SUBDIR if profile else None)
+    staging = None
+    if paths.stage_dir:
+        with profiler.stage('staging'):
+            staging = stage_inputs(paths)
+        paths = staging.paths
+    # The summaries are console text: skipped at --log-level warning and in JSON log mode (unless
+    # verbose, where their tables become 'table' events)
+    run = PipelineRun(paths, options or PageOptions(), cache, report and (console() or verbose()), profiler)
+
+    if last == STAGES.index('load'):
+        run.snapshots()
+    try:
+        for stage in STAGES[1:min(last, STAGES.index('html')) + 1]:
+            run.run(stage)
+        if gif and last >= STAGES.index('html'):
+            run.run('gif')
+    finally:
+        if staging and 'history' in run.result.ran:
+            publish_history(staging)
+        cache.save()
+        profiler.print_summary()
+        try:
+            report_file = profiler.write_report(Path(paths.output_dir) / RUN_REPORT_FILE, until=until,
+                                                ran=run.result.ran, skipped=run.result.skipped, paths=asdict(paths),
+                                                page_sizes=run.result.page.sizes if run.result.page else None)
+            say(f"🧾 Run report: {report_file}")
+        except OSError as e:
+            report_file = None
+            warn(f"⚠️ Run report not written: {e}")
+        event('run', until=until, ran=run.result.ran, skipped=run.result.skipped,
+              seconds=round(profiler.elapsed, 3), peak_rss_bytes=peak_rss_bytes(), report=report_file)
+    result = run.result
+    if last < STAGES.index('serve'):
+        return result
+
+    from avu_dashboard.stages.serve import serve_dashboard, update_api
+    api = update_api(None, result.stage('periods'), result.stage('history'), build_id=result.stage('html').build_id)
+    serve_dashboard(paths.output_dir, api=api, port=port or DEFAULT_PORT, open_browser=open_browser)
+    return result
@@ -0,0 +1,176 @@
+"""
+Per-stage profiling of a pipeline run
+
+StageProfiler wraps every stage of a run and records its wall time, CPU
+time, the process's peak RSS once the stage is done, optionally the
+tracemalloc peak within the stage, and the row counts of the frames the
+stage produced. The records go to a JSON run report next to the
+dashboard (run_report.json), to a one-screen summary table (a 'stage'
+event per record in JSON log mode); with
+cprofile_dir set, each stage's cProfile stats are dumped there as
+<stage>.prof for drill-down (python -m pstats <file>).
+"""
+import cProfile
+import ctypes
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from avu_dashboard.logs import event, say
+
+RUN_REPORT_FILE = "run_report.json"
+PROFILE_SUBDIR = "profile"
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None where it cannot be read)"""
+    if sys.platform == 'win32':
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    'PeakWorkingSetSize', 'WorkingSetSize', 'QuotaPeakPagedPoolUsage', 'QuotaPagedPoolUsage',
+                    'QuotaPeakNonPagedPoolUsage', 'QuotaNonPagedPoolUsage', 'PagefileUsage', 'PeakPagefileUsage')]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+        return None
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # kilobytes on Linux
+
+
+def count_rows(value):
+    """Row counts of the frames in a stage result: {field: rows}, dicts of frames as field.key"""
+    rows = {}
+    if value is None or not is_dataclass(value):
+        return rows
+    for item in fields(value):
+        member = getattr(value, item.name)
+        if getattr(member, 'ndim', 0) >= 1:  # frames and arrays, not numpy scalars
+            rows[item.name] = int(member.shape[0])
+        elif isinstance(member, dict):
+            for key, frame in member.items():
+                if getattr(frame, 'ndim', 0) >= 1:
+                    rows[f"{item.name}.{key}"] = int(frame.shape[0])
+    return rows
+
+
+@dataclass
+class StageTiming:
+    """One stage of a run ('ran', 'skipped' or 'loaded' from the build cache)"""
+    stage: str
+    status: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: Optional[int] = None
+    traced_peak_bytes: Optional[int] = None
+    rows: Dict[str, int] = field(default_factory=dict)
+    profile: Optional[str] = None
+
+
+class StageProfiler:
+    """Collects a StageTiming per stage of one run"""
+
+    def __init__(self, trace_memory=False, cprofile_dir=None):
+        self.trace_memory = trace_memory
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.records = []
+        self.started = datetime.now()
+        self.started_clock = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name, status='ran'):
+        """Time the block as one stage; the yielded StageTiming can take row counts"""
+        record = StageTiming(stage=name, status=status)
+        profile = cProfile.Profile() if self.cprofile_dir and status == 'ran' else None
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile:
+            profile.enable()
+        try:
+            yield record
+        finally:
+            if profile:
+                profile.disable()
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            record.peak_rss_bytes = peak_rss_bytes()
+            if self.trace_memory:
+                record.traced_peak_bytes = tracemalloc.get_traced_memory()[1]
+            if profile:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                record.profile = str(self.cprofile_dir / f"{name}.prof")
+                profile.dump_stats(record.profile)
+            self.records.append(record)
+            event('stage', **asdict(record))
+
+    @property
+    def elapsed(self):
+        """Seconds since the run started"""
+        return time.perf_counter() - self.started_clock
+
+    def skipped(self, name):
+        """Record a stage the build cache skipped"""
+        record = StageTiming(stage=name, status='skipped', peak_rss_bytes=peak_rss_bytes())
+        self.records.append(record)
+        event('stage', **asdict(record))
+
+    def report(self, **context):
+        """The run report as a dict (context: until, paths, ... as given)"""
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_seconds': round(self.elapsed, 3),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pid': os.getpid(),
+            **context,
+            'stages': [asdict(record) for record in self.records],
+        }
+
+    def write_report(self, path, **context):
+        """Write the run report as JSON; returns the path"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(**context), indent=2, ensure_ascii=False, default=str),
+                        encoding='utf-8')
+        return path
+
+    def print_summary(self):
+        """One line per stage: status, wall/CPU seconds, peak RSS, traced peak and rows"""
+        def megabytes(value):
+            return f"{value / (1024 * 1024):.0f} MB" if value is not None else "-"
+
+        say("⏱️ RUN PROFILE")
+        say("="*88)
+        say(f"{'stage':<10} {'status':<8} {'wall s':>8} {'cpu s':>8} {'peak RSS':>10} {'traced':>9}  rows")
+        for record in self.records:
+            rows = ', '.join(f"{name} {count}" for name, count in record.rows.items())
+            if len(rows) > 36:
+                rows = rows[:33] + "..."
+            say(f"{record.stage:<10} {record.status:<8} {record.wall_seconds:>8.3f} {record.cpu_seconds:>8.3f} "
+                f"{megabytes(record.peak_rss_bytes):>10} {megabytes(record.traced_peak_bytes):>9}  {rows}")
+        total = self.elapsed
+        say(f"{'total':<10} {'':<8} {total:>8.3f} {'':>8} {megabytes(peak_rss_bytes()):>10}")
+        profiles = [record.profile for record in self.records if record.profile]
+        if profiles:
+            say(f"🔬 cProfile stats: {Path(profiles[0]).parent} (python -m pstats <stage>.prof)")
@@ -0,0 +1,386 @@
+"""
+Local dashboard server
+
+DashboardServer is a ThreadingHTTPServer (one thread per connection,
+HTTP/1.1 keep-alive) that serves the dashboard output folder from memory.
+Each file is read once together with its precompressed .br/.gz siblings and
+re-read only when its size or modification time changes; files a new build
+deleted are dropped from memory when build.json changes. Responses carry a
+strong ETag and Last-Modified, conditional requests get 304s, and
+Cache-Control separates content-hashed assets (immutable) from the HTML
+shell and data files (always revalidated). With a DashboardAPI attached,
+/api/... requests are answered from memory as JSON (see avu_dashboard.api).
+/events is a Server-Sent Events stream announcing the build id in build.json
+whenever a new run is published. /metrics reports request counts, bytes,
+latencies and 304 hit ratio in the Prometheus text format (see
+avu_dashboard.metrics).
+"""
+import email.utils
+import hashlib
+import http.server
+import json
+import mimetypes
+import re
+import threading
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from avu_dashboard.build_manifest import BUILD_MANIFEST
+from avu_dashboard.compression import ENCODINGS, parse_accept_encoding
+from avu_dashboard.html_builder import DASHBOARD_FILE, HASH_LENGTH
+from avu_dashboard.metrics import METRICS_CONTENT_TYPE, ServerMetrics, route_label
+
+DEFAULT_DOCUMENT = DASHBOARD_FILE
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+WATCH_INTERVAL = 1.0    # seconds between build.json checks
+SSE_KEEPALIVE = 15.0    # seconds between keep-alive comments on idle event streams
+SSE_RETRY_MS = 5000     # browser reconnect delay after a dropped stream
+
+# assets/dashboard.<hash>.css and friends never change under the same name
+HASHED_ASSET_RE = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}\.[A-Za-z0-9]+$")
+
+
+class Artifact:
+    """One file held in memory, with its precompressed variants"""
+
+    def __init__(self, path, signature, body, variants):
+        self.path = path
+        self.signature = signature
+        self.body = body
+        self.variants = variants
+        content_type, file_encoding = mimetypes.guess_type(path.name)
+        # A .json.gz requested by name is a gzip file, not gzip-encoded JSON
+        self.content_type = 'application/gzip' if file_encoding == 'gzip' else content_type or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type in ('application/json', 'application/javascript'):
+            self.content_type += '; charset=utf-8'
+        self.mtime = int(signature[0][0] // 1_000_000_000)
+        self.last_modified = email.utils.formatdate(self.mtime, usegmt=True)
+        # Strong validator over the content; each encoding gets its own tag
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+
+    def select(self, accept_encoding):
+        """(encoding or None, body, quoted ETag) for the best variant the client accepts"""
+        if self.variants:
+            accepted = parse_accept_encoding(accept_encoding)
+            for encoding in ENCODINGS:
+                if encoding in accepted and encoding in self.variants:
+                    return encoding, self.variants[encoding], f'"{self.etag}-{encoding}"'
+        return None, self.body, f'"{self.etag}"'
+
+
+class ArtifactStore:
+    """In-memory copy of the output folder, refreshed per file when it changes on disk"""
+
+    def __init__(self, root):
+        self.root = Path(root).resolve()
+        self._artifacts = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, url_path):
+        """Map a URL path to a file under root; None for anything outside it"""
+        relative = unquote(url_path).lstrip('/')
+        if not relative or relative.endswith('/'):
+            relative += DEFAULT_DOCUMENT if not relative else 'index.html'
+        path = (self.root / relative).resolve()
+        if path != self.root and self.root not in path.parents:
+            return None
+        return path
+
+    @staticmethod
+    def _signature(path):
+        """(mtime_ns, size) of the file and each compressed sibling; None if the file is missing"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        signature = [(stat.st_mtime_ns, stat.st_size)]
+        for suffix in ENCODINGS.values():
+            try:
+                sibling = path.with_name(path.name + suffix).stat()
+                signature.append((sibling.st_mtime_ns, sibling.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _load(self, path, signature):
+        body = path.read_bytes()
+        variants = {}
+        for (encoding, suffix), sibling_signature in zip(ENCODINGS.items(), signature[1:]):
+            # Siblings older than the file belong to a previous build
+            if sibling_signature is not None and sibling_signature[0] >= signature[0][0]:
+                variants[encoding] = path.with_name(path.name + suffix).read_bytes()
+        return Artifact(path, signature, body, variants)
+
+    def __len__(self):
+        return len(self._artifacts)
+
+    def evict(self, path):
+        with self._lock:
+            self._artifacts.pop(path, None)
+
+    def prune(self):
+        """Drop the files a new build removed (old hashed assets); returns how many"""
+        with self._lock:
+            gone = [path for path in self._artifacts if not path.is_file()]
+            for path in gone:
+                del self._artifacts[path]
+        return len(gone)
+
+    def get(self, url_path):
+        """Current Artifact for a URL path, or None when there is no such file"""
+        path = self.resolve(url_path)
+        if path is None:
+            return None
+        signature = self._signature(path) if path.is_file() else None
+        if signature is None:
+            self.evict(path)
+            return None
+
+        artifact = self._artifacts.get(path)
+        if artifact is None or artifact.signature != signature:
+            try:
+                artifact = self._load(path, signature)
+            except OSError:
+                return None
+            with self._lock:
+                self._artifacts[path] = artifact
+        return artifact
+
+
+class BuildWatcher:
+    """Polls the output folder's build.json and wakes event streams when the build id changes
+
+    on_change(build_id) runs on the polling thread after each new build id.
+    """
+
+    def __init__(self, root, interval=WATCH_INTERVAL, on_change=None):
+        self.path = Path(root) / BUILD_MANIFEST
+        self.interval = interval
+        self.on_change = on_change
+        self.build_id = None
+        self._signature = None
+        self._changed = threading.Condition()
+        self._stop = threading.Event()
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="build-watcher", daemon=True)
+        self._thread.start()
+
+    def check(self):
+        """Re-read build.json if its size or modification time changed"""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        try:
+            build_id = json.loads(self.path.read_text(encoding='utf-8')).get('build')
+        except (OSError, ValueError):
+            return  # caught mid-write; the next poll sees the complete file
+        self._signature = signature
+        if build_id != self.build_id:
+            with self._changed:
+                self.build_id = build_id
+                self._changed.notify_all()
+            if self.on_change is not None:
+                self.on_change(build_id)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """End the polling thread (waits for a check in progress)"""
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def wait(self, known_build, timeout):
+        """Block until the build id differs from known_build or timeout passes; returns the current id"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.build_id != known_build, timeout)
+            return self.build_id
+
+
+def cache_control(url_path, query):
+    """Hashed or versioned (?v=) URLs are immutable; everything else is revalidated"""
+    if HASHED_ASSET_RE.search(url_path) or re.search(r"(^|&)v=", query):
+        return IMMUTABLE_CACHE
+    return REVALIDATE_CACHE
+
+
+class DashboardRequestHandler(http.server.BaseHTTPRequestHandler):
+    """GET/HEAD handler over the server's ArtifactStore"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "AVUDashboard/1.0"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive responses
+    # stall ~40 ms waiting for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.serve(head_only=False)
+
+    def do_HEAD(self):
+        self.serve(head_only=True)
+
+    def serve(self, head_only):
+        url = urlsplit(self.path)
+        route = route_label(url.path, DEFAULT_DOCUMENT)
+        streaming = route == '/events'
+        conditional = 'If-None-Match' in self.headers or 'If-Modified-Since' in self.headers
+        self.status = None
+        self.bytes_sent = 0
+        metrics = self.server.metrics
+        started = metrics.request_started(streaming)
+        try:
+            if url.path == '/api' or url.path.startswith('/api/'):
+                self.serve_api(url, head_only)
+            elif streaming:
+                self.serve_events(head_only)
+            elif route == '/metrics':
+                self.serve_metrics(head_only)
+            else:
+                self.serve_artifact(url, head_only)
+        finally:
+            # No status yet: the handler raised before answering (counted as a server error)
+            metrics.request_finished(started, route, self.command, self.status or 500, self.bytes_sent,
+                                     conditional, streaming)
+
+    def send_response(self, code, message=None):
+        self.status = code
+        super().send_response(code, message)
+
+    def serve_metrics(self, head_only):
+        body = self.server.metrics.render(len(self.server.store)).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-store")
+        self.send_body(body, METRICS_CONTENT_TYPE, None, head_only)
+
+    def serve_api(self, url, head_only):
+        if self.server.api is None:
+            self.send_error(404, "No API attached to this server")
+            return
+        status, body, etag = self.server.api.handle(url.path, url.query)
+        not_modified = etag is not None and self.is_not_modified(etag)
+        self.send_response(304 if not_modified else status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Cache-Control", REVALIDATE_CACHE)
+        if not_modified:
+            self.end_headers()
+            return
+        self.send_body(body, "application/json; charset=utf-8", None, head_only)
+
+    def serve_events(self, head_only):
+        """Server-Sent Events: the current build id on connect, then every new one"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        if head_only:
+            return
+
+        watcher = self.server.watcher
+        build_id = watcher.build_id
+        try:
+            self.send_event_data(f"retry: {SSE_RETRY_MS}\n".encode('utf-8'))
+            self.send_build_event(build_id)
+            while True:
+                current = watcher.wait(build_id, SSE_KEEPALIVE)
+                if current != build_id:
+                    build_id = current
+                    self.send_build_event(build_id)
+                else:
+                    self.send_event_data(b": keep-alive\n\n")
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            return
+
+    def send_build_event(self, build_id):
+        self.send_event_data(f"event: build\ndata: {json.dumps({'build': build_id})}\n\n".encode('utf-8'))
+
+    def send_event_data(self, data):
+        self.wfile.write(data)
+        self.wfile.flush()
+        self.bytes_sent += len(data)
+
+    def serve_artifact(self, url, head_only):
+        artifact = self.server.store.get(url.path)
+        if artifact is None:
+            self.send_error(404, "File not found")
+            return
+
+        encoding, body, etag = artifact.select(self.headers.get('Accept-Encoding'))
+        not_modified = self.is_not_modified(etag, artifact.mtime)
+        self.send_response(304 if not_modified else 200)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", artifact.last_modified)
+        self.send_header("Cache-Control", cache_control(url.path, url.query))
+        if artifact.variants:
+            self.send_header("Vary", "Accept-Encoding")
+        if not_modified:
+            self.end_headers()
+            return
+
+        self.send_body(body, artifact.content_type, encoding, head_only)
+
+    def send_body(self, body, content_type, encoding, head_only):
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head_only:
+            try:
+                self.wfile.write(body)
+                self.bytes_sent += len(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # Client went away mid-response (e.g. a startup check that only reads headers)
+                self.close_connection = True
+
+    def is_not_modified(self, etag, mtime=None):
+        """If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            return '*' in tags or etag in tags
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since and mtime is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return mtime <= since
+        return False
+
+    def log_message(self, format, *args):
+        """Keep the notebook output quiet"""
+        return
+
+
+class DashboardServer(http.server.ThreadingHTTPServer):
+    """Threaded server for one dashboard output folder"""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, directory, api=None, handler_class=DashboardRequestHandler):
+        self.store = ArtifactStore(directory)
+        # A new build replaces the hashed assets: forget the ones it deleted
+        self.watcher = BuildWatcher(directory, on_change=lambda build_id: self.store.prune())
+        self.api = api
+        self.metrics = ServerMetrics()
+        try:
+            super().__init__(server_address, handler_class)
+        except BaseException:
+            self.watcher.stop()
+            raise
+
+    def server_close(self):
+        super().server_close()
+        self.watcher.stop()
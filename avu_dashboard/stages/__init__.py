@@ -0,0 +1,11 @@
+"""
+Dashboard pipeline stages
+
+One module per stage, run in this order by avu_dashboard.pipeline:
+
+    load → score → periods → history → charts → html → serve
+
+Each stage is a function that takes the results of earlier stages and
+returns its own dataclass; report_* functions print the notebook summaries
+and tables of a stage without changing its result.
+"""
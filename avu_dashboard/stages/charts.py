@@ -0,0 +1,229 @@
+"""
+Charts stage: the three dashboard bar charts as base64 PNGs
+
+matplotlib is imported by the functions that draw, not with the module:
+unpickling a cached Charts result (the html stage rerunning while the
+charts are unchanged) then costs no matplotlib import.
+"""
+import base64
+from dataclasses import dataclass
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from avu_dashboard.formatting import format_swiss_number
+from avu_dashboard.logs import say, warn
+
+OVERALL_TOP_N = 15
+MIN_CHART_WINNERS = 5
+
+# AVU Brand Colors (notebook preview chart)
+AVU_GOLD = '#A08B69'        # Primary gold
+DARK_CONTRAST = '#1A1A1A'   # Text color
+BACKGROUND_WHITE = '#FFFFFF' # Background
+
+# chart_size -> (width, height per bar, minimum height, title size, label size, tick size)
+CHART_SIZES = {
+    'large': (16, 0.8, 10, 18, 12, 10),
+    'medium': (14, 0.7, 8, 16, 11, 9),
+    'normal': (12, 0.6, 6, 14, 10, 8),
+}
+
+
+@dataclass
+class Charts:
+    """Chart winners and their rendered images"""
+    last_7_days: pd.DataFrame
+    last_21_days: pd.DataFrame
+    overall_winners: pd.DataFrame
+    chart_7_days: str
+    chart_21_days: str
+    chart_overall: str
+
+
+def chart_labels(winners_data):
+    """(wine labels, producer labels, scores), highest score last for horizontal bars"""
+    wine_labels = []
+    producer_labels = []
+    scores = []
+    for _, row in winners_data.iterrows():
+        wine_name = str(row['Wine'])
+        vintage = str(row['Vintage']) if pd.notna(row['Vintage']) and str(row['Vintage']) != '0' else ''
+        producer_name = str(row['Producer_Name']) if pd.notna(row['Producer_Name']) and str(row['Producer_Name']).lower() != 'nan' else ''
+
+        wine_display = f"{wine_name} {vintage}" if vintage else wine_name
+        if len(wine_display) > 35:
+            wine_display = wine_display[:32] + "..."
+        if producer_name and len(producer_name) > 30:
+            producer_name = producer_name[:27] + "..."
+
+        wine_labels.append(wine_display)
+        producer_labels.append(producer_name)
+        scores.append(float(row['Weighted_Score']))
+    return wine_labels[::-1], producer_labels[::-1], scores[::-1]
+
+
+def figure_base64(fig):
+    """Encode a figure as a base64 PNG and close it"""
+    import matplotlib.pyplot as plt
+    buffer = BytesIO()
+    plt.tight_layout()
+    plt.savefig(buffer, format='png', dpi=100, bbox_inches='tight')
+    buffer.seek(0)
+    image_base64 = base64.b64encode(buffer.getvalue()).decode()
+    plt.close(fig)
+    return image_base64
+
+
+def create_chart_base64(winners_data, title, chart_size="normal", min_winners=MIN_CHART_WINNERS):
+    """Create a horizontal bar chart and return as base64 string"""
+    import matplotlib.pyplot as plt
+    try:
+        if winners_data.empty:
+            # Create empty chart placeholder
+            fig, ax = plt.subplots(figsize=(10, 6))
+            ax.text(0.5, 0.5, 'No data available',
+                    horizontalalignment='center', verticalalignment='center',
+                    fontsize=16, bbox=dict(boxstyle="round,pad=0.3", facecolor='gold', alpha=0.7))
+            ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.axis('off')
+            return figure_base64(fig)
+
+        wine_labels, producer_labels, scores = chart_labels(winners_data.head(max(min_winners, len(winners_data))))
+
+        width, height_per_bar, min_height, title_size, label_size, tick_size = CHART_SIZES.get(chart_size, CHART_SIZES['normal'])
+        fig, ax = plt.subplots(figsize=(width, max(min_height, len(wine_labels) * height_per_bar)))
+
+        # Golden gradient: darker on top, lighter on bottom
+        y_pos = np.arange(len(wine_labels))
+        colors = []
+        for i in range(len(wine_labels)):
+            # Gradient from bright gold (#FFD700) to dark gold (#B8860B)
+            ratio = (len(wine_labels) - 1 - i) / max(1, len(wine_labels) - 1)
+            r = int(255 - (255 - 184) * ratio)
+            g = int(215 - (215 - 134) * ratio)
+            b = int(0 + (11 - 0) * ratio)
+            colors.append(f"#{r:02x}{g:02x}{b:02x}")
+
+        bars = ax.barh(y_pos, scores, color=colors, alpha=0.9, edgecolor='#8B4513', linewidth=1.5)
+
+        # Custom two-line labels instead of the default y-tick labels
+        ax.set_yticks(y_pos)
+        ax.set_yticklabels([])
+        for i, (wine, producer) in enumerate(zip(wine_labels, producer_labels)):
+            ax.text(-max(scores) * 0.02, y_pos[i] + 0.1, wine,
+                    ha='right', va='center', fontsize=tick_size, fontweight='bold', color='#2C3E50')
+            if producer:
+                ax.text(-max(scores) * 0.02, y_pos[i] - 0.15, producer,
+                        ha='right', va='center', fontsize=tick_size-2, fontweight='normal',
+                        color='#7F8C8D', alpha=0.8, style='italic')
+
+        ax.set_xlabel('Performance Score', fontsize=label_size, fontweight='bold')
+        ax.set_title(title, fontsize=title_size, fontweight='bold', pad=20)
+
+        # Value labels on bars
+        for bar, score in zip(bars, scores):
+            ax.text(bar.get_width() + max(scores) * 0.01, bar.get_y() + bar.get_height()/2,
+                    f'{score:.3f}', ha='left', va='center',
+                    fontsize=tick_size-1, fontweight='bold')
+
+        ax.grid(axis='x', alpha=0.3, linestyle='--')
+        ax.set_axisbelow(True)
+        ax.set_xlim(0, max(scores) * 1.15)
+        return figure_base64(fig)
+
+    except Exception as e:
+        warn(f"⚠️ Error creating chart: {e}")
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.text(0.5, 0.5, f'Error creating chart\n{str(e)}',
+                horizontalalignment='center', verticalalignment='center',
+                fontsize=12, color='red', bbox=dict(boxstyle="round,pad=0.3", facecolor='pink', alpha=0.7))
+        ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
+        ax.axis('off')
+        return figure_base64(fig)
+
+
+def render_charts(periods):
+    """Last 7 days, last 21 days and overall winners charts"""
+    say("📊 Generating chart data...")
+    last_7_days = periods.period_winners[7]
+    last_21_days = periods.period_winners[21]
+    overall_winners = periods.winners_with_stock.head(OVERALL_TOP_N)  # already in ranking order
+    say(f"   • Last 7 Days: {len(last_7_days)} winners")
+    say(f"   • Last 21 Days: {len(last_21_days)} winners")
+    say(f"   • Overall: {len(overall_winners)} winners")
+
+    say("📊 Creating chart images...")
+    # For the 7-day chart, fall back to the overall top 5 when the period is thin
+    chart_7_data = last_7_days if len(last_7_days) >= MIN_CHART_WINNERS else overall_winners.head(MIN_CHART_WINNERS)
+    return Charts(
+        last_7_days=last_7_days,
+        last_21_days=last_21_days,
+        overall_winners=overall_winners,
+        chart_7_days=create_chart_base64(chart_7_data, "🗓️ LAST 7 DAYS WINNERS", "large"),
+        chart_21_days=create_chart_base64(last_21_days, "📆 LAST 21 DAYS WINNERS", "medium"),
+        chart_overall=create_chart_base64(overall_winners, "🏁 OVERALL WINNERS", "medium"),
+    )
+
+
+def plot_top10_preview(scores):
+    """Notebook preview: top 10 overall in AVU brand colours (shown inline, not saved)"""
+    import matplotlib.pyplot as plt
+    say("📊 SIMPLE RACE CHART VISUALIZATION")
+    say("="*45)
+
+    top_10 = scores.top_25.head(10)
+    say(f"✅ Creating chart for top {len(top_10)} winners")
+    wine_labels, producer_labels, chart_scores = chart_labels(top_10)
+
+    fig, ax = plt.subplots(figsize=(16, 10))
+    fig.patch.set_facecolor(BACKGROUND_WHITE)
+    ax.set_facecolor(BACKGROUND_WHITE)
+
+    y_positions = np.arange(len(wine_labels))
+    bars = ax.barh(y_positions, chart_scores, color=AVU_GOLD, alpha=0.85, height=0.6)
+    ax.set_yticks(y_positions)
+    ax.set_yticklabels([])
+    for i, (wine, producer) in enumerate(zip(wine_labels, producer_labels)):
+        ax.text(-max(chart_scores) * 0.02, y_positions[i] + 0.1, wine,
+                ha='right', va='center', fontsize=11, fontweight='bold', color=DARK_CONTRAST)
+        if producer:
+            ax.text(-max(chart_scores) * 0.02, y_positions[i] - 0.15, producer,
+                    ha='right', va='center', fontsize=9, fontweight='normal',
+                    color=DARK_CONTRAST, alpha=0.7, style='italic')
+    ax.set_xlabel('Weighted Score (60% Conversion + 40% Sales)', fontsize=12, color=DARK_CONTRAST, fontweight='bold')
+    ax.set_title('🏆 Top 10 Wine Campaign Winners - AVU Luxury Style',
+                 fontsize=16, fontweight='bold', color=DARK_CONTRAST, pad=20)
+
+    max_score = max(chart_scores) if chart_scores else 1
+    for bar, score in zip(bars, chart_scores):
+        ax.text(bar.get_width() + max_score * 0.01, bar.get_y() + bar.get_height()/2,
+                f'{score:.3f}', ha='left', va='center',
+                fontsize=10, fontweight='bold', color=DARK_CONTRAST)
+
+    ax.spines['right'].set_visible(False)
+    ax.spines['top'].set_visible(False)
+    ax.spines['left'].set_color(DARK_CONTRAST)
+    ax.spines['bottom'].set_color(DARK_CONTRAST)
+    ax.tick_params(colors=DARK_CONTRAST)
+    ax.grid(axis='x', alpha=0.3, linestyle='--', color=DARK_CONTRAST)
+    ax.set_axisbelow(True)
+    ax.set_xlim(0, max_score * 1.15)
+    plt.tight_layout()
+    plt.show()
+
+    say("\n📈 CHART SUMMARY:")
+    say("="*30)
+    say(f"🏆 #1 Winner: {top_10.iloc[0]['Wine']}")
+    say(f"📊 Score: {top_10.iloc[0]['Weighted_Score']:.4f}")
+    say(f"💰 Price: CHF {top_10.iloc[0]['Main_Bottle_Price_LCY']:.0f}")
+    say(f"📈 Conversion: {top_10.iloc[0]['Conversion_Rate_%']:.2f}%")
+    say(f"💵 Sales: CHF {format_swiss_number(top_10.iloc[0]['Total_Sales_Amount_LCY'])}")
+
+    say(f"\n🎯 Top 10 Statistics:")
+    say(f"   • Average Score: {top_10['Weighted_Score'].mean():.4f}")
+    say(f"   • Price Range: CHF {top_10['Main_Bottle_Price_LCY'].min():.0f} - CHF {top_10['Main_Bottle_Price_LCY'].max():.0f}")
+    say(f"   • Total Sales: CHF {format_swiss_number(top_10['Total_Sales_Amount_LCY'].sum())}")
@@ -0,0 +1,90 @@
+"""
+GIF stage: animated race chart of the top 10 winners of every history snapshot
+"""
+from dataclasses import dataclass
+from pathlib import Path
+
+from avu_dashboard.logs import say
+
+GIF_FILE = "race_chart_animated.gif"
+GIF_TOP_N = 10
+GIF_FPS = 1  # 1 frame per second = 1000ms per frame
+
+# Gold color
+GOLD_COLOR = '#D4AF37'
+
+
+@dataclass
+class RaceGif:
+    """The written animation"""
+    gif_file: Path
+    frames: int
+
+
+def draw_frame(ax, snapshot):
+    """One snapshot's top 10 as horizontal gold bars"""
+    ax.clear()
+
+    # Get top 10 winners, sorted by value for display
+    winners = snapshot['winners'][:GIF_TOP_N]
+    winners_sorted = sorted(winners, key=lambda x: x['value'], reverse=False)
+    names = [w['name'] for w in winners_sorted]
+    values = [w['value'] for w in winners_sorted]
+
+    # Create horizontal bar chart
+    bars = ax.barh(names, values, color=GOLD_COLOR, edgecolor='#1A1A1A', linewidth=1.5)
+
+    # Add value labels on bars
+    for bar, value in zip(bars, values):
+        width = bar.get_width()
+        ax.text(width + 0.01, bar.get_y() + bar.get_height()/2,
+                f'{value:.4f}',
+                ha='left', va='center', fontsize=11, fontweight='bold', color='#1A1A1A')
+
+    # Styling
+    ax.set_xlabel('Weighted Score', fontsize=14, fontweight='bold', color='#1A1A1A')
+    ax.set_title(f'Top 10 Wine Campaign Winners - {snapshot["analysis_date"]}',
+                 fontsize=16, fontweight='bold', color='#1A1A1A', pad=20)
+    ax.set_xlim(0, max(values) * 1.15)
+    ax.tick_params(axis='both', labelsize=11, colors='#1A1A1A')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.spines['left'].set_color('#1A1A1A')
+    ax.spines['bottom'].set_color('#1A1A1A')
+    ax.grid(axis='x', alpha=0.3, linestyle='--', linewidth=0.5)
+
+
+def render_race_gif(race_chart_data, gif_output, verbose=True):
+    """Write one frame per race chart snapshot to gif_output; returns the number of frames"""
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import PillowWriter
+
+    time_series = race_chart_data['time_series']
+    gif_output = Path(gif_output)
+
+    # Create figure and axis
+    fig, ax = plt.subplots(figsize=(16, 10))
+    fig.patch.set_facecolor('white')
+
+    say("Generating frames...")
+    writer = PillowWriter(fps=GIF_FPS)
+    try:
+        with writer.saving(fig, str(gif_output), dpi=100):
+            for i, snapshot in enumerate(time_series):
+                draw_frame(ax, snapshot)
+                writer.grab_frame()
+                if verbose:
+                    say(f"  Frame {i + 1}/{len(time_series)}: {snapshot['date']}")
+    finally:
+        plt.close(fig)
+    return len(time_series)
+
+
+def write_race_gif(history, output_dir):
+    """Render the history's race chart data to output_dir/race_chart_animated.gif"""
+    say("🎞️ ANIMATED RACE CHART GIF")
+    say("="*40)
+    gif_file = Path(output_dir) / GIF_FILE
+    frames = render_race_gif(history.race_chart_data, gif_file, verbose=False)
+    say(f"✅ {frames} frames written to {gif_file} ({gif_file.stat().st_size / (1024 * 1024):.2f} MB)")
+    return RaceGif(gif_file=gif_file, frames=frames)
@@ -0,0 +1,298 @@
+"""
+History stage: append today's top 15 to the historical matrix and export race chart data
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import pandas as pd
+
+from avu_dashboard.config import HISTORY_FILE, RACE_CHART_FILE
+from avu_dashboard.formatting import delayed_campaign_no, format_swiss_number, show
+from avu_dashboard.logs import displaying, say
+
+HISTORY_TOP_N = 15
+
+# Race chart bar colour per history price tier
+RACE_COLORS = {
+    '🟣': '#8B5CF6',  # Purple
+    '🟨': '#F59E0B',  # Gold
+    '🟦': '#3B82F6',  # Blue
+    '🩷': '#EC4899',  # Pink
+    '🟢': '#10B981',  # Green
+    '⚪': '#9CA3AF'   # Gray
+}
+
+
+@dataclass
+class History:
+    """The historical matrix with today's snapshot appended, and the race chart export"""
+    current_snapshot: Dict[str, Any]
+    historical_data: Dict[str, Any]
+    race_chart_data: Dict[str, Any]
+    race_chart_json: str
+    historical_file: Path
+    race_chart_file: Path
+
+
+def history_price_tier(price):
+    """Price tier emoji of the history snapshots (their own, coarser ranges)"""
+    if pd.isna(price) or price <= 0: return "⚪"
+    elif price >= 1000: return "🟣"  # Extra Luxury
+    elif price >= 500:  return "🟨"  # Luxury
+    elif price >= 150:  return "🟦"  # Premium
+    elif price >= 80:   return "🩷"  # Mid-Range
+    return "🟢"  # Budget
+
+
+def vintage_label(vintage):
+    return str(vintage) if pd.notna(vintage) and str(vintage) != '0' else ''
+
+
+def build_snapshot(scores, now):
+    """Today's snapshot: run metadata plus the top 15 winners"""
+    current_snapshot = {
+        'timestamp': now.isoformat(),
+        'date': now.strftime('%Y-%m-%d'),
+        'analysis_date': now.strftime('%B %d, %Y'),
+        'total_campaigns': scores.campaign_count,
+        'max_conversion': scores.max_conversion,
+        'max_sales': scores.max_sales,
+        'top_15_winners': []
+    }
+    for idx, row in scores.top_25.head(HISTORY_TOP_N).iterrows():
+        vintage = vintage_label(row['Vintage'])
+        current_snapshot['top_15_winners'].append({
+            'rank': idx + 1,
+            'campaign_no': str(row['Campaign_No']),
+            'wine_name': str(row['Wine'])[:30],  # Truncate for chart readability
+            'vintage': vintage,
+            'weighted_score': round(float(row['Weighted_Score']), 4),
+            'conversion_rate': round(float(row['Conversion_Rate_%']), 2),
+            'total_sales': round(float(row['Total_Sales_Amount_LCY']), 2),
+            'unique_customers': int(row['Unique_Bought']),
+            'email_sent': int(row['Email_Sent']),
+            'price_tier': history_price_tier(row['Main_Bottle_Price_LCY']),
+            'main_bottle_price': round(float(row['Main_Bottle_Price_LCY']), 2),
+            'norm_conversion': round(float(row['Norm_Conversion']), 4),
+            'norm_sales': round(float(row['Norm_Sales']), 4),
+            'delayed_sending': bool(row['Delayed_Sending']),
+            'display_name': f"{str(row['Wine'])[:20]} {vintage}".strip()
+        })
+    return current_snapshot
+
+
+def build_race_chart_data(historical_data, now):
+    """Race chart format: every snapshot becomes a time point"""
+    race_chart_data = {
+        'metadata': {
+            'title': 'Top Wine Campaign Winners Over Time',
+            'description': 'Historical ranking of wine campaigns by weighted score',
+            'created': historical_data['created_date'],
+            'last_updated': now.isoformat(),
+            'total_snapshots': len(historical_data['snapshots'])
+        },
+        'time_series': []
+    }
+    for snapshot in historical_data['snapshots']:
+        race_chart_data['time_series'].append({
+            'date': snapshot['date'],
+            'timestamp': snapshot['timestamp'],
+            'analysis_date': snapshot['analysis_date'],
+            'winners': [{
+                'rank': winner['rank'],
+                'name': winner['display_name'],
+                'campaign_no': winner['campaign_no'],
+                'value': winner['weighted_score'],
+                'sales': winner['total_sales'],
+                'conversion': winner['conversion_rate'],
+                'customers': winner['unique_customers'],
+                'price_tier': winner['price_tier'],
+                'color': RACE_COLORS.get(winner['price_tier'], '#9CA3AF')
+            } for winner in snapshot['top_15_winners']]
+        })
+    return race_chart_data
+
+
+def record_history(scores, historical_dir, now=None):
+    """Append today's snapshot to the historical matrix and rewrite the race chart export"""
+    now = now or datetime.now()
+    say("📊 HISTORICAL TOP-15 MATRIX FOR RACE CHARTS")
+    say("="*50)
+    say(f"📅 Snapshot Date: {now.strftime('%B %d, %Y at %H:%M:%S')}")
+
+    historical_dir = Path(historical_dir)
+    historical_dir.mkdir(parents=True, exist_ok=True)
+    say(f"📁 Historical dir: {historical_dir}")
+
+    current_snapshot = build_snapshot(scores, now)
+
+    # ---- Load or Create Historical Matrix ----
+    historical_file = historical_dir / HISTORY_FILE
+    if historical_file.exists():
+        with open(historical_file, 'r', encoding='utf-8') as f:
+            historical_data = json.load(f)
+        say(f"📚 Loaded existing historical data: {len(historical_data['snapshots'])} snapshots")
+    else:
+        historical_data = {
+            'created_date': now.isoformat(),
+            'description': 'Historical Top-15 Wine Campaign Winners Matrix for Race Charts',
+            'snapshots': []
+        }
+        say("🆕 Created new historical matrix")
+
+    historical_data['snapshots'].append(current_snapshot)
+    historical_data['last_updated'] = now.isoformat()
+    with open(historical_file, 'w', encoding='utf-8') as f:
+        json.dump(historical_data, f, indent=2, ensure_ascii=False)
+    say(f"✅ Historical matrix updated: {len(historical_data['snapshots'])} total snapshots")
+    say(f"💾 Saved to: {historical_file}")
+
+    # ---- Export Race Chart Ready Data ----
+    race_chart_file = historical_dir / RACE_CHART_FILE
+    race_chart_data = build_race_chart_data(historical_data, now)
+    race_chart_json = json.dumps(race_chart_data, indent=2, ensure_ascii=False)
+    race_chart_file.write_text(race_chart_json, encoding='utf-8')
+    say(f"🏁 Race chart data exported: {race_chart_file}")
+
+    return History(current_snapshot=current_snapshot, historical_data=historical_data,
+                   race_chart_data=race_chart_data, race_chart_json=race_chart_json,
+                   historical_file=historical_file, race_chart_file=race_chart_file)
+
+
+def race_chart_campaigns(snapshots):
+    """Campaign keys ("no | name") sorted by their latest score, and the snapshot dates"""
+    all_campaigns = set()
+    date_columns = []
+    for snapshot in snapshots:
+        date_columns.append(snapshot['analysis_date'])
+        for winner in snapshot['top_15_winners']:
+            all_campaigns.add(f"{winner['campaign_no']} | {winner['display_name']}")
+
+    # Sort campaigns by their score in the most recent snapshot
+    if snapshots:
+        campaign_scores = {f"{w['campaign_no']} | {w['display_name']}": w['weighted_score']
+                           for w in snapshots[-1]['top_15_winners']}
+        sorted_campaigns = sorted(all_campaigns, key=lambda x: campaign_scores.get(x, 0), reverse=True)
+    else:
+        sorted_campaigns = sorted(all_campaigns)
+    return sorted_campaigns, date_columns
+
+
+def race_chart_table(snapshots):
+    """Campaigns x snapshot dates table of weighted scores ('-' when outside the top 15)"""
+    sorted_campaigns, date_columns = race_chart_campaigns(snapshots)
+    table = pd.DataFrame(index=sorted_campaigns)
+    table['🎨'] = ''
+    table['Campaign_No'] = ''
+    table['Wine_Name'] = ''
+    for snapshot in snapshots:
+        score_lookup = {}
+        for winner in snapshot['top_15_winners']:
+            campaign_key = f"{winner['campaign_no']} | {winner['display_name']}"
+            score_lookup[campaign_key] = winner['weighted_score']
+            table.loc[campaign_key, '🎨'] = winner['price_tier']
+            table.loc[campaign_key, 'Campaign_No'] = winner['campaign_no']
+            table.loc[campaign_key, 'Wine_Name'] = winner['display_name']
+        table[snapshot['analysis_date']] = table.index.map(
+            lambda x: f"{score_lookup[x]:.4f}" if x in score_lookup else "-"
+        )
+    return table, sorted_campaigns, date_columns
+
+
+def appearance_counts(snapshots, sorted_campaigns, date_columns):
+    """Campaign key -> number of snapshot dates it was in the top 15 (the race chart table's non-'-' cells)"""
+    members = {snapshot['analysis_date']: {f"{w['campaign_no']} | {w['display_name']}" for w in snapshot['top_15_winners']}
+               for snapshot in snapshots}  # a later snapshot on the same date replaces the earlier one
+    return {campaign: sum(campaign in members[date] for date in date_columns) for campaign in sorted_campaigns}
+
+
+def top15_display_table(scores):
+    """Current top 15 as shown in the notebook (Swiss sales, shortened wine names)"""
+    top_15_display = scores.top_25.head(HISTORY_TOP_N).copy()
+    top_15_display['Wine_Vintage'] = top_15_display.apply(
+        lambda row: f"{str(row['Wine'])} {str(row['Vintage'])}" if vintage_label(row['Vintage']) else str(row['Wine']),
+        axis=1
+    )
+    top_15_display['Wine_Vintage'] = top_15_display['Wine_Vintage'].astype(str).apply(
+        lambda x: x if len(x) <= 35 else x[:35] + "…"
+    )
+    top_15_display['Campaign_No_Display'] = delayed_campaign_no(top_15_display)
+    final_display = top_15_display[['Rank', '🎨', 'Campaign_No_Display', 'Wine_Vintage', 'Conversion_Rate_%',
+                                    'Total_Sales_Amount_LCY', 'Unique_Bought', 'Weighted_Score']].copy()
+    final_display['Total_Sales_Amount_LCY'] = final_display['Total_Sales_Amount_LCY'].apply(format_swiss_number)
+    final_display['Conversion_Rate_%'] = final_display['Conversion_Rate_%'].round(2)
+    final_display['Weighted_Score'] = final_display['Weighted_Score'].round(4)
+    final_display.columns = ['Rank', '🎨', 'Campaign_No', 'Wine & Vintage', 'Conv_%',
+                             'Total_Sales_CHF', 'Unique_Customers', 'Weighted_Score']
+    return final_display
+
+
+def report_history(history, scores):
+    """Snapshot summary, top 15 table and race chart table with insights"""
+    current_snapshot = history.current_snapshot
+    snapshots = history.historical_data['snapshots']
+
+    say(f"📊 CURRENT SNAPSHOT SUMMARY:")
+    say(f"• Snapshot ID: {len(snapshots)}")
+    say(f"• Date: {current_snapshot['analysis_date']}")
+    say(f"• Total Campaigns Analyzed: {current_snapshot['total_campaigns']}")
+    say(f"• Max Conversion Rate: {current_snapshot['max_conversion']:.2f}%")
+    say(f"• Max Sales: CHF {format_swiss_number(current_snapshot['max_sales'])}")
+    say(f"• Top 15 Winners Captured: {len(current_snapshot['top_15_winners'])}")
+
+    say(f"\n🏆 TOP 15 WINNERS - CURRENT SNAPSHOT")
+    say("="*50)
+    if displaying():
+        show(top15_display_table(scores), name="top_15")
+
+    say(f"\n🏆 TOP 5 WINNERS IN CURRENT SNAPSHOT:")
+    for winner in current_snapshot['top_15_winners'][:5]:
+        say(f"   {winner['rank']}. {winner['price_tier']} {winner['display_name']} - Score: {winner['weighted_score']}")
+
+    say(f"\n📈 HISTORICAL TRACKING:")
+    say(f"• Total Historical Snapshots: {len(snapshots)}")
+    say(f"• First Snapshot: {snapshots[0]['analysis_date'] if snapshots else 'N/A'}")
+    say(f"• Data Range: {(datetime.fromisoformat(snapshots[-1]['timestamp']) - datetime.fromisoformat(snapshots[0]['timestamp'])).days if len(snapshots) > 1 else 0} days")
+
+    say(f"\n🎯 RACE CHART READY:")
+    say(f"• Time Series Points: {len(history.race_chart_data['time_series'])}")
+    say(f"• Winners per Snapshot: 15")
+    say(f"• Color-coded by Price Tier: Yes")
+    say(f"• Export Format: JSON for visualization tools")
+
+    say(f"\n🏁 RACE CHART DATA TABLE")
+    say("="*50)
+    sorted_campaigns, date_columns = race_chart_campaigns(snapshots)
+    say(f"📊 Historical Weighted Scores by Campaign (Top 15 Winners)")
+    say(f"📅 Snapshots: {len(date_columns)} | Campaigns: {len(sorted_campaigns)}")
+    say("💡 Values show Weighted_Score (0.6*Conversion + 0.4*Sales), '-' means not in top 15")
+    say()
+    if displaying():
+        show(race_chart_table(snapshots)[0], name="race_chart")
+
+    say(f"\n📈 RACE CHART INSIGHTS:")
+    appearance_count = appearance_counts(snapshots, sorted_campaigns, date_columns)
+    say("🏆 Most Consistent Top-15 Performers:")
+    for i, (campaign, count) in enumerate(sorted(appearance_count.items(), key=lambda x: x[1], reverse=True)[:5], 1):
+        pct = 100 * count / len(date_columns)
+        say(f"   {i}. {campaign} - {count}/{len(date_columns)} snapshots ({pct:.1f}%)")
+
+    if snapshots:
+        latest = snapshots[-1]
+        say(f"\n🥇 Current Top 5 Leaders ({latest['analysis_date']}):")
+        for i, winner in enumerate(latest['top_15_winners'][:5], 1):
+            say(f"   {i}. {winner['price_tier']} {winner['display_name']} - {winner['weighted_score']:.4f}")
+
+    say(f"\n💾 Race Chart Export Files:")
+    say(f"   • CSV Ready: Copy table above for spreadsheet import")
+    say(f"   • JSON Format: {history.race_chart_file.name}")
+    say(f"   • Matrix Format: {history.historical_file.name}")
+
+    say(f"\n✅ Historical matrix snapshot complete!")
+    say("📁 Files created/updated:")
+    say(f"   • {history.historical_file.name}")
+    say(f"   • {history.race_chart_file.name}")
+    say("🏁 Ready for race chart visualization!")
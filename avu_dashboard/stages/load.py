@@ -0,0 +1,92 @@
+"""
+Load stage: campaign statistics, stock list and OMT offer snapshots
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from avu_dashboard.config import CAMPAIGN_STATS_FILE, OMT_FILE, STOCK_FILE
+from avu_dashboard.filters import FilterIndex, exclude
+from avu_dashboard.logs import say, warn
+
+EXCLUDED_TYPES = ('HORECA', 'TRADE')
+EXCLUDED_SUB_TYPE = 'Lead'
+# Global filter rules (avu_dashboard.filters), applied to every campaign before scoring
+GLOBAL_FILTERS = [exclude('type', EXCLUDED_TYPES), exclude('sub-type', [EXCLUDED_SUB_TYPE])]
+
+# Campaign statistics columns the later stages read; the filtered frame keeps only these
+CAMPAIGN_COLUMNS = [
+    'campaign no.', 'main item no.', 'main wine name', 'vintage code', 'producer name', 'scheduled datetime1',
+    'multiple wines', 'email sent', 'total unique customers bought', 'conversion rate %',
+    'total sales amount (lcy)', 'main bottle price (lcy)', 'delayed sending',
+]
+
+
+@dataclass
+class Snapshots:
+    """Snapshot frames, with HORECA/TRADE/Lead campaigns already removed
+
+    campaigns holds only CAMPAIGN_COLUMNS; every later frame is built from
+    it by column or row selection rather than by copying it again.
+    """
+    campaigns: pd.DataFrame
+    stock: pd.DataFrame
+    omt: Optional[pd.DataFrame]
+    total_campaigns: int
+
+
+def filter_campaigns(campaign_stats_raw, rules=GLOBAL_FILTERS):
+    """Rows that pass the filter rules (default: no HORECA/TRADE, no Lead), with the CAMPAIGN_COLUMNS"""
+    keep = FilterIndex(campaign_stats_raw).mask(*rules)
+    columns = [col for col in CAMPAIGN_COLUMNS if col in campaign_stats_raw.columns]
+    # One selection of the kept rows and columns: the only copy of the campaign data
+    return campaign_stats_raw.loc[keep, columns]
+
+
+def load_snapshots(snap_dir):
+    """Read the three snapshot pickles from snap_dir"""
+    snap_dir = Path(snap_dir)
+    say(f"📁 SNAP dir: {snap_dir}")
+
+    # 🧊 Import Campaign Statistics Snapshot
+    campaign_stats_raw = pd.read_pickle(snap_dir / CAMPAIGN_STATS_FILE)
+    say(f"🧊 Snapshot rebuilt: {CAMPAIGN_STATS_FILE}  ({campaign_stats_raw.shape[0]}×{campaign_stats_raw.shape[1]})")
+
+    # ❌ APPLY GLOBAL FILTERS - Exclude Type=HORECA/TRADE and Sub-Type=Lead
+    say(f"📊 Total campaigns loaded: {len(campaign_stats_raw)}")
+    campaign_stats = filter_campaigns(campaign_stats_raw)
+    say(f"❌ Filtered out: Type=HORECA/TRADE, Sub-Type=Lead")
+    say(f"📊 Campaigns after filtering: {len(campaign_stats)} (removed {len(campaign_stats_raw) - len(campaign_stats)})")
+
+    # 🧊 Import Detailed Stock List Snapshot
+    stock_data = pd.read_pickle(snap_dir / STOCK_FILE)
+    say(f"🧊 Snapshot rebuilt: {STOCK_FILE}  ({stock_data.shape[0]}×{stock_data.shape[1]})")
+
+    # 🧊 Import OMT Main Offer List for producer name fallback
+    omt_path = snap_dir / OMT_FILE
+    if omt_path.exists():
+        omt_data = pd.read_pickle(omt_path)
+        say(f"🧊 Snapshot rebuilt: {OMT_FILE}  ({omt_data.shape[0]}×{omt_data.shape[1]})")
+    else:
+        omt_data = None
+        warn("⚠️ OMT Main Offer List not found - producer fallback unavailable")
+
+    say(f"\n✅ Snapshots loaded successfully")
+    say(f"📊 Analysis ready: {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}")
+    say(f"🎯 All subsequent analyses will use filtered campaign data (excluding Horeca/Trade/Lead)")
+
+    return Snapshots(campaigns=campaign_stats, stock=stock_data, omt=omt_data, total_campaigns=len(campaign_stats_raw))
+
+
+def report_snapshots(snapshots):
+    """Stock level legend"""
+    say("\n🎨 COLOR LEGEND:")
+    say("🟣 Purple: 1-12")
+    say("🟨 Gold: 13-49")
+    say("🟦 Blue: 50-199")
+    say("🩷 Pink: 200-499")
+    say("🟢 Green: 500+")
+    say("⚪ White: Unknown/No price\n")
@@ -0,0 +1,266 @@
+"""
+HTML stage: tables, All Campaigns payload, page, live-reload payloads and build manifest
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from avu_dashboard.build_manifest import BUILD_MANIFEST, write_build_manifest, write_payload
+from avu_dashboard.compression import ENCODINGS, available_encodings, precompress_tree
+from avu_dashboard.config import PageOptions
+from avu_dashboard.formatting import format_swiss_number, get_price_emoji, get_stock_emoji
+from avu_dashboard.html_builder import (
+    ASSET_SUBDIR, DASHBOARD_FILE, DATA_SUBDIR, RACE_DATA_FILE, build_chart_data, dashboard_page_values,
+    fill_dashboard_page, render_period_table, render_top25_rows, render_top25_table, static_version,
+    write_hashed_assets, write_race_data,
+)
+from avu_dashboard.logs import say, warn
+from avu_dashboard.page_size import BudgetExceeded, budget_violations, page_sizes, sizes_report
+from avu_dashboard.stages.periods import PERIODS, format_period_display
+from avu_dashboard.stages.score import top25_display_table
+
+# (JSON key, source column, encoding) - 'category' columns are dictionary-encoded
+ALL_CAMPAIGNS_COLUMNS = [
+    ('overall_position', 'Overall_Position', 'int'),
+    ('campaign_no', 'Campaign_No', 'text'),
+    ('delayed', 'Delayed_Sending', 'bool'),
+    ('price_tier', 'Price_Tier', 'category'),
+    ('stock_tier', 'Stock_Tier', 'category'),
+    ('wine', 'Wine', 'text'),
+    ('vintage', 'Vintage', 'int'),
+    ('producer', 'Producer_Name', 'category'),
+    ('starting_date', 'Starting_Date', 'date'),
+    ('total_sales', 'Total_Sales_Amount_LCY', 'float2'),
+    ('unique_bought', 'Unique_Bought', 'int'),
+    ('conversion_rate', 'Conversion_Rate_%', 'float2'),
+    ('weighted_score', 'Weighted_Score', 'float4'),
+    ('bottle_price', 'Main_Bottle_Price_LCY', 'float2'),
+    ('stock_quantity', 'stock_quantity', 'int'),
+    ('main_item_no', 'Main_Item_No', 'int'),
+]
+
+
+@dataclass
+class Page:
+    """The written dashboard"""
+    html_file: Path
+    build_id: str
+    current_time: str
+    build_info: Optional[Dict[str, Any]] = None
+    compressed: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    sizes: Dict[str, Dict[str, int]] = field(default_factory=dict)  # page_size.sizes_report()
+    files: List[Path] = field(default_factory=list)  # everything the build wrote (written_files)
+
+
+def with_tiers(frame):
+    """Frame with Price_Tier / Stock_Tier emoji columns"""
+    return frame.assign(
+        Price_Tier=frame['Main_Bottle_Price_LCY'].apply(get_price_emoji),
+        Stock_Tier=frame['stock_quantity'].apply(get_stock_emoji),
+    )
+
+
+def all_campaigns_json(winners_with_stock, now):
+    """Serialise every campaign (in ranking order) as one compact columnar JSON blob"""
+    all_data = with_tiers(winners_with_stock)
+
+    columns = {}
+    for key, source_col, encoding in ALL_CAMPAIGNS_COLUMNS:
+        values = all_data[source_col] if source_col in all_data.columns else pd.Series(index=all_data.index, dtype=object)
+        if encoding == 'int':
+            columns[key] = pd.to_numeric(values, errors='coerce').fillna(0).astype(int).tolist()
+        elif encoding in ('float2', 'float4'):
+            columns[key] = pd.to_numeric(values, errors='coerce').fillna(0).round(int(encoding[-1])).tolist()
+        elif encoding == 'date':
+            columns[key] = pd.to_datetime(values, errors='coerce').dt.strftime('%Y-%m-%d').fillna('').tolist()
+        elif encoding == 'bool':
+            columns[key] = (values == True).astype(int).tolist()
+        elif encoding == 'category':
+            codes, uniques = pd.factorize(values.fillna('').astype(str))
+            columns[key] = {'values': uniques.tolist(), 'codes': codes.tolist()}
+        else:
+            columns[key] = values.fillna('').astype(str).tolist()
+
+    payload = {'rows': len(all_data), 'as_of': now.strftime('%Y-%m-%d'), 'columns': columns}
+    # Escape "</" so the blob can never terminate its <script> container early
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def period_tables_html(periods):
+    """The four multi-period tables"""
+    tables = []
+    for days, period_name, emoji in PERIODS:
+        period_top = periods.period_winners[days]
+        period_top = period_top.assign(Period_Rank=range(1, len(period_top) + 1))
+        # Raw values from period_top drive the sort keys
+        tables.append(render_period_table(f"{emoji} {period_name.upper()}", format_period_display(period_top), period_top))
+    return "".join(tables)
+
+
+def check_page_size(page_values, html_content, output_dir, options, asset_urls=None, race_data_urls=None):
+    """Size breakdown of the page and the files it loads; warns over size_warn, raises BudgetExceeded over size_fail"""
+    external_files = {}
+    if race_data_urls:
+        external_files['race_data'] = [output_dir / DATA_SUBDIR / RACE_DATA_FILE]
+    if asset_urls:
+        external_files['styles'] = [output_dir / url for name, url in asset_urls.items() if name.endswith('.css')]
+        external_files['scripts'] = [output_dir / url for name, url in asset_urls.items() if name.endswith('.js')]
+    sizes = page_sizes(page_values, html_content, external_files)
+
+    say("📏 Page size by section (raw / gzip):")
+    for section, size in sizes.items():
+        share = f"{100 * size.raw / sizes['total'].raw:5.1f}%" if section not in ('page', 'total') else "      "
+        say(f"   • {section:<10} {size.raw / 1024:>9.1f} KB {size.gzip / 1024:>9.1f} KB  {share}")
+    for key, size, budget in budget_violations(sizes, options.size_warn):
+        warn(f"⚠️ Page size budget exceeded: {key} is {size / 1024:.1f} KB (budget {budget / 1024:.1f} KB)")
+    failed = budget_violations(sizes, options.size_fail)
+    if failed:
+        raise BudgetExceeded("Page size budget exceeded, page not written: " + ", ".join(
+            f"{key} {size / 1024:.1f} KB > {budget / 1024:.1f} KB" for key, size, budget in failed))
+    return sizes
+
+
+def written_files(output_dir, urls, compressed):
+    """The files behind a build's urls (query strings dropped) plus their .gz/.br siblings"""
+    files = {output_dir / url.split('?')[0] for url in urls}
+    for relative, sizes in compressed.items():
+        files.update(output_dir / (relative + ENCODINGS[encoding]) for encoding in sizes if encoding in ENCODINGS)
+    return sorted(files)
+
+
+def build_page(scores, periods, history, charts, output_dir, options=None):
+    """Write the dashboard page (and its assets, data payloads and build.json) to output_dir"""
+    options = options or PageOptions()
+    now = datetime.now()
+    say("📊 HTML DASHBOARD - AVU TOP CAMPAIGNS RACE CHARTS")
+    say("="*55)
+    say(f"📅 Dashboard Creation Date: {now.strftime('%B %d, %Y at %H:%M:%S')}")
+    say(f"✅ Required data verified: {len(periods.winners_with_stock)} campaigns available")
+
+    say("📊 Generating multi-period table data...")
+    period_tables = period_tables_html(periods)
+
+    say("📊 Generating top 25 winners table...")
+    # Raw values from the top 25 (same index as the display table) drive the sort keys
+    top25_table = render_top25_table(render_top25_rows(top25_display_table(scores.top_25), scores.top_25))
+
+    say("📊 Generating all-campaigns data payload...")
+    campaigns_json = all_campaigns_json(periods.winners_with_stock, now)
+    say(f"   • All Campaigns: {len(periods.winners_with_stock)} rows, {len(campaigns_json) / 1024:.1f} KB")
+
+    current_time = now.strftime('%B %d, %Y at %H:%M:%S')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write content-hashed CSS/JS next to the page (hashed mode only)
+    asset_urls = write_hashed_assets(output_dir) if options.asset_mode == "hashed" else None
+    if asset_urls:
+        say(f"🗂️ Hashed assets: {', '.join(asset_urls.values())}")
+
+    # Write the race history next to the page (lazy mode only)
+    race_data_urls = None
+    if options.race_data_mode == "lazy":
+        race_data_urls = write_race_data(output_dir, history.race_chart_json, gzip_copy=options.race_data_gzip)
+        say(f"🏁 Race data: {', '.join(race_data_urls.values())}")
+
+    # Live-reload payloads: tables, charts and campaigns as versioned JSON next to the page
+    build_id = now.strftime('%Y%m%d%H%M%S')
+    build_info = None
+    if options.live_reload:
+        build_counts = {
+            'count7Days': len(charts.last_7_days),
+            'count21Days': len(charts.last_21_days),
+            'countOverall': len(charts.overall_winners),
+            'countCampaigns': len(scores.top_25),
+        }
+        live_payloads = {
+            'tables': write_payload(output_dir, 'tables.json', json.dumps({
+                'current_time': current_time,
+                'top25_table': top25_table,
+                'period_tables': period_tables,
+                'counts': build_counts,
+            }, ensure_ascii=False)),
+            'charts': write_payload(output_dir, 'charts.json', json.dumps({
+                'chart_data': build_chart_data(charts.chart_7_days, charts.chart_21_days, charts.chart_overall),
+            })),
+            'campaigns': write_payload(output_dir, 'campaigns.json', campaigns_json),
+        }
+        if race_data_urls:
+            live_payloads['race'] = race_data_urls
+        build_info = {'build': build_id, 'static': static_version(), 'payloads': live_payloads}
+
+    page_values = dashboard_page_values(
+        current_time=current_time,
+        top25_table=top25_table,
+        period_tables=period_tables,
+        chart_7_days=charts.chart_7_days,
+        chart_21_days=charts.chart_21_days,
+        chart_overall=charts.chart_overall,
+        all_campaigns_json=campaigns_json,
+        race_chart_json=history.race_chart_json,
+        count_7_days=len(charts.last_7_days),
+        count_21_days=len(charts.last_21_days),
+        count_overall=len(charts.overall_winners),
+        count_campaigns=len(scores.top_25),
+        asset_urls=asset_urls,
+        race_data_urls=race_data_urls,
+        build_info=build_info,
+    )
+    html_content = fill_dashboard_page(page_values)
+    sizes = check_page_size(page_values, html_content, output_dir, options, asset_urls, race_data_urls)
+
+    # Written under a temporary name and renamed: the local server never reads half a page
+    html_file = output_dir / DASHBOARD_FILE
+    temporary = html_file.with_name(html_file.name + '.tmp')
+    with open(temporary, 'w', encoding='utf-8') as f:
+        f.write(html_content)
+    os.replace(temporary, html_file)
+    say(f"✅ HTML Dashboard created successfully!")
+    say(f"📁 Saved to: {html_file}")
+    say(f"🌐 File size: {html_file.stat().st_size / 1024:.1f} KB")
+
+    compressed = {}
+    if options.precompress:
+        compressed = precompress_tree(output_dir, (DASHBOARD_FILE, ASSET_SUBDIR, DATA_SUBDIR))
+        page_compressed = compressed.get(html_file.name, {})
+        say(f"🗜️ Precompressed {len(compressed)} files ({', '.join(available_encodings())})")
+        for encoding in available_encodings():
+            if encoding in page_compressed:
+                say(f"   • Page {encoding}: {page_compressed[encoding] / 1024:.1f} KB")
+        if 'br' in page_compressed:
+            sizes['page'].br = page_compressed['br']
+
+    # build.json goes last: the local server announces the build as soon as it appears
+    if build_info:
+        write_build_manifest(output_dir, build_info)
+        say(f"📡 Build {build_id} published for live reload")
+
+    urls = [DASHBOARD_FILE, *(asset_urls or {}).values(), *(race_data_urls or {}).values()]
+    if build_info:
+        urls += [url for url in build_info['payloads'].values() if isinstance(url, str)]
+        urls.append(BUILD_MANIFEST)
+    return Page(html_file=html_file, build_id=build_id, current_time=current_time,
+                build_info=build_info, compressed=compressed, sizes=sizes_report(sizes),
+                files=written_files(output_dir, urls, compressed))
+
+
+def report_page(page, charts):
+    """Dashboard summary and period highlights"""
+    say(f"\n📊 DASHBOARD SUMMARY:")
+    say(f"• Main Chart (Top Center): Last 7 Days - {len(charts.last_7_days)} winners")
+    say(f"• Bottom Left: Last 21 Days - {len(charts.last_21_days)} winners")
+    say(f"• Bottom Right: Overall Winners - {len(charts.overall_winners)} winners")
+    say(f"• Last Updated: {page.current_time}")
+
+    for heading, winners in (("🗓️ LAST 7 DAYS HIGHLIGHTS", charts.last_7_days),
+                             ("🏁 OVERALL HIGHLIGHTS", charts.overall_winners)):
+        if not winners.empty:
+            say(f"\n{heading}:")
+            say(f"   • Top Winner: {winners.iloc[0]['Wine']}")
+            say(f"   • Best Score: {winners.iloc[0]['Weighted_Score']:.4f}")
+            say(f"   • Total Sales: CHF {format_swiss_number(winners['Total_Sales_Amount_LCY'].sum())}")
@@ -0,0 +1,251 @@
+"""
+Periods stage: stock levels per campaign and the top 10 of each recent period
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from avu_dashboard.filters import FilterIndex, since
+from avu_dashboard.formatting import (
+    delayed_campaign_no, format_date, format_swiss_number, format_vintage, get_price_emoji, get_stock_emoji,
+    get_stock_status, show,
+)
+from avu_dashboard.logs import displaying, say
+from avu_dashboard.lookup import KeyIndex
+from avu_dashboard.stages.score import item_producers
+
+# (days, name, emoji) of the multi-period tables
+PERIODS = [
+    (7, "Last 7 Days", "🗓️"),
+    (14, "Last 14 Days", "📅"),
+    (21, "Last 21 Days", "📆"),
+    (30, "Last 30 Days", "🗓️")
+]
+PERIOD_TOP_N = 10
+
+PERIOD_DISPLAY_COLUMNS = [
+    'Period_Rank', '🎨', '📦', 'Campaign_No', 'Wine', 'Vintage', 'Producer_Name', 'Starting_Date',
+    'Total_Sales_Amount_LCY', 'Unique_Bought', 'Conversion_Rate_%', 'Weighted_Score', 'Stock_Status', 'Main_Item_No', 'Overall_Position'
+]
+
+# Stock emoji -> (label, range) for the period summaries
+STOCK_LEVELS = [
+    ('🟣', 'Purple (1-12)'),
+    ('🟨', 'Gold (13-49)'),
+    ('🟦', 'Blue (50-199)'),
+    ('🩷', 'Pink (200-499)'),
+    ('🟢', 'Green (500+)'),
+    ('⚪', 'Unknown'),
+]
+
+
+@dataclass
+class Periods:
+    """Scored campaigns joined with stock, and each period's top 10
+
+    winners_with_stock keeps the score stage's ranking order (row i is
+    Overall_Position i + 1), so a top N is a run of row positions.
+    """
+    winners_with_stock: pd.DataFrame
+    stock_mapping: pd.DataFrame
+    now: datetime
+    period_counts: Dict[int, int]
+    period_winners: Dict[int, pd.DataFrame]
+
+
+def stock_rows(stock_data):
+    """item_id / stock_quantity of every row of the detailed stock list"""
+    return pd.DataFrame({
+        'item_id': pd.to_numeric(stock_data['id'], errors='coerce').fillna(0).astype(int),
+        'stock_quantity': pd.to_numeric(stock_data['stock'], errors='coerce').fillna(0)
+    })
+
+
+def select_period_winners(winners_with_stock, days, now, min_winners=PERIOD_TOP_N, index=None):
+    """(number of campaigns started in the last `days` days, top min_winners of them)
+
+    Short periods are topped up with the best overall campaigns so every
+    period shows min_winners rows. The period is a set of row positions in
+    ranking order; only the selected rows are materialised, with a fresh
+    0..n-1 index in every case. index: a FilterIndex over
+    winners_with_stock to share between periods.
+    """
+    index = index or FilterIndex(winners_with_stock)
+    in_period = index.mask(since('Starting_Date_dt', now - timedelta(days=days)))
+    period_rows = np.flatnonzero(in_period)
+
+    if len(period_rows) >= min_winners:
+        top_rows = period_rows[:min_winners]
+    else:
+        # Topped up with the overall winners not already in the period (all of them when it is empty)
+        top_rows = np.concatenate([period_rows, np.flatnonzero(~in_period)[:min_winners - len(period_rows)]])
+    return len(period_rows), winners_with_stock.take(top_rows).reset_index(drop=True)
+
+
+def selection_expires(periods):
+    """When the period top 10s next change with the clock alone (None: never)
+
+    Campaigns only ever leave a window as time passes, so the selection
+    holds until the oldest campaign of any window ages out of it.
+    """
+    started = periods.winners_with_stock['Starting_Date_dt']
+    expiries = []
+    for days, _, _ in PERIODS:
+        in_window = started[started >= periods.now - timedelta(days=days)]
+        if not in_window.empty:
+            expiries.append(in_window.min() + timedelta(days=days))
+    return min(expiries).to_pydatetime() if expiries else None
+
+
+def attach_stock(scores, snapshots, now=None):
+    """Join every scored campaign with its main item's stock and select the period top 10s"""
+    now = now or datetime.now()
+    say("📅 MULTI-PERIOD WINNERS ANALYSIS WITH STOCK AVAILABILITY")
+    say("="*65)
+    say(f"📊 Analysis Date: {now.strftime('%B %d, %Y at %H:%M:%S')}")
+    say("🎯 Period Analysis: Last 7, 14, 21, and 30 days")
+    say("📦 Stock Status: Based on Detailed Stock List (Column B)")
+    say("🏆 Winner Logic: 60% Conversion + 40% Sales (filtered by period)\n")
+
+    say("📦 Processing Stock Data...")
+    stock = stock_rows(snapshots.stock)
+    stock_index = KeyIndex(stock['item_id'])  # built once: the unique items and every campaign's lookup
+    stock_mapping = stock.take(stock_index.first_rows)
+    say(f"✅ Stock data processed: {len(stock_mapping)} unique items")
+    say(f"📊 Stock range: {stock_mapping['stock_quantity'].min():.0f} - {stock_mapping['stock_quantity'].max():.0f} bottles")
+
+    # All campaigns (not just the top 25), with Starting_Date parsed for the period filters and the
+    # main item's stock looked up by Main_Item_No (two new columns; the scored frame is not copied)
+    winners = scores.winners
+    winners_with_stock = winners.assign(
+        Starting_Date_dt=pd.to_datetime(winners['Starting_Date'], errors='coerce'),
+        stock_quantity=stock_index.take(stock['stock_quantity'], winners['Main_Item_No']),
+    )
+
+    period_counts = {}
+    period_winners = {}
+    index = FilterIndex(winners_with_stock)
+    for days, _, _ in PERIODS:
+        period_counts[days], period_winners[days] = select_period_winners(winners_with_stock, days, now, index=index)
+
+    return Periods(winners_with_stock=winners_with_stock, stock_mapping=stock_mapping, now=now,
+                   period_counts=period_counts, period_winners=period_winners)
+
+
+def format_period_display(period_top):
+    """Period table columns formatted for display (Swiss sales, rounded rates, year vintages)"""
+    period_display = period_top[[col for col in PERIOD_DISPLAY_COLUMNS if col in period_top.columns]].copy()
+    if 'Total_Sales_Amount_LCY' in period_display.columns:
+        period_display['Total_Sales_Amount_LCY'] = period_display['Total_Sales_Amount_LCY'].apply(format_swiss_number)
+    if 'Unique_Bought' in period_display.columns:
+        period_display['Unique_Bought'] = pd.to_numeric(period_display['Unique_Bought'], errors='coerce').fillna(0).astype(int)
+    if 'Weighted_Score' in period_display.columns:
+        period_display['Weighted_Score'] = period_display['Weighted_Score'].round(4)
+    if 'Conversion_Rate_%' in period_display.columns:
+        period_display['Conversion_Rate_%'] = period_display['Conversion_Rate_%'].round(2)
+    if 'Starting_Date' in period_display.columns:
+        period_display['Starting_Date'] = format_date(period_display['Starting_Date'])
+    if 'Vintage' in period_display.columns:
+        period_display['Vintage'] = format_vintage(period_display['Vintage'])
+    return period_display
+
+
+def fill_producers(period_top, snapshots):
+    """Producer names for a period table, falling back to the stock list and then the OMT offer list"""
+    campaign_stats, stock_data, omt_data = snapshots.campaigns, snapshots.stock, snapshots.omt
+    item_no = period_top['Main_Item_No']
+    if 'Producer_Name' in period_top.columns:
+        producers = period_top['Producer_Name']
+    else:
+        producers = item_producers(campaign_stats, item_no)
+
+    # Backup producer lookup from detailed stock list (Column F), matched by Column A ID
+    if 'producer' in stock_data.columns:
+        stock_ids = pd.to_numeric(stock_data['id'], errors='coerce').fillna(0).astype(int)
+        producers = producers.fillna(KeyIndex(stock_ids).take(stock_data['producer'], item_no))
+
+    # Additional fallback: OMT Main Offer List by Campaign No.
+    if omt_data is not None:
+        missing_producers = producers.isna()
+        if missing_producers.any():
+            omt_producer_map = omt_data.groupby('campaign no.')['producer name'].first()
+            producers = producers.fillna(period_top['Campaign_No'].map(omt_producer_map))
+            filled_count = producers[missing_producers].notna().sum()
+            if filled_count > 0:
+                say(f"   ✅ Filled {filled_count} missing producer names from OMT Main Offer List")
+    return period_top.assign(Producer_Name=producers)
+
+
+def period_display_table(period_top, snapshots):
+    """A period's top 10 as shown in the notebook: rank, tier emojis, stock status, producers filled from OMT"""
+    period_top = fill_producers(period_top.assign(
+        Period_Rank=range(1, len(period_top) + 1),
+        **{'🎨': period_top['Main_Bottle_Price_LCY'].apply(get_price_emoji)},
+        Stock_Status=period_top['stock_quantity'].apply(get_stock_status),
+    ), snapshots)
+
+    period_display = format_period_display(period_top)
+    if 'Campaign_No' in period_display.columns and 'Delayed_Sending' in period_top.columns:
+        period_display['Campaign_No'] = delayed_campaign_no(period_top)
+    return period_display
+
+
+def report_periods(periods, snapshots):
+    """Legends, then each period's top 10 table with stock distribution"""
+    say("📦 STOCK STATUS LEGEND (using refined ranges from Cell 1):")
+    say("🎨 UPDATED PRICE TIER LEGEND:")
+    say("🟣 Purple: Extra luxury wines (CHF min avg 750.01+)")
+    say("🟨 Gold: Luxury wines (CHF min avg 300.01-max avg 750.00)")
+    say("💎 Blue: Premium wines (CHF min avg 100.01-max avg 300.00)")
+    say("🩷 Pink: Mid-range wines (min avg 50.01-max avg 100.00)")
+    say("🟢 Green: Budget wines (MAX avg CHF 50)")
+    say("⚪ White: Unknown/No price\n")
+
+    for days, period_name, emoji in PERIODS:
+        say(f"\n{emoji} {period_name.upper()} ANALYSIS")
+        say("-" * 50)
+
+        period_count = periods.period_counts[days]
+        if period_count == 0:
+            say(f"⚠️ No campaigns found in {period_name.lower()}, using top 10 overall winners")
+        elif period_count < PERIOD_TOP_N:
+            say(f"✅ Found {period_count} campaigns in {period_name.lower()}, supplementing with overall winners to reach 10")
+        else:
+            say(f"✅ Found {period_count} campaigns in {period_name.lower()}")
+
+        period_top = periods.period_winners[days]
+        period_top = period_top.assign(**{'📦': period_top['stock_quantity'].apply(get_stock_emoji)})
+
+        say(f"🏆 TOP 10 SELLING CAMPAIGNS - {period_name.upper()}:")
+        if period_top.empty:
+            say("   No campaigns found in this period")
+            say(f"\n📊 {period_name.upper()} SUMMARY:")
+            say(f"• No campaigns found in this {days}-day period")
+            continue
+        if displaying():
+            show(period_display_table(period_top, snapshots), name=f"period_{days}")
+
+        say(f"\n📊 {period_name.upper()} SUMMARY:")
+        say(f"• Total campaigns in period: {period_count}")
+        say(f"• Top 10 campaigns displayed: {len(period_top)}")
+        say(f"• Average weighted score: {period_top['Weighted_Score'].mean():.4f}")
+        say(f"• Total sales (Top 10): CHF {format_swiss_number(period_top['Total_Sales_Amount_LCY'].sum())}")
+
+        say(f"\n📦 STOCK DISTRIBUTION (Top 10):")
+        for stock_emoji, label in STOCK_LEVELS:
+            count = (period_top['📦'] == stock_emoji).sum()
+            if count > 0:
+                say(f"   {stock_emoji} {label}: {count} campaigns ({100*count/len(period_top):.1f}%)")
+
+    say("\n🎯 MULTI-PERIOD ANALYSIS COMPLETE")
+    say("="*40)
+    say("📊 Use the refined stock level indicators for campaign decisions:")
+    say("🟣 Purple (1-12): Limited stock - use cautiously")
+    say("🟨 Gold (13-49): Low stock - monitor carefully")
+    say("🟦 Blue (50-199): Moderate stock - good for campaigns")
+    say("🩷 Pink (200-499): High stock - excellent for campaigns")
+    say("🟢 Green (500+): Very high stock - ideal for large campaigns")
+    say("⚪ Unknown: Check stock status before use")
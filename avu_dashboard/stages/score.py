@@ -0,0 +1,162 @@
+"""
+Score stage: weighted score (60% conversion + 40% sales) and overall ranking
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+import pandas as pd
+
+from avu_dashboard.formatting import (
+    delayed_campaign_no, format_date, format_swiss_number, format_vintage, get_price_emoji, show,
+)
+from avu_dashboard.logs import displaying, say
+from avu_dashboard.lookup import KeyIndex
+
+CONVERSION_WEIGHT = 0.6
+SALES_WEIGHT = 0.4
+TOP_N = 25
+
+PRICE_MEANINGS = {
+    "🟣": "Extra luxury (CHF 750.01+)",
+    "🟨": "Luxury (CHF 300.01–750.00)",
+    "💎": "Premium (CHF 100.01–300.00)",
+    "🩷": "Mid-range (CHF 50.01–100.00)",
+    "🟢": "Budget (≤ CHF 50.00)",
+    "⚪": "Unknown/No price"
+}
+
+TOP25_COLUMNS = ['Overall_Position', 'Campaign_No', '🎨', 'Wine', 'Vintage', 'Producer_Name', 'Starting_Date',
+                 'Multiple', 'Email_Sent', 'Unique_Bought', 'Conversion_Rate_%', 'Total_Sales_Amount_LCY',
+                 'Norm_Conversion', 'Norm_Sales', 'Weighted_Score', 'Delayed_Sending']
+
+TOP25_DISPLAY_COLUMNS = ['Overall_Position', 'Campaign_No', '🎨', 'Wine', 'Vintage', 'Producer_Name', 'Starting_Date',
+                         'Multiple', 'Email_Sent', 'Unique_Bought', 'Conversion_Rate_%', 'Total_Sales_Formatted',
+                         'Norm_Conversion', 'Norm_Sales', 'Weighted_Score']
+
+
+@dataclass
+class Scores:
+    """Every campaign ranked by weighted score, plus the top 25"""
+    winners: pd.DataFrame
+    top_25: pd.DataFrame
+    max_conversion: float
+    max_sales: float
+    campaign_count: int
+
+
+def score_campaigns(snapshots):
+    """Rank the filtered campaigns by weighted score and attach producer names"""
+    say("💰 TOP SELLING WINE CAMPAIGNS - OVERALL RANKINGS")
+    say("="*60)
+    say(f"📊 Analysis Date: {datetime.now().strftime('%B %d, %Y at %H:%M:%S')}")
+    say("🏆 Winner Calculation: 60% Conversion Rate + 40% Total Sales Amount")
+    say("✅ Using filtered data: HORECA/TRADE/Lead campaigns excluded (applied in Cell 1)")
+    say("📊 Normalization: Norm_Conversion = conversion_rate/max_conversion | Norm_Sales = total_sales/max_sales")
+    say("💰 Swiss Formatting: Total Sales with apostrophes (82'723.98)")
+    say("🎯 Focus: Top selling wine campaigns ranked by weighted score\n")
+
+    campaigns_filtered = snapshots.campaigns
+    say(f"📊 Filtered campaigns available: {len(campaigns_filtered)}")
+
+    # ---- Extract key columns for winner calculation ----
+    conversion_rate = pd.to_numeric(campaigns_filtered['conversion rate %'], errors='coerce').fillna(0)
+    total_sales = pd.to_numeric(campaigns_filtered['total sales amount (lcy)'], errors='coerce').fillna(0)
+
+    # ---- Calculate Winner Score (60% conversion + 40% sales) ----
+    max_conversion = max(conversion_rate.max(), 1e-12)  # Avoid division by zero
+    max_sales = max(total_sales.max(), 1e-12)
+    say(f"📊 Normalization factors: Max Conversion = {max_conversion:.2f}% | Max Sales = CHF {format_swiss_number(max_sales)}")
+
+    norm_conversion = conversion_rate / max_conversion  # Each campaign's conversion / best conversion
+    norm_sales = total_sales / max_sales  # Each campaign's sales / best sales
+    weighted_score = CONVERSION_WEIGHT * norm_conversion + SALES_WEIGHT * norm_sales
+    item_no = pd.to_numeric(campaigns_filtered['main item no.'], errors='coerce').fillna(0).astype(int)
+
+    # ---- Build Winners DataFrame ----
+    winners_df = pd.DataFrame({
+        'Campaign_No': campaigns_filtered['campaign no.'].fillna(''),
+        'Wine': campaigns_filtered['main wine name'].fillna('Unknown'),
+        'Vintage': campaigns_filtered['vintage code'].fillna(''),
+        'Starting_Date': campaigns_filtered['scheduled datetime1'].fillna(''),
+        'Multiple': campaigns_filtered['multiple wines'].fillna(''),
+        'Email_Sent': pd.to_numeric(campaigns_filtered['email sent'], errors='coerce').fillna(0),
+        'Conversion_Rate_%': conversion_rate,
+        'Total_Sales_Amount_LCY': total_sales,
+        'Unique_Bought': pd.to_numeric(campaigns_filtered['total unique customers bought'], errors='coerce').fillna(0),
+        'Norm_Conversion': norm_conversion,
+        'Norm_Sales': norm_sales,
+        'Weighted_Score': weighted_score,
+        'Main_Bottle_Price_LCY': pd.to_numeric(campaigns_filtered['main bottle price (lcy)'], errors='coerce').fillna(0),
+        'Delayed_Sending': campaigns_filtered['delayed sending'].fillna(False),
+        'Main_Item_No': item_no
+    })
+
+    # Sort by weighted score (descending) and add overall position
+    winners_df = winners_df.sort_values('Weighted_Score', ascending=False).reset_index(drop=True)
+    winners_df['Overall_Position'] = range(1, len(winners_df) + 1)
+
+    # Producer Name by Main Item No (a sorted-key lookup, not a merge that re-copies every column)
+    winners_df['Producer_Name'] = KeyIndex(item_no).take(campaigns_filtered['producer name'], winners_df['Main_Item_No'])
+
+    top_25_winners = winners_df.head(TOP_N).copy()
+    top_25_winners['🎨'] = top_25_winners['Main_Bottle_Price_LCY'].apply(get_price_emoji)
+    top_25_winners['Rank'] = range(1, len(top_25_winners) + 1)
+
+    return Scores(winners=winners_df, top_25=top_25_winners, max_conversion=max_conversion,
+                  max_sales=max_sales, campaign_count=len(campaigns_filtered))
+
+
+def item_producers(campaign_stats, item_no):
+    """Producer name of each Main_Item_No in item_no, from the campaign statistics (first occurrence wins)"""
+    keys = pd.to_numeric(campaign_stats['main item no.'], errors='coerce').fillna(0).astype(int)
+    return KeyIndex(keys).take(campaign_stats['producer name'], item_no).rename('Producer_Name')
+
+
+def top25_display_table(top_25_winners):
+    """Top 25 formatted for display: short wine names, year vintages, -D campaigns, Swiss sales"""
+    display_table = top_25_winners[TOP25_COLUMNS].copy()
+    display_table['Wine'] = display_table['Wine'].astype(str).apply(
+        lambda x: x if len(x) <= 25 else x[:25] + "…"
+    )
+    display_table['Vintage'] = format_vintage(display_table['Vintage'])
+    display_table['Starting_Date'] = format_date(display_table['Starting_Date'])
+    display_table['Campaign_No'] = delayed_campaign_no(display_table)
+    display_table['Total_Sales_Formatted'] = display_table['Total_Sales_Amount_LCY'].apply(format_swiss_number)
+    display_table['Norm_Conversion'] = display_table['Norm_Conversion'].round(4)
+    display_table['Norm_Sales'] = display_table['Norm_Sales'].round(4)
+    display_table['Weighted_Score'] = display_table['Weighted_Score'].round(4)
+    return display_table
+
+
+def report_scores(scores):
+    """Price legend, top 25 table and winner summary"""
+    top_25_winners = scores.top_25
+
+    say("🎨 PRICE TIER COLOR LEGEND:")
+    say("🟣 Purple: Extra luxury wines (CHF 750.01+)")
+    say("🟨 Gold: Luxury wines (CHF 300.01–750.00)")
+    say("💎 Diamond: Premium wines (CHF 100.01–300.00)")
+    say("🩷 Pink: Mid-range wines (CHF 50.01–100.00)")
+    say("🟢 Green: Budget wines (≤ CHF 50.00)")
+    say("⚪ White: Unknown/No price\n")
+
+    say("🏆 TOP 25 WINE CAMPAIGN WINNERS:")
+    if displaying():
+        show(top25_display_table(top_25_winners)[TOP25_DISPLAY_COLUMNS], name="top_25")
+
+    say("\n📊 WINNER ANALYSIS SUMMARY:")
+    say(f"• #1 Winner: {top_25_winners.iloc[0]['Wine']} | Weighted Score: {top_25_winners.iloc[0]['Weighted_Score']:.4f}")
+    say(f"• Price Range: CHF {top_25_winners['Main_Bottle_Price_LCY'].min():.0f} - CHF {top_25_winners['Main_Bottle_Price_LCY'].max():.0f}")
+    say(f"• Avg Conversion Rate: {top_25_winners['Conversion_Rate_%'].mean():.2f}%")
+    say(f"• Total Sales (Top 25): CHF {format_swiss_number(top_25_winners['Total_Sales_Amount_LCY'].sum())}")
+    say(f"• Total Emails Sent: {top_25_winners['Email_Sent'].sum():,.0f}")
+    say(f"• Total Unique Customers: {top_25_winners['Unique_Bought'].sum():,.0f}")
+    say(f"• Avg Normalized Conversion: {top_25_winners['Norm_Conversion'].mean():.4f}")
+    say(f"• Avg Normalized Sales: {top_25_winners['Norm_Sales'].mean():.4f}")
+    say(f"• Delayed Campaigns: {(top_25_winners['Delayed_Sending'] == True).sum()}/{len(top_25_winners)}")
+
+    say(f"\n🎨 PRICE CATEGORY DISTRIBUTION:")
+    for emoji, count in top_25_winners['🎨'].value_counts().items():
+        meaning = PRICE_MEANINGS.get(emoji, "Unknown")
+        pct = 100 * count / len(top_25_winners)
+        say(f"   {emoji} {meaning}: {count} campaigns ({pct:.1f}%)")
@@ -0,0 +1,148 @@
+"""
+Serve stage: share the dashboard folder (and the JSON API) on the local network
+"""
+import socket
+import threading
+import webbrowser
+from pathlib import Path
+
+from avu_dashboard.api import DashboardAPI
+from avu_dashboard.config import DEFAULT_PORT
+from avu_dashboard.html_builder import DASHBOARD_FILE
+from avu_dashboard.logs import say, warn
+from avu_dashboard.server import DashboardServer
+from avu_dashboard.stages.page import with_tiers
+
+
+def get_local_ip():
+    """Get the local IP address"""
+    try:
+        # Connect to a remote server to get the local IP
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect(("8.8.8.8", 80))
+        local_ip = s.getsockname()[0]
+        s.close()
+        return local_ip
+    except Exception:
+        return "127.0.0.1"
+
+
+def update_api(api, periods, history, build_id=None):
+    """Load this run's scored campaigns and history into a DashboardAPI (created when api is None)"""
+    api = api or DashboardAPI()
+    api.update(with_tiers(periods.winners_with_stock), history.historical_data['snapshots'], build_id=build_id)
+    say(f"🔌 API data loaded: {api.rows} campaigns, {api.snapshot_count} snapshots (build {api.build_id})")
+    return api
+
+
+def start_server(port, directory, api=None):
+    """Run the dashboard server until it is shut down (call from a background thread in a notebook)"""
+    # Threaded server: files are held in memory (re-read only when they change),
+    # with ETag/Last-Modified 304s and precompressed .br/.gz variants
+    try:
+        with DashboardServer(("", port), directory, api=api) as httpd:
+            say(f"🚀 Server started successfully on port {port}")
+            httpd.serve_forever()
+    except OSError as e:
+        if "Address already in use" in str(e):
+            warn(f"⚠️ Port {port} is already in use. Try a different port or stop existing server.")
+        else:
+            warn(f"⚠️ Server error: {e}")
+    except Exception as e:
+        warn(f"⚠️ Unexpected server error: {e}")
+
+
+def print_access_info(dashboard_dir, local_ip, port):
+    """Network addresses and sharing instructions"""
+    say(f"✅ Dashboard file found: {DASHBOARD_FILE}")
+    say(f"📁 Server directory: {dashboard_dir}")
+
+    say(f"\n🌐 NETWORK ACCESS INFORMATION:")
+    say("="*50)
+    say(f"📍 Your Computer IP: {local_ip}")
+    say(f"🔗 Local Access: http://localhost:{port}")
+    say(f"🔗 Network Access: http://{local_ip}:{port}")
+    say(f"📱 Mobile Access: http://{local_ip}:{port}")
+
+    say(f"\n📋 SHARING INSTRUCTIONS:")
+    say("="*30)
+    say("1️⃣ **For Other Computers on Your Network:**")
+    say(f"   • Open any web browser")
+    say(f"   • Navigate to: http://{local_ip}:{port}")
+    say(f"   • The dashboard will load automatically")
+
+    say(f"\n2️⃣ **For Mobile Devices (Phones/Tablets):**")
+    say(f"   • Connect to the same WiFi network")
+    say(f"   • Open browser and go to: http://{local_ip}:{port}")
+    say(f"   • Dashboard is fully responsive for mobile")
+
+    say(f"\n3️⃣ **For Team Sharing:**")
+    say(f"   • Share this URL: http://{local_ip}:{port}")
+    say(f"   • Anyone on your network can access it")
+    say(f"   • No login required - direct access")
+
+    say(f"\n4️⃣ **For Other Tools (CRM, bots):**")
+    say(f"   • http://{local_ip}:{port}/api/winners?window=14&k=10")
+    say(f"   • http://{local_ip}:{port}/api/campaign/<no>  |  /api/history?campaign=<no>  |  /api/tiers")
+    say(f"   • http://{local_ip}:{port}/metrics  (Prometheus request metrics)")
+
+
+def print_server_status(dashboard_dir, local_ip, port):
+    """Status, management, security and troubleshooting notes"""
+    say(f"\n📊 SERVER STATUS:")
+    say("="*20)
+    say(f"🟢 Status: Active")
+    say(f"🔗 Local URL: http://localhost:{port}")
+    say(f"🌐 Network URL: http://{local_ip}:{port}")
+    say(f"📁 Serving: {Path(dashboard_dir).name}")
+    say(f"🔄 Auto-Refresh: Available in dashboard")
+    say(f"⚡ Caching: in-memory files, ETag/304 revalidation, immutable hashed assets")
+
+    say(f"\n⚙️ SERVER MANAGEMENT:")
+    say("="*25)
+    say("• To stop server: Restart this notebook kernel (Ctrl+C on the command line)")
+    say("• To change port: Modify PORT variable above (--port on the command line)")
+    say("• To update dashboard: Re-run the dashboard - the running server picks up changed files")
+    say("• Server runs until kernel restart or manual stop")
+
+    say(f"\n🔒 NETWORK SECURITY NOTES:")
+    say("="*30)
+    say("• Dashboard is read-only (no data modification)")
+    say("• Only accessible from your local network")
+    say("• No sensitive data exposed (only charts)")
+    say("• Server automatically stops when notebook closes")
+
+    say(f"\n🎯 TROUBLESHOOTING:")
+    say("="*20)
+    say("• If URL doesn't work: Check firewall settings")
+    say("• If port busy: Change PORT number and restart")
+    say("• If can't connect: Ensure same WiFi network")
+    say("• For updates: Re-run the dashboard (no server restart needed)")
+
+    say(f"\n💡 PRO TIP:")
+    say(f"📱 For easy mobile access, you can create a QR code")
+    say(f"🔗 QR Code URL: http://{local_ip}:{port}")
+    say(f"🎨 Use any QR generator with the network URL above")
+
+
+def serve_dashboard(dashboard_dir, api=None, port=DEFAULT_PORT, open_browser=True):
+    """Serve dashboard_dir in the foreground until interrupted (command-line serve stage)"""
+    say("🌐 NETWORK SHARING - AVU DASHBOARD")
+    say("="*50)
+    dashboard_dir = Path(dashboard_dir)
+    if not (dashboard_dir / DASHBOARD_FILE).exists():
+        warn(f"⚠️ Dashboard file not found. Run the html stage first.")
+        say(f"📁 Expected location: {dashboard_dir / DASHBOARD_FILE}")
+        return
+
+    local_ip = get_local_ip()
+    print_access_info(dashboard_dir, local_ip, port)
+    with DashboardServer(("", port), dashboard_dir, api=api) as httpd:
+        say(f"\n🚀 Server started successfully on port {port}")
+        print_server_status(dashboard_dir, local_ip, port)
+        if open_browser:
+            threading.Timer(0.5, webbrowser.open, args=(f"http://localhost:{port}",)).start()
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            say("\n🛑 Server stopped")
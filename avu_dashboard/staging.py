@@ -0,0 +1,128 @@
+"""
+Local staging of the synced input folders
+
+With a stage_dir configured, a run does not read the snapshot pickles or
+write the historical matrix on the OneDrive folder itself: the pickles and
+the history files are copied to <stage_dir>/snapshots and
+<stage_dir>/historical first (only when their size or modification time
+changed, keeping the modification time so the build cache recognises
+them), the stages run against the local copies, and the history files the
+run rewrote are copied back afterwards.
+
+Copies are written to a temporary name and renamed into place, so neither
+the pipeline nor the sync client ever sees half a file. A snapshot pickle
+that is still being synced is not staged; the previous staged copy is used
+instead. History files that changed on the synced side during the run
+(another machine appended a snapshot) are left alone rather than
+overwritten.
+"""
+import os
+import shutil
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from avu_dashboard.config import (
+    CAMPAIGN_STATS_FILE, HISTORY_FILE, OMT_FILE, RACE_CHART_FILE, STOCK_FILE, DashboardPaths,
+)
+from avu_dashboard.logs import say, warn
+
+SNAPSHOT_FILES = (CAMPAIGN_STATS_FILE, STOCK_FILE, OMT_FILE)
+HISTORY_FILES = (HISTORY_FILE, RACE_CHART_FILE)
+STAGED_SNAPSHOTS = "snapshots"
+STAGED_HISTORICAL = "historical"
+
+# Pickle protocol 2+ starts with PROTO (0x80); every pickle ends with STOP (".")
+PICKLE_PROTO = b'\x80'
+PICKLE_STOP = b'.'
+
+
+def pickle_complete(path):
+    """True when the file holds a whole pickle: PROTO opcode first, STOP opcode last"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            tail = f.read(1)
+    except OSError:  # missing, or empty (seek before start)
+        return False
+    return head == PICKLE_PROTO and tail == PICKLE_STOP
+
+
+def file_state(path):
+    """(size, mtime_ns) of a file, None when missing"""
+    try:
+        stat = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def copy_atomic(source, target):
+    """Copy with data and modification time through a temporary file next to the target"""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(target.name + '.tmp')
+    shutil.copy2(source, temporary)
+    os.replace(temporary, target)
+
+
+@dataclass
+class Staging:
+    """Where a run's inputs were staged from and to"""
+    source: DashboardPaths
+    paths: DashboardPaths  # the paths the stages use: snap_dir and historical_dir under stage_dir
+    history_states: Dict[str, Optional[Tuple[int, int]]] = field(default_factory=dict)  # synced side at staging
+    copied: List[str] = field(default_factory=list)
+
+
+def stage_inputs(paths):
+    """Copy changed snapshots and history files to paths.stage_dir; returns the Staging"""
+    stage_dir = Path(paths.stage_dir)
+    staged = replace(paths, snap_dir=stage_dir / STAGED_SNAPSHOTS, historical_dir=stage_dir / STAGED_HISTORICAL)
+    staging = Staging(source=paths, paths=staged)
+
+    for name in SNAPSHOT_FILES:
+        source, target = Path(paths.snap_dir) / name, staged.snap_dir / name
+        source_state = file_state(source)
+        if source_state is None:
+            if target.exists():
+                target.unlink()  # mirror a removed optional file (the OMT list)
+            continue
+        if source_state == file_state(target):
+            continue
+        if not pickle_complete(source) and target.exists():
+            warn(f"⚠️ {name} is still syncing - using the staged copy from the last complete sync")
+            continue
+        copy_atomic(source, target)
+        staging.copied.append(name)
+
+    for name in HISTORY_FILES:
+        source, target = Path(paths.historical_dir) / name, staged.historical_dir / name
+        staging.history_states[name] = source_state = file_state(source)
+        if source_state is not None and source_state != file_state(target):
+            copy_atomic(source, target)
+            staging.copied.append(name)
+    staged.historical_dir.mkdir(parents=True, exist_ok=True)
+
+    copied = ', '.join(staging.copied) if staging.copied else "nothing changed"
+    say(f"📥 Staged inputs in {stage_dir} ({copied})")
+    return staging
+
+
+def publish_history(staging):
+    """Copy the history files the run rewrote back to the synced historical folder; returns their names"""
+    published = []
+    for name in HISTORY_FILES:
+        staged, source = staging.paths.historical_dir / name, Path(staging.source.historical_dir) / name
+        staged_state = file_state(staged)
+        if staged_state is None or staged_state == file_state(source):
+            continue
+        if file_state(source) != staging.history_states.get(name):
+            warn(f"⚠️ {source} changed during the run - not overwritten (the next run stages the new version)")
+            continue
+        copy_atomic(staged, source)
+        published.append(name)
+    if published:
+        say(f"📤 Published {', '.join(published)} to {staging.source.historical_dir}")
+    return published
@@ -0,0 +1,140 @@
+"""
+Startup-time budget for the command line and the stage modules
+
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and checks that
+  • its cumulative import time (median of a few runs) stays within budget
+  • none of the modules it must not load shows up: pandas and numpy for
+    the command line and the pipeline driver (a run that skips every
+    stage never needs them), matplotlib everywhere (pyplot is imported
+    when a chart or the GIF is drawn), http.server outside serve mode
+
+    python -m avu_dashboard.startup                  check every entry point
+    python -m avu_dashboard.startup --scale 2        slower machine: double the budgets
+    python -m avu_dashboard.startup avu_dashboard.cli --runs 9 --json
+
+Exit status 1 when a budget is exceeded or a forbidden module is imported.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+LIGHT = ('pandas', 'numpy', 'matplotlib', 'http.server')  # modules the light entry points must not load
+NO_PLOTTING = ('matplotlib', 'http.server')
+
+# module -> (budget in milliseconds, modules it must not import)
+ENTRY_POINTS = {
+    'avu_dashboard.cli': (150, LIGHT),
+    'avu_dashboard.pipeline': (120, LIGHT),
+    'avu_dashboard.watch': (150, LIGHT),
+    'avu_dashboard.stages.gif': (100, LIGHT),
+    'avu_dashboard.stages.history': (1000, NO_PLOTTING),
+    'avu_dashboard.stages.charts': (1000, NO_PLOTTING),
+    'avu_dashboard.stages.page': (1000, NO_PLOTTING),
+    'avu_dashboard.stages.serve': (1000, ('matplotlib',)),
+}
+DEFAULT_ENTRY_POINT = (150, LIGHT)  # any other module named on the command line
+DEFAULT_RUNS = 5
+
+
+@dataclass
+class StartupResult:
+    module: str
+    budget_ms: float
+    median_ms: float
+    runs_ms: List[float] = field(default_factory=list)
+    forbidden: List[str] = field(default_factory=list)  # forbidden modules that were imported
+    slowest: List[str] = field(default_factory=list)  # largest self times, for a failing module
+
+    @property
+    def ok(self):
+        return self.median_ms <= self.budget_ms and not self.forbidden
+
+
+def parse_importtime(stderr):
+    """[(module, self µs, cumulative µs)] from `-X importtime` output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def is_forbidden(name, module):
+    """True when `name` is `module` or one of its submodules"""
+    return name == module or name.startswith(module + '.')
+
+
+def measure(module, budget_ms, forbidden, runs=DEFAULT_RUNS):
+    """Import `module` `runs` times in fresh interpreters; returns a StartupResult"""
+    times = []
+    found = set()
+    slowest = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                   cwd=REPO_DIR, capture_output=True, text=True)
+        if completed.returncode:
+            raise RuntimeError(f"import {module} failed:\n{completed.stderr.strip().splitlines()[-1]}")
+        imports = parse_importtime(completed.stderr)
+        times.append(next(cumulative for name, _, cumulative in reversed(imports) if name == module) / 1000)
+        found.update(banned for banned in forbidden if any(is_forbidden(name, banned) for name, _, _ in imports))
+        slowest = [f"{name} {self_us / 1000:.1f} ms" for name, self_us, _ in
+                   sorted(imports, key=lambda item: item[1], reverse=True)[:5]]
+    median = statistics.median(times)
+    return StartupResult(module=module, budget_ms=budget_ms, median_ms=round(median, 1),
+                         runs_ms=[round(t, 1) for t in times], forbidden=sorted(found),
+                         slowest=slowest if median > budget_ms else [])
+
+
+def check_startup(modules=None, runs=DEFAULT_RUNS, scale=1.0):
+    """StartupResult per entry point (all of ENTRY_POINTS by default)"""
+    results = []
+    for module in modules or ENTRY_POINTS:
+        budget_ms, forbidden = ENTRY_POINTS.get(module, DEFAULT_ENTRY_POINT)
+        results.append(measure(module, budget_ms * scale, forbidden, runs))
+    return results
+
+
+def print_results(results):
+    print("🚀 STARTUP BUDGET (python -X importtime, median)")
+    print("="*78)
+    print(f"{'module':<30} {'median ms':>10} {'budget ms':>10}  result")
+    for result in results:
+        status = "✅" if result.ok else "❌"
+        notes = []
+        if result.median_ms > result.budget_ms:
+            notes.append("over budget")
+        if result.forbidden:
+            notes.append("imports " + ", ".join(result.forbidden))
+        print(f"{result.module:<30} {result.median_ms:>10.1f} {result.budget_ms:>10.0f}  {status} {'; '.join(notes)}")
+        for line in result.slowest:
+            print(f"{'':<33}• {line}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the import-time budget of the dashboard entry points")
+    parser.add_argument('modules', nargs='*', help=f"modules to check (default: {', '.join(ENTRY_POINTS)})")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="fresh interpreters per module")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every budget (slow machines, CI)")
+    parser.add_argument('--json', action='store_true', help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = check_startup(args.modules, runs=args.runs, scale=args.scale)
+    if args.json:
+        print(json.dumps([{**asdict(result), 'ok': result.ok} for result in results], indent=2))
+    else:
+        print_results(results)
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
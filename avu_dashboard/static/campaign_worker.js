@@ -0,0 +1,152 @@
+// Campaign query worker: holds the campaign dataset as typed arrays and answers
+// sort / filter / aggregate requests with row indices only.
+'use strict';
+const MISSING_DAY = -2147483648;
+let dataset = null;
+
+function toDayNumber(isoDate) {
+    return isoDate ? Math.floor(Date.parse(`${isoDate}T00:00:00Z`) / 86400000) : MISSING_DAY;
+}
+
+function toFloat64(values) {
+    return Float64Array.from(values);
+}
+
+// Dense rank of a text column, so text sorts become integer comparisons
+function buildTextRank(values) {
+    const lowered = values.map(value => String(value).toLowerCase());
+    const order = Array.from(lowered.keys()).sort((a, b) => (lowered[a] < lowered[b] ? -1 : lowered[a] > lowered[b] ? 1 : 0));
+    const rank = new Int32Array(values.length);
+    let current = 0;
+    order.forEach((row, position) => {
+        if (position > 0 && lowered[row] !== lowered[order[position - 1]]) current++;
+        rank[row] = current;
+    });
+    return rank;
+}
+
+function buildCategory(column) {
+    const codes = Uint16Array.from(column.codes);
+    return { codes, values: column.values };
+}
+
+function loadDataset(payload) {
+    const columns = payload.columns;
+    const rows = payload.rows;
+    const startingDay = Int32Array.from(columns.starting_date, toDayNumber);
+
+    const sortKeys = {
+        overall_position: toFloat64(columns.overall_position),
+        vintage: toFloat64(columns.vintage),
+        total_sales: toFloat64(columns.total_sales),
+        unique_bought: toFloat64(columns.unique_bought),
+        conversion_rate: toFloat64(columns.conversion_rate),
+        weighted_score: toFloat64(columns.weighted_score),
+        bottle_price: toFloat64(columns.bottle_price),
+        stock_quantity: toFloat64(columns.stock_quantity),
+        main_item_no: toFloat64(columns.main_item_no),
+        starting_date: startingDay,
+        campaign_no: buildTextRank(columns.campaign_no),
+        wine: buildTextRank(columns.wine),
+        producer: buildTextRank(columns.producer.codes.map(code => columns.producer.values[code]))
+    };
+
+    const producerNames = columns.producer.codes.map(code => columns.producer.values[code]);
+    const search = columns.wine.map((wine, i) => `${wine} ${producerNames[i]} ${columns.campaign_no[i]}`.toLowerCase());
+
+    return {
+        rows,
+        asOfDay: toDayNumber(payload.as_of),
+        sortKeys,
+        startingDay,
+        totalSales: sortKeys.total_sales,
+        conversionRate: sortKeys.conversion_rate,
+        priceTier: buildCategory(columns.price_tier),
+        stockTier: buildCategory(columns.stock_tier),
+        search,
+        sortedCache: {}
+    };
+}
+
+// Ascending row order per sort key, computed once and reused for every filter change
+function sortedOrder(sortKey) {
+    if (!dataset.sortedCache[sortKey]) {
+        const keys = dataset.sortKeys[sortKey] || dataset.sortKeys.weighted_score;
+        const order = new Int32Array(dataset.rows);
+        for (let i = 0; i < order.length; i++) order[i] = i;
+        order.sort((a, b) => (keys[a] - keys[b]) || (a - b));
+        dataset.sortedCache[sortKey] = order;
+    }
+    return dataset.sortedCache[sortKey];
+}
+
+function tierCode(category, label) {
+    if (label === undefined || label === null || label === '') return -1;
+    const code = category.values.indexOf(label);
+    return code === -1 ? -2 : code;
+}
+
+function matchesFilters(row, filters) {
+    if (filters.priceCode !== -1 && dataset.priceTier.codes[row] !== filters.priceCode) return false;
+    if (filters.stockCode !== -1 && dataset.stockTier.codes[row] !== filters.stockCode) return false;
+    if (filters.fromDay !== null && dataset.startingDay[row] < filters.fromDay) return false;
+    if (filters.text && !dataset.search[row].includes(filters.text)) return false;
+    return true;
+}
+
+function compileFilters(query) {
+    return {
+        priceCode: tierCode(dataset.priceTier, query.priceTier),
+        stockCode: tierCode(dataset.stockTier, query.stockTier),
+        fromDay: query.windowDays ? dataset.asOfDay - query.windowDays : null,
+        text: (query.text || '').trim().toLowerCase()
+    };
+}
+
+function runQuery(query) {
+    const filters = compileFilters(query);
+    const order = sortedOrder(query.sortKey);
+    const indices = new Int32Array(order.length);
+    let count = 0;
+    if (query.ascending) {
+        for (let p = 0; p < order.length; p++) {
+            if (matchesFilters(order[p], filters)) indices[count++] = order[p];
+        }
+    } else {
+        for (let p = order.length - 1; p >= 0; p--) {
+            if (matchesFilters(order[p], filters)) indices[count++] = order[p];
+        }
+    }
+    return indices.slice(0, count);
+}
+
+// Sum of sales and mean conversion per tier over the rows matching the filters
+function runAggregate(query) {
+    const filters = compileFilters(query);
+    const category = query.groupBy === 'stock_tier' ? dataset.stockTier : dataset.priceTier;
+    const groups = category.values.map(tier => ({ tier, count: 0, total_sales: 0, mean_conversion: 0 }));
+    for (let row = 0; row < dataset.rows; row++) {
+        if (!matchesFilters(row, filters)) continue;
+        const group = groups[category.codes[row]];
+        group.count++;
+        group.total_sales += dataset.totalSales[row];
+        group.mean_conversion += dataset.conversionRate[row];
+    }
+    groups.forEach(group => {
+        group.mean_conversion = group.count ? group.mean_conversion / group.count : 0;
+    });
+    return groups.filter(group => group.count > 0);
+}
+
+self.onmessage = event => {
+    const message = event.data;
+    if (message.type === 'load') {
+        dataset = loadDataset(message.payload);
+        self.postMessage({ type: 'ready', rows: dataset.rows });
+    } else if (message.type === 'query') {
+        const indices = runQuery(message.query);
+        self.postMessage({ type: 'query', requestId: message.requestId, indices }, [indices.buffer]);
+    } else if (message.type === 'aggregate') {
+        self.postMessage({ type: 'aggregate', requestId: message.requestId, groups: runAggregate(message.query) });
+    }
+};
@@ -0,0 +1,722 @@
+// Chart rotation functionality
+let currentRotation = 0;
+
+// Chart data arrays - [title, image_src, alt_text, chart_type] - come from the
+// build-specific chartData defined in the page shell
+
+// Show chartData in the three chart positions for the current rotation
+function renderChartPositions() {
+    // Calculate new positions for each chart
+    // Position 1 (main): gets chart from position 3
+    // Position 2 (bottom-left): gets chart from position 1  
+    // Position 3 (bottom-right): gets chart from position 2
+    const newPositions = [
+        (2 - currentRotation + 3) % 3,  // Position 1 gets previous position 3
+        (0 - currentRotation + 3) % 3,  // Position 2 gets previous position 1
+        (1 - currentRotation + 3) % 3   // Position 3 gets previous position 2
+    ];
+
+    // Update each position with the rotated chart
+    for (let pos = 0; pos < 3; pos++) {
+        const chartIndex = newPositions[pos];
+        const positionNum = pos + 1;
+
+        // Update title and chart type
+        const titleElement = document.getElementById(`title-position-${positionNum}`);
+        titleElement.textContent = chartData[chartIndex][0];
+        titleElement.setAttribute('data-chart', chartData[chartIndex][3]);
+
+        // Update image
+        const imgElement = document.getElementById(`image-position-${positionNum}`);
+        imgElement.src = chartData[chartIndex][1];
+        imgElement.alt = chartData[chartIndex][2];
+    }
+}
+
+function rotateCharts() {
+    // Increment rotation counter (anticlockwise means we move indices forward)
+    currentRotation = (currentRotation + 1) % 3;
+
+    renderChartPositions();
+
+    // Add visual feedback
+    const button = document.querySelector('.rotate-button');
+    button.textContent = '🔄 Rotating...';
+    button.disabled = true;
+
+    // Add rotation animation effect
+    const chartGrid = document.querySelector('.chart-grid');
+    chartGrid.style.transition = 'transform 0.5s ease-in-out';
+    chartGrid.style.transform = 'rotate(-5deg)';
+
+    setTimeout(() => {
+        chartGrid.style.transform = 'rotate(0deg)';
+        button.textContent = '🔄 Rotate Charts';
+        button.disabled = false;
+    }, 500);
+
+    // Update button text temporarily to show rotation direction
+    setTimeout(() => {
+        button.textContent = '🔄 Rotate Charts ↺';
+        setTimeout(() => {
+            button.textContent = '🔄 Rotate Charts';
+        }, 1000);
+    }, 100);
+}
+
+// Add keyboard shortcut (R key)
+document.addEventListener('keydown', function(event) {
+    if (event.key === 'r' || event.key === 'R') {
+        if (!event.ctrlKey && !event.altKey && !event.metaKey) {
+            rotateCharts();
+        }
+    }
+});
+
+// Time display functionality
+function updateTime() {
+    const now = new Date();
+    const timeString = now.toLocaleTimeString('en-US', {
+        hour12: false,
+        hour: '2-digit',
+        minute: '2-digit',
+        second: '2-digit'
+    });
+    const dateString = now.toLocaleDateString('en-US', {
+        month: 'short',
+        day: 'numeric'
+    });
+
+    const timeElement = document.getElementById('current-time');
+    if (timeElement) {
+        timeElement.textContent = `${dateString} ${timeString}`;
+    }
+}
+
+// Add some visual improvements
+document.addEventListener('DOMContentLoaded', function() {
+    // Initialize time display
+    updateTime();
+    setInterval(updateTime, 1000); // Update every second
+
+    // Add hover effects to charts
+    const charts = document.querySelectorAll('.chart-main, .chart-secondary');
+    charts.forEach(chart => {
+        chart.addEventListener('mouseenter', function() {
+            this.style.transform = 'scale(1.02)';
+            this.style.transition = 'transform 0.3s ease';
+        });
+
+        chart.addEventListener('mouseleave', function() {
+            this.style.transform = 'scale(1)';
+        });
+    });
+});
+
+// Table sorting functionality
+// Cells carry a pre-computed data-sort-value (raw number, ISO date or lowercase text),
+// so keys are extracted once per sort and the comparator only compares primitives.
+function sortTable(header, columnIndex) {
+    const table = header.closest('table');
+    const tbody = table.querySelector('tbody');
+    const rows = Array.from(tbody.rows);
+    const dataType = header.getAttribute('data-type');
+    const cellIndex = header.cellIndex;
+
+    // Determine sort direction
+    let ascending = true;
+    if (header.classList.contains('sorted-asc')) {
+        ascending = false;
+    }
+
+    // Clear all sorting classes
+    table.querySelectorAll('th').forEach(th => {
+        th.classList.remove('sorted-asc', 'sorted-desc');
+    });
+
+    // Add appropriate class to current header
+    header.classList.add(ascending ? 'sorted-asc' : 'sorted-desc');
+
+    // Extract sort keys once (falls back to cell text for cells without data-sort-value)
+    const keyed = rows.map((row, position) => {
+        const cell = row.cells[cellIndex];
+        let key = '';
+        if (cell) {
+            key = cell.hasAttribute('data-sort-value') ? cell.getAttribute('data-sort-value') : cell.textContent.trim();
+        }
+        if (dataType === 'number') {
+            key = parseFloat(cell && cell.hasAttribute('data-sort-value') ? key : key.replace(/[^0-9.-]/g, '')) || 0;
+        } else if (dataType !== 'date') {
+            key = key.toLowerCase();
+        }
+        return { row, key, position };
+    });
+
+    // Sort on the primitive keys; ties keep their current order
+    const direction = ascending ? 1 : -1;
+    keyed.sort((a, b) => {
+        if (a.key < b.key) return -direction;
+        if (a.key > b.key) return direction;
+        return a.position - b.position;
+    });
+
+    // Re-insert sorted rows in a single DOM operation
+    const fragment = document.createDocumentFragment();
+    keyed.forEach(entry => fragment.appendChild(entry.row));
+    tbody.appendChild(fragment);
+
+    // Add visual feedback with opacity change (works better with gradients)
+    const originalOpacity = header.style.opacity;
+    header.style.opacity = '0.7';
+    setTimeout(() => {
+        header.style.opacity = originalOpacity || '1';
+    }, 150);
+}
+
+// All Campaigns virtualized table
+// The full dataset lives in one columnar JSON blob; only the rows inside the
+// viewport (plus a small overscan) are rendered into the DOM. Sorting, filtering
+// and tier aggregation run in the campaign worker, which posts back row indices.
+const ALL_CAMPAIGNS_ROW_HEIGHT = 29;
+const ALL_CAMPAIGNS_OVERSCAN = 10;
+
+// [label, column key, data type, cell class, sort key]
+const allCampaignsLayout = [
+    ['Pos.', 'overall_position', 'number', 'rank-cell', 'overall_position'],
+    ['Campaign', 'campaign_no', 'text', '', 'campaign_no'],
+    ['🎨', 'price_tier', 'number', 'emoji-cell', 'bottle_price'],
+    ['📦', 'stock_tier', 'number', 'emoji-cell', 'stock_quantity'],
+    ['Wine', 'wine', 'text', '', 'wine'],
+    ['Vintage', 'vintage', 'number', 'number-cell', 'vintage'],
+    ['Producer', 'producer', 'text', '', 'producer'],
+    ['Start Date', 'starting_date', 'date', '', 'starting_date'],
+    ['Sales', 'total_sales', 'number', 'number-cell', 'total_sales'],
+    ['Buyers', 'unique_bought', 'number', 'number-cell', 'unique_bought'],
+    ['Conv. %', 'conversion_rate', 'number', 'number-cell', 'conversion_rate'],
+    ['Score', 'weighted_score', 'number', 'number-cell', 'weighted_score'],
+    ['Stock', 'stock_quantity', 'number', 'number-cell', 'stock_quantity'],
+    ['Item No.', 'main_item_no', 'number', 'number-cell', 'main_item_no']
+];
+
+const allCampaigns = {
+    rows: 0,
+    columns: {},
+    view: [],
+    query: {
+        sortKey: 'weighted_score',
+        ascending: false,
+        text: '',
+        priceTier: '',
+        stockTier: '',
+        windowDays: 0
+    },
+    worker: null,
+    requestId: 0,
+    renderPending: false,
+    filterTimer: null
+};
+
+function escapeHtml(value) {
+    return String(value).replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' })[ch]);
+}
+
+function formatSwissNumber(value) {
+    const [integerPart, decimalPart] = Math.abs(value).toFixed(2).split('.');
+    const formatted = `${integerPart.replace(/\B(?=(\d{3})+(?!\d))/g, "'")}.${decimalPart}`;
+    return value < 0 ? `-${formatted}` : formatted;
+}
+
+function initAllCampaigns() {
+    const source = document.getElementById('all-campaigns-data');
+    if (!source) return;
+
+    const header = document.getElementById('allCampaignsHeader');
+    header.innerHTML = allCampaignsLayout.map(([label, , dataType, , sortKey]) =>
+        `<th data-key="${sortKey}" data-type="${dataType}" onclick="sortAllCampaigns(this)">${label}</th>`
+    ).join('');
+
+    const viewport = document.getElementById('allCampaignsViewport');
+    viewport.addEventListener('scroll', scheduleAllCampaignsRender, { passive: true });
+    window.addEventListener('resize', scheduleAllCampaignsRender);
+
+    allCampaigns.worker = createCampaignWorker(handleCampaignWorkerMessage);
+    loadAllCampaigns(JSON.parse(source.textContent));
+}
+
+// (Re)load the dataset on the main thread and in the worker, keeping the current query
+function loadAllCampaigns(payload) {
+    allCampaigns.rows = payload.rows;
+
+    // Decode dictionary-encoded (category) columns into plain arrays once
+    allCampaigns.columns = {};
+    Object.entries(payload.columns).forEach(([key, column]) => {
+        allCampaigns.columns[key] = Array.isArray(column)
+            ? column
+            : column.codes.map(code => column.values[code]);
+    });
+
+    allCampaigns.query.priceTier = populateTierFilter('priceTierFilter', payload.columns.price_tier.values);
+    allCampaigns.query.stockTier = populateTierFilter('stockTierFilter', payload.columns.stock_tier.values);
+
+    allCampaigns.worker.postMessage({ type: 'load', payload });
+    applyAllCampaignsFilter();
+}
+
+// Fill a tier <select>; returns the selected tier ('' for all)
+function populateTierFilter(selectId, tiers) {
+    const select = document.getElementById(selectId);
+    if (!select) return '';
+    // Keep the "all" option (and the current choice when it still exists)
+    const selected = select.value;
+    while (select.options.length > 1) select.remove(1);
+    tiers.forEach(tier => {
+        const option = document.createElement('option');
+        option.value = tier;
+        option.textContent = tier;
+        select.appendChild(option);
+    });
+    select.value = tiers.includes(selected) ? selected : '';
+    return select.value;
+}
+
+// Start the campaign worker from its hashed asset (data-src) or its inline source;
+// fall back to running the same source on the main thread where workers or Blob
+// URLs are unavailable.
+function createCampaignWorker(onMessage) {
+    const element = document.getElementById('campaign-worker-source');
+    const src = element.getAttribute('data-src');
+    try {
+        const url = src || URL.createObjectURL(new Blob([element.textContent], { type: 'text/javascript' }));
+        const worker = new Worker(url);
+        worker.onmessage = event => onMessage(event.data);
+        return worker;
+    } catch (error) {
+        console.warn('Campaign worker unavailable, querying on the main thread:', error);
+        if (!src) return { postMessage: runWorkerOnMainThread(element.textContent, onMessage) };
+
+        // Linked worker: queue messages until its source has been fetched
+        const pending = [];
+        let post = data => pending.push(data);
+        fetch(src)
+            .then(response => response.text())
+            .then(source => {
+                post = runWorkerOnMainThread(source, onMessage);
+                pending.splice(0).forEach(data => post(data));
+            });
+        return { postMessage: data => post(data) };
+    }
+}
+
+function runWorkerOnMainThread(source, onMessage) {
+    const scope = { postMessage: data => onMessage(data) };
+    new Function('self', source)(scope);
+    return data => scope.onmessage({ data });
+}
+
+function handleCampaignWorkerMessage(message) {
+    // Ignore answers to queries that have since been superseded
+    if (message.requestId !== undefined && message.requestId !== allCampaigns.requestId) return;
+    if (message.type === 'query') {
+        allCampaigns.view = message.indices;
+        document.getElementById('allCampaignsCount').textContent =
+            `${allCampaigns.view.length.toLocaleString()} of ${allCampaigns.rows.toLocaleString()} campaigns`;
+        document.getElementById('allCampaignsViewport').scrollTop = 0;
+        renderAllCampaigns();
+    } else if (message.type === 'aggregate') {
+        renderTierSummary(message.groups);
+    }
+}
+
+function renderTierSummary(groups) {
+    const summary = document.getElementById('allCampaignsTierSummary');
+    if (!summary) return;
+    summary.innerHTML = groups.map(group =>
+        `<span class="legend-item">${escapeHtml(group.tier)} ${group.count} · CHF ${formatSwissNumber(group.total_sales)} · Ø ${group.mean_conversion.toFixed(2)}%</span>`
+    ).join('');
+}
+
+function applyAllCampaignsFilter() {
+    allCampaigns.requestId += 1;
+    const query = { ...allCampaigns.query };
+    allCampaigns.worker.postMessage({ type: 'query', requestId: allCampaigns.requestId, query });
+    allCampaigns.worker.postMessage({ type: 'aggregate', requestId: allCampaigns.requestId, query: { ...query, groupBy: 'price_tier' } });
+}
+
+function sortAllCampaigns(header) {
+    const key = header.getAttribute('data-key');
+    const query = allCampaigns.query;
+    // Same column toggles direction; a new column starts descending for numbers, ascending for text
+    query.ascending = query.sortKey === key
+        ? !query.ascending
+        : header.getAttribute('data-type') !== 'number';
+    query.sortKey = key;
+
+    header.parentElement.querySelectorAll('th').forEach(th => {
+        th.classList.remove('sorted-asc', 'sorted-desc');
+    });
+    header.classList.add(query.ascending ? 'sorted-asc' : 'sorted-desc');
+
+    applyAllCampaignsFilter();
+}
+
+function filterAllCampaigns(text) {
+    clearTimeout(allCampaigns.filterTimer);
+    allCampaigns.filterTimer = setTimeout(() => {
+        allCampaigns.query.text = text;
+        applyAllCampaignsFilter();
+    }, 120);
+}
+
+function filterAllCampaignsByTier(kind, tier) {
+    allCampaigns.query[kind === 'stock' ? 'stockTier' : 'priceTier'] = tier;
+    applyAllCampaignsFilter();
+}
+
+function filterAllCampaignsByWindow(days) {
+    allCampaigns.query.windowDays = parseInt(days, 10) || 0;
+    applyAllCampaignsFilter();
+}
+
+function scheduleAllCampaignsRender() {
+    if (allCampaigns.renderPending) return;
+    allCampaigns.renderPending = true;
+    requestAnimationFrame(renderAllCampaigns);
+}
+
+function renderAllCampaignsCell(key, row) {
+    const value = allCampaigns.columns[key][row];
+    switch (key) {
+        case 'overall_position': return `#${value}`;
+        case 'campaign_no': return escapeHtml(allCampaigns.columns.delayed[row] ? `${value}-D` : value);
+        case 'vintage': return value ? value : '';
+        case 'total_sales': return formatSwissNumber(value);
+        case 'conversion_rate': return `${value.toFixed(2)}%`;
+        case 'weighted_score': return value.toFixed(4);
+        case 'unique_bought':
+        case 'stock_quantity': return value.toLocaleString();
+        default: return escapeHtml(value);
+    }
+}
+
+function renderAllCampaigns() {
+    allCampaigns.renderPending = false;
+    const viewport = document.getElementById('allCampaignsViewport');
+    const tbody = document.getElementById('allCampaignsBody');
+    const total = allCampaigns.view.length;
+    const columnCount = allCampaignsLayout.length;
+
+    const first = Math.max(0, Math.floor(viewport.scrollTop / ALL_CAMPAIGNS_ROW_HEIGHT) - ALL_CAMPAIGNS_OVERSCAN);
+    const visibleCount = Math.ceil(viewport.clientHeight / ALL_CAMPAIGNS_ROW_HEIGHT) + 2 * ALL_CAMPAIGNS_OVERSCAN;
+    const last = Math.min(total, first + visibleCount);
+
+    // Spacer rows keep the scrollbar proportional to the full (filtered) dataset
+    const parts = [`<tr class="virtual-spacer"><td colspan="${columnCount}" style="height:${first * ALL_CAMPAIGNS_ROW_HEIGHT}px"></td></tr>`];
+    for (let position = first; position < last; position++) {
+        const row = allCampaigns.view[position];
+        parts.push('<tr>' + allCampaignsLayout.map(([, key, , cellClass]) =>
+            `<td${cellClass ? ` class="${cellClass}"` : ''}>${renderAllCampaignsCell(key, row)}</td>`
+        ).join('') + '</tr>');
+    }
+    parts.push(`<tr class="virtual-spacer"><td colspan="${columnCount}" style="height:${(total - last) * ALL_CAMPAIGNS_ROW_HEIGHT}px"></td></tr>`);
+    tbody.innerHTML = parts.join('');
+}
+
+document.addEventListener('DOMContentLoaded', initAllCampaigns);
+
+// Race Chart Animation Functionality
+let raceData = [];
+let currentFrame = 0;
+let isPlaying = false;
+let animationSpeed = 800;
+let animationInterval;
+let raceDataLoaded = false;
+let raceDataRequest = null;
+
+// Race chart data is either inlined in the page shell (actualRaceData) or, when
+// actualRaceData is null, fetched from the race section's data-race-src the first
+// time the section scrolls into view or Play is pressed.
+
+function initializeRaceChart() {
+    const canvas = document.getElementById('raceCanvas');
+
+    // Set canvas size
+    canvas.width = 1200;
+    canvas.height = 600;
+
+    const section = document.getElementById('raceSection');
+    if (actualRaceData || !('IntersectionObserver' in window)) {
+        loadRaceData();
+        return;
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) {
+            observer.disconnect();
+            loadRaceData();
+        }
+    }, { rootMargin: '200px' });
+    observer.observe(section);
+}
+
+function fetchRaceData() {
+    const section = document.getElementById('raceSection');
+    const gzipUrl = section.getAttribute('data-race-src-gz');
+    if (gzipUrl && typeof DecompressionStream !== 'undefined') {
+        return fetch(gzipUrl).then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status} for ${gzipUrl}`);
+            return new Response(response.body.pipeThrough(new DecompressionStream('gzip'))).json();
+        });
+    }
+    const url = section.getAttribute('data-race-src');
+    return fetch(url).then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status} for ${url}`);
+        return response.json();
+    });
+}
+
+// Resolves to true once raceData holds the history; concurrent callers share one request
+function loadRaceData() {
+    if (raceDataLoaded) return Promise.resolve(true);
+    if (raceDataRequest) return raceDataRequest;
+
+    document.getElementById('currentDate').textContent = 'Loading race data...';
+    const source = actualRaceData ? Promise.resolve(actualRaceData) : fetchRaceData();
+    raceDataRequest = source
+        .then(payload => {
+            setRaceData(payload);
+            raceDataLoaded = true;
+            if (raceData.length > 0) {
+                drawRaceFrame(0);
+            } else {
+                document.getElementById('currentDate').textContent = 'No race chart data available';
+            }
+            return true;
+        })
+        .catch(error => {
+            console.error('Race chart data could not be loaded:', error);
+            document.getElementById('currentDate').textContent = 'Race data unavailable - open the dashboard through its web server';
+            raceDataRequest = null;
+            return false;
+        });
+    return raceDataRequest;
+}
+
+function setRaceData(payload) {
+    // Convert actual data to expected format
+    if (payload && payload.time_series) {
+        raceData = payload.time_series.map(snapshot => ({
+            date: snapshot.analysis_date || snapshot.date,
+            winners: snapshot.winners.map(w => ({
+                name: w.name,
+                score: w.value,
+                color: w.color
+            }))
+        }));
+        console.log('Loaded race data:', raceData.length, 'snapshots');
+    } else {
+        console.error('No race chart data available');
+        raceData = [];
+    }
+}
+
+function drawRaceFrame(frameIndex) {
+    const canvas = document.getElementById('raceCanvas');
+    const ctx = canvas.getContext('2d');
+
+    if (!raceData[frameIndex]) return;
+
+    const data = raceData[frameIndex];
+    const winners = data.winners.slice(0, 10); // Top 10
+
+    // Clear canvas
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+    // Set up dimensions
+    const margin = { top: 60, right: 50, bottom: 80, left: 200 };
+    const chartWidth = canvas.width - margin.left - margin.right;
+    const chartHeight = canvas.height - margin.top - margin.bottom;
+    const barHeight = chartHeight / winners.length;
+
+    // Draw title
+    ctx.fillStyle = '#333';
+    ctx.font = 'bold 24px Arial';
+    ctx.textAlign = 'center';
+    ctx.fillText('🏁 Wine Campaign Race Chart', canvas.width / 2, 30);
+
+    // Draw date
+    ctx.font = '18px Arial';
+    ctx.fillStyle = '#666';
+    ctx.fillText(data.date, canvas.width / 2, 55);
+
+    // Find max score for scaling
+    const maxScore = Math.max(...winners.map(w => w.score));
+
+    // Draw bars and labels
+    winners.forEach((winner, i) => {
+        const y = margin.top + i * barHeight;
+        const barWidth = (winner.score / maxScore) * chartWidth;
+
+        // Draw bar
+        ctx.fillStyle = winner.color;
+        ctx.fillRect(margin.left, y + barHeight * 0.1, barWidth, barHeight * 0.8);
+
+        // Draw wine name
+        ctx.fillStyle = '#333';
+        ctx.font = 'bold 16px Arial';
+        ctx.textAlign = 'right';
+        ctx.fillText(winner.name, margin.left - 10, y + barHeight * 0.6);
+
+        // Draw score
+        ctx.textAlign = 'left';
+        ctx.fillStyle = '#fff';
+        ctx.fillText(winner.score.toFixed(4), margin.left + barWidth + 10, y + barHeight * 0.6);
+
+        // Draw rank
+        ctx.fillStyle = '#FFD700';
+        ctx.font = 'bold 20px Arial';
+        ctx.textAlign = 'center';
+        ctx.fillText(`#${i + 1}`, margin.left - 60, y + barHeight * 0.6);
+    });
+
+    // Update date display
+    document.getElementById('currentDate').textContent = `Current: ${data.date}`;
+}
+
+function playRaceChart() {
+    if (isPlaying) return;
+    if (!raceDataLoaded) {
+        loadRaceData().then(loaded => {
+            if (loaded) playRaceChart();
+        });
+        return;
+    }
+    if (raceData.length === 0) return;
+
+    isPlaying = true;
+    animationInterval = setInterval(() => {
+        currentFrame = (currentFrame + 1) % raceData.length;
+        drawRaceFrame(currentFrame);
+
+        if (currentFrame === 0 && raceData.length > 1) {
+            // Reset to beginning
+            setTimeout(() => {
+                if (isPlaying) drawRaceFrame(0);
+            }, animationSpeed);
+        }
+    }, animationSpeed);
+}
+
+function pauseRaceChart() {
+    isPlaying = false;
+    clearInterval(animationInterval);
+}
+
+function resetRaceChart() {
+    pauseRaceChart();
+    currentFrame = 0;
+    drawRaceFrame(0);
+}
+
+function updateSpeed() {
+    const slider = document.getElementById('speedSlider');
+    animationSpeed = parseInt(slider.value);
+
+    if (isPlaying) {
+        pauseRaceChart();
+        playRaceChart();
+    }
+}
+
+// Initialize race chart when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    setTimeout(initializeRaceChart, 500); // Wait for canvas to be ready
+});
+
+// Live reload
+// Pages served by the Cell 6 server listen on /events for the build id of each new
+// run, then fetch only the payloads (data/*.json?v=...) whose version changed and
+// patch them in place. A change to the page's own CSS/JS forces a full reload.
+const liveReload = {
+    info: null,
+    pending: Promise.resolve()
+};
+
+const liveReloadPatches = {
+    tables: url => fetchJson(url).then(payload => {
+        document.getElementById('top25Tables').innerHTML = payload.top25_table;
+        document.getElementById('periodTables').innerHTML = payload.period_tables;
+        document.querySelectorAll('.build-time').forEach(element => {
+            element.textContent = payload.current_time;
+        });
+        Object.entries(payload.counts).forEach(([id, count]) => {
+            const element = document.getElementById(id);
+            if (element) element.textContent = count;
+        });
+    }),
+    charts: url => fetchJson(url).then(payload => {
+        chartData.splice(0, chartData.length, ...payload.chart_data);
+        renderChartPositions();
+    }),
+    campaigns: url => fetchJson(url).then(loadAllCampaigns),
+    race: urls => {
+        const section = document.getElementById('raceSection');
+        section.setAttribute('data-race-src', urls.src);
+        if (urls.src_gz) section.setAttribute('data-race-src-gz', urls.src_gz);
+        // Only re-fetch when the race history had already been loaded
+        const wasLoaded = raceDataLoaded;
+        raceDataLoaded = false;
+        raceDataRequest = null;
+        return wasLoaded ? loadRaceData() : Promise.resolve();
+    }
+};
+
+function fetchJson(url) {
+    return fetch(url).then(response => {
+        if (!response.ok) throw new Error(`HTTP ${response.status} for ${url}`);
+        return response.json();
+    });
+}
+
+function initLiveReload() {
+    if (!buildInfo || !window.EventSource || !location.protocol.startsWith('http')) return;
+    liveReload.info = buildInfo;
+
+    let opened = false;
+    const source = new EventSource('events');
+    source.onopen = () => { opened = true; };
+    // Static hosting (GitHub Pages) has no /events: give up instead of retrying forever
+    source.onerror = () => {
+        if (!opened) source.close();
+    };
+    source.addEventListener('build', event => {
+        const message = JSON.parse(event.data);
+        if (message.build && message.build !== liveReload.info.build) {
+            // One update at a time; a build arriving mid-update is applied after it
+            liveReload.pending = liveReload.pending.then(applyLatestBuild);
+        }
+    });
+}
+
+function applyLatestBuild() {
+    return fetch('build.json', { cache: 'no-cache' })
+        .then(response => response.json())
+        .then(manifest => {
+            if (manifest.build === liveReload.info.build) return null;
+            if (manifest.static !== liveReload.info.static) {
+                location.reload();
+                return null;
+            }
+
+            const current = liveReload.info.payloads;
+            const updates = Object.entries(manifest.payloads)
+                .filter(([name, value]) => liveReloadPatches[name] && JSON.stringify(value) !== JSON.stringify(current[name]))
+                .map(([name, value]) => liveReloadPatches[name](value));
+            return Promise.all(updates).then(() => {
+                liveReload.info = manifest;
+                console.log(`Live reload: build ${manifest.build} applied (${updates.length} payloads)`);
+            });
+        })
+        .catch(error => console.error('Live reload failed:', error));
+}
+
+document.addEventListener('DOMContentLoaded', initLiveReload);
@@ -0,0 +1,308 @@
+"""
+Synthetic IRON_DATA snapshots for benchmarks and tests without the real data
+
+Writes the three snapshot pickles with the columns and dtypes the load stage
+reads, plus a history of daily top 15 snapshots, into the folder layout of
+IRON_DATA:
+
+    <out>/snapshots/campaign_statistics.pkl, detailed_stock_list.pkl, omt_main_offer.pkl
+    <out>/historical/top_15_winners_matrix.json, race_chart_data.json
+
+    python -m avu_dashboard.synthetic /tmp/iron_data                     153 campaigns, 46 snapshots
+    python -m avu_dashboard.synthetic /tmp/iron_data --campaigns 1000000 --snapshots 10 --seed 7
+    AVU_IRON_DATA_DIR=/tmp/iron_data python run_dashboard.py
+
+The distributions follow the real snapshots: conversion rates around 1%
+(log-normal, lower for dearer wines), sales from emails × conversion ×
+bottles × price, bottle prices over the five price tiers, stock levels over
+the five stock bands plus out-of-stock items, about 15% HORECA/TRADE/Lead
+campaigns for the load stage to filter, producers missing from some
+campaigns (filled from the stock list and the OMT list) and main items
+missing from the stock list.
+Stock items scale with the campaigns (4,698 per 153 unless --stock-items).
+
+Start dates are relative to --now (default: the current time), so the
+period tables of a dashboard built right away have campaigns in every
+window. The same seed and --now give the same files.
+"""
+import argparse
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from avu_dashboard.config import CAMPAIGN_STATS_FILE, HISTORY_FILE, OMT_FILE, RACE_CHART_FILE, STOCK_FILE
+from avu_dashboard.stages.history import build_race_chart_data, build_snapshot
+from avu_dashboard.stages.load import filter_campaigns
+from avu_dashboard.stages.score import TOP_N, Scores
+from avu_dashboard.staging import STAGED_HISTORICAL, STAGED_SNAPSHOTS
+
+# The real data set the defaults are scaled from
+REFERENCE_CAMPAIGNS = 153
+REFERENCE_STOCK_ITEMS = 4698
+REFERENCE_SNAPSHOTS = 46
+
+DEFAULT_DAYS = 120          # campaigns start within this many days before --now
+RAMP_DAYS = 10              # days a campaign takes to reach its final sales in the history
+FIRST_ITEM_NO = 10000
+REFERENCE_PRICE = 60.0      # CHF; campaigns without a price sell at this
+
+# (value, share) of the campaign types and sub-types; HORECA, TRADE and Lead are filtered by the load stage
+CAMPAIGN_TYPES = [('B2C', 0.74), ('PRIVATE', 0.14), ('HORECA', 0.07), ('TRADE', 0.05)]
+CAMPAIGN_SUB_TYPES = [('Offer', 0.58), ('Flash Sale', 0.2), ('Newsletter', 0.17), ('Lead', 0.05)]
+
+# (low, high, share) of the main bottle price: formatting.get_price_emoji's five tiers plus no price
+PRICE_TIERS = [(8, 50), (50.01, 100), (100.01, 300), (300.01, 750), (750.01, 4500), (0, 0)]
+PRICE_SHARES = [0.34, 0.27, 0.22, 0.11, 0.05, 0.01]
+
+# (low, high) of the stock quantity: out of stock, then formatting.get_stock_emoji's five bands
+STOCK_BANDS = [(0, 0), (1, 12), (13, 49), (50, 199), (200, 499), (500, 2400)]
+STOCK_SHARES = [0.08, 0.2, 0.25, 0.27, 0.13, 0.07]
+
+MISSING_PRODUCER = 0.2      # campaigns without a producer name
+MISSING_STOCK_PRODUCER = 0.03
+MISSING_OMT_PRODUCER = 0.1
+OMT_COVERAGE = 0.9          # campaigns listed in the OMT main offer list
+ITEMS_NOT_IN_STOCK = 0.06   # main items absent from the stock list
+NON_VINTAGE = 0.12
+MULTIPLE_WINES = 0.15
+DELAYED_SENDING = 0.1
+
+APPELLATIONS = np.array([
+    'Barolo', 'Barbaresco', 'Brunello di Montalcino', 'Chianti Classico Riserva', 'Amarone della Valpolicella',
+    'Pauillac', 'Margaux', 'Saint-Julien', 'Pomerol', 'Saint-Emilion Grand Cru', 'Meursault', 'Chablis Premier Cru',
+    'Gevrey-Chambertin', 'Chateauneuf-du-Pape', 'Hermitage', 'Cote-Rotie', 'Champagne Brut', 'Sancerre',
+    'Rioja Reserva', 'Ribera del Duero', 'Priorat', 'Douro Tinto', 'Mosel Riesling Spatlese', 'Wachau Gruner Veltliner',
+    'Napa Valley Cabernet', 'Sonoma Chardonnay', 'Barossa Shiraz', 'Marlborough Sauvignon Blanc', 'Mendoza Malbec',
+    'Dezaley Grand Cru', 'Ticino Merlot', 'Bolgheri Rosso',
+], dtype=object)
+CUVEES = np.array([
+    '', ' Riserva', ' Vieilles Vignes', ' Grand Vin', ' Cuvee Prestige', ' Single Vineyard', ' Magnum',
+    ' Reserve', ' Selection', ' Clos', ' Les Terrasses', ' Gran Reserva',
+], dtype=object)
+PRODUCER_PREFIXES = ['Domaine', 'Chateau', 'Tenuta', 'Weingut', 'Bodegas', 'Cantina', 'Maison', 'Quinta', 'Estate']
+PRODUCER_NAMES = ['Albrecht', 'Bellini', 'Castel', 'Dufour', 'Esposito', 'Fontaine', 'Gaillard', 'Hofmann',
+                  'Iglesias', 'Jaccard', 'Keller', 'Laurent', 'Moretti', 'Navarro', 'Olivier', 'Perret',
+                  'Quintana', 'Rossi', 'Schneider', 'Torres', 'Urban', 'Vidal', 'Weber', 'Zanetti']
+
+
+@dataclass
+class SyntheticData:
+    """The three snapshot frames, as the load stage reads them from disk"""
+    campaigns: pd.DataFrame
+    stock: pd.DataFrame
+    omt: pd.DataFrame
+
+
+def choose(rng, options, size):
+    """Values drawn from (value, share) pairs"""
+    values, shares = zip(*options)
+    return np.array(values, dtype=object)[rng.choice(len(values), size=size, p=shares)]
+
+
+def uniform_bands(rng, bands, shares, size, integers=False):
+    """Values drawn uniformly inside (low, high) bands picked by share"""
+    band = rng.choice(len(bands), size=size, p=shares)
+    low = np.array([b[0] for b in bands], dtype=float)[band]
+    high = np.array([b[1] for b in bands], dtype=float)[band]
+    if integers:
+        return rng.integers(low.astype(np.int64), high.astype(np.int64) + 1)
+    return np.round(rng.uniform(low, high), 2)
+
+
+def with_missing(rng, values, share):
+    """Object array with `share` of the values replaced by NaN"""
+    values = values.astype(object)
+    values[rng.random(len(values)) < share] = np.nan
+    return values
+
+
+def producer_pool(count):
+    """count distinct producer names"""
+    return np.array([f"{PRODUCER_PREFIXES[i % len(PRODUCER_PREFIXES)]} "
+                     f"{PRODUCER_NAMES[(i // len(PRODUCER_PREFIXES)) % len(PRODUCER_NAMES)]}"
+                     + (f" {i // (len(PRODUCER_PREFIXES) * len(PRODUCER_NAMES)) + 1}"
+                        if i >= len(PRODUCER_PREFIXES) * len(PRODUCER_NAMES) else "")
+                     for i in range(count)], dtype=object)
+
+
+def scaled_stock_items(campaigns):
+    """Stock list length in the proportion of the real data"""
+    return max(1, round(campaigns * REFERENCE_STOCK_ITEMS / REFERENCE_CAMPAIGNS))
+
+
+def generate_snapshots(campaigns=REFERENCE_CAMPAIGNS, stock_items=None, seed=0, now=None, days=DEFAULT_DAYS):
+    """Campaign statistics, detailed stock list and OMT main offer list frames"""
+    rng = np.random.default_rng(seed)
+    now = now or datetime.now()
+    stock_items = stock_items or scaled_stock_items(campaigns)
+
+    # ---- Items: the stock list plus a few main items it does not list ----
+    unlisted = max(1, round(stock_items * ITEMS_NOT_IN_STOCK))
+    item_ids = FIRST_ITEM_NO + rng.permutation(stock_items + unlisted).astype(np.int64) * 3
+    producers = producer_pool(max(20, stock_items // 12))
+    item_producer = rng.integers(0, len(producers), size=len(item_ids))
+
+    stock = pd.DataFrame({
+        'id': item_ids[:stock_items],
+        'stock': uniform_bands(rng, STOCK_BANDS, STOCK_SHARES, stock_items, integers=True),
+        'producer': with_missing(rng, producers[item_producer[:stock_items]], MISSING_STOCK_PRODUCER),
+    })
+
+    # ---- Campaigns: popular items come back in several campaigns ----
+    item = (rng.pareto(1.2, size=campaigns) * len(item_ids) / 40).astype(np.int64) % len(item_ids)
+    item = rng.permutation(len(item_ids))[item]
+    main_item_no = item_ids[item]
+    wine = APPELLATIONS[main_item_no % len(APPELLATIONS)] + CUVEES[(main_item_no // len(APPELLATIONS)) % len(CUVEES)]
+
+    price = uniform_bands(rng, PRICE_TIERS, PRICE_SHARES, campaigns)
+    email_sent = rng.integers(1500, 42000, size=campaigns)
+    # Dearer wines convert fewer customers, who buy fewer bottles each
+    relative_price = np.where(price > 0, price, REFERENCE_PRICE) / REFERENCE_PRICE
+    conversion = np.clip(rng.lognormal(np.log(0.9), 0.7, size=campaigns) * relative_price ** -0.35, 0, 30)
+    unique_bought = np.round(email_sent * conversion / 100).astype(np.int64)
+    bottles = np.maximum(1.0, rng.lognormal(np.log(3), 0.5, size=campaigns) * relative_price ** -0.3)
+    sales = np.round(unique_bought * bottles * relative_price * REFERENCE_PRICE, 2)
+    vintage = rng.integers(1990, now.year - 1, size=campaigns).astype(float)
+    vintage[rng.random(campaigns) < NON_VINTAGE] = np.nan
+    started = (pd.Timestamp(now) - pd.to_timedelta(rng.uniform(0, days, size=campaigns), unit='D')).floor('s')
+
+    campaign_no = np.array([f"CP{n:07d}" for n in rng.permutation(campaigns) + 1], dtype=object)
+    campaign_stats = pd.DataFrame({
+        'campaign no.': campaign_no,
+        'type': choose(rng, CAMPAIGN_TYPES, campaigns),
+        'sub-type': choose(rng, CAMPAIGN_SUB_TYPES, campaigns),
+        'conversion rate %': np.round(np.where(email_sent > 0, unique_bought / email_sent * 100, 0), 2),
+        'total sales amount (lcy)': sales,
+        'main wine name': wine,
+        'vintage code': vintage,
+        'scheduled datetime1': started,
+        'multiple wines': rng.random(campaigns) < MULTIPLE_WINES,
+        'email sent': email_sent,
+        'main bottle price (lcy)': price,
+        'delayed sending': rng.random(campaigns) < DELAYED_SENDING,
+        'total unique customers bought': unique_bought,
+        'main item no.': main_item_no,
+        'producer name': with_missing(rng, producers[item_producer[item]], MISSING_PRODUCER),
+    }).sort_values('scheduled datetime1', ignore_index=True)
+
+    listed = rng.random(campaigns) < OMT_COVERAGE
+    omt = pd.DataFrame({
+        'campaign no.': campaign_no[listed],
+        'producer name': with_missing(rng, producers[item_producer[item[listed]]], MISSING_OMT_PRODUCER),
+    })
+    return SyntheticData(campaigns=campaign_stats, stock=stock, omt=omt)
+
+
+def generate_history(data, snapshots=REFERENCE_SNAPSHOTS, now=None):
+    """Historical top 15 matrix with one snapshot per day up to yesterday
+
+    Each day scores the campaigns that had started by then, their sales and
+    conversion ramping up over their first RAMP_DAYS days, the same way the
+    score stage does (filtered campaigns, 60% conversion + 40% sales).
+    """
+    now = now or datetime.now()
+    campaigns = filter_campaigns(data.campaigns)
+    started = campaigns['scheduled datetime1'].to_numpy()
+    conversion = campaigns['conversion rate %'].to_numpy()
+    sales = campaigns['total sales amount (lcy)'].to_numpy()
+    unique_bought = campaigns['total unique customers bought'].to_numpy()
+
+    history = []
+    for days_ago in range(snapshots, 0, -1):
+        taken = (now - timedelta(days=days_ago)).replace(hour=7, minute=30, second=0, microsecond=0)
+        age_days = (np.datetime64(taken) - started) / np.timedelta64(1, 'D')
+        live = np.flatnonzero(age_days >= 0)
+        if not len(live):
+            continue
+        progress = np.clip(age_days[live] / RAMP_DAYS, 0.05, 1)
+        day_conversion = np.round(conversion[live] * np.sqrt(progress), 2)
+        day_sales = np.round(sales[live] * progress, 2)
+        max_conversion = max(day_conversion.max(), 1e-12)
+        max_sales = max(day_sales.max(), 1e-12)
+        score = 0.6 * day_conversion / max_conversion + 0.4 * day_sales / max_sales
+        top = np.argsort(-score, kind='stable')[:TOP_N]
+
+        rows = campaigns.iloc[live[top]]
+        top_25 = pd.DataFrame({
+            'Campaign_No': rows['campaign no.'].to_numpy(),
+            'Wine': rows['main wine name'].to_numpy(),
+            'Vintage': rows['vintage code'].fillna('').to_numpy(),
+            'Weighted_Score': score[top],
+            'Conversion_Rate_%': day_conversion[top],
+            'Total_Sales_Amount_LCY': day_sales[top],
+            'Unique_Bought': np.round(unique_bought[live[top]] * np.sqrt(progress[top])),
+            'Email_Sent': rows['email sent'].to_numpy(),
+            'Main_Bottle_Price_LCY': rows['main bottle price (lcy)'].to_numpy(),
+            'Norm_Conversion': day_conversion[top] / max_conversion,
+            'Norm_Sales': day_sales[top] / max_sales,
+            'Delayed_Sending': rows['delayed sending'].to_numpy(),
+        })
+        day_scores = Scores(winners=top_25, top_25=top_25, max_conversion=float(max_conversion),
+                            max_sales=float(max_sales), campaign_count=len(live))
+        history.append(build_snapshot(day_scores, taken))
+
+    created = history[0]['timestamp'] if history else now.isoformat()
+    return {
+        'created_date': created,
+        'description': 'Historical Top-15 Wine Campaign Winners Matrix for Race Charts',
+        'snapshots': history,
+        'last_updated': history[-1]['timestamp'] if history else created,
+    }
+
+
+def write_dataset(out_dir, data, historical_data, now=None):
+    """Write the pickles to <out_dir>/snapshots and the history files to <out_dir>/historical"""
+    out_dir = Path(out_dir)
+    snap_dir, historical_dir = out_dir / STAGED_SNAPSHOTS, out_dir / STAGED_HISTORICAL
+    snap_dir.mkdir(parents=True, exist_ok=True)
+    historical_dir.mkdir(parents=True, exist_ok=True)
+    data.campaigns.to_pickle(snap_dir / CAMPAIGN_STATS_FILE)
+    data.stock.to_pickle(snap_dir / STOCK_FILE)
+    data.omt.to_pickle(snap_dir / OMT_FILE)
+
+    with open(historical_dir / HISTORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(historical_data, f, indent=2, ensure_ascii=False)
+    race_chart_data = build_race_chart_data(historical_data, now or datetime.now())
+    (historical_dir / RACE_CHART_FILE).write_text(json.dumps(race_chart_data, indent=2, ensure_ascii=False),
+                                                  encoding='utf-8')
+    return snap_dir, historical_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic snapshot pickles and history for the dashboard")
+    parser.add_argument('out_dir', type=Path, help="IRON_DATA-style folder to write snapshots/ and historical/ to")
+    parser.add_argument('--campaigns', type=int, default=REFERENCE_CAMPAIGNS,
+                        help=f"campaign statistics rows (default: {REFERENCE_CAMPAIGNS}; 100 to 1,000,000 tested)")
+    parser.add_argument('--stock-items', type=int,
+                        help=f"stock list rows (default: {REFERENCE_STOCK_ITEMS} per {REFERENCE_CAMPAIGNS} campaigns)")
+    parser.add_argument('--snapshots', type=int, default=REFERENCE_SNAPSHOTS,
+                        help=f"daily history snapshots before today (default: {REFERENCE_SNAPSHOTS}, 0 for none)")
+    parser.add_argument('--days', type=int, help=f"campaign start dates span (default: {DEFAULT_DAYS}, "
+                                                 "or the history length plus 30)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--now', type=datetime.fromisoformat, help="reference time, ISO format (default: now)")
+    args = parser.parse_args(argv)
+    if args.campaigns < 1 or (args.stock_items is not None and args.stock_items < 1) or args.snapshots < 0:
+        parser.error("--campaigns and --stock-items must be positive, --snapshots at least 0")
+
+    now = args.now or datetime.now()
+    days = args.days or max(DEFAULT_DAYS, args.snapshots + 30)
+    print(f"🧪 Generating {args.campaigns:,} campaigns, seed {args.seed}...")
+    data = generate_snapshots(args.campaigns, args.stock_items, seed=args.seed, now=now, days=days)
+    historical_data = generate_history(data, args.snapshots, now=now)
+    snap_dir, historical_dir = write_dataset(args.out_dir, data, historical_data, now)
+
+    print(f"🧊 {CAMPAIGN_STATS_FILE}: {len(data.campaigns):,} rows "
+          f"({len(filter_campaigns(data.campaigns)):,} after the HORECA/TRADE/Lead filter)")
+    print(f"🧊 {STOCK_FILE}: {len(data.stock):,} rows")
+    print(f"🧊 {OMT_FILE}: {len(data.omt):,} rows")
+    print(f"📚 {HISTORY_FILE}: {len(historical_data['snapshots'])} snapshots")
+    print(f"💾 Saved to {snap_dir} and {historical_dir}")
+
+
+if __name__ == '__main__':
+    main()
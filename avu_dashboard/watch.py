@@ -0,0 +1,259 @@
+"""
+Watch mode: rebuild the dashboard when new snapshots land
+
+The snapshot folder is watched with inotify on Linux (through ctypes, no
+extra package) and by polling file sizes and modification times
+everywhere else. A change to one of the snapshot pickles starts a
+debounce: the rebuild waits until the folder has been quiet for
+`debounce` seconds (OneDrive writes a file in several bursts and renames
+temporary files into place), then checks that every pickle is complete
+before running the incremental pipeline. Unchanged stages are skipped, so
+a sync that only touched the stock list rebuilds the period tables,
+charts and page only.
+"""
+import ctypes
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from avu_dashboard.config import CAMPAIGN_STATS_FILE, DEFAULT_PORT, STOCK_FILE, PageOptions
+from avu_dashboard.logs import event, say, warn
+from avu_dashboard.pipeline import run_pipeline
+from avu_dashboard.staging import SNAPSHOT_FILES, pickle_complete
+
+REQUIRED_FILES = (CAMPAIGN_STATS_FILE, STOCK_FILE)
+
+DEFAULT_DEBOUNCE = 10.0  # seconds without writes before rebuilding
+DEFAULT_POLL_INTERVAL = 2.0
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len (name follows)
+
+# Returned by a watcher that lost track of events: treat every file as changed
+ALL_FILES = '*'
+
+
+class InotifyWatcher:
+    """Directory events from the Linux kernel"""
+    kind = "inotify"
+
+    def __init__(self, directory):
+        import ctypes.util  # pulls in subprocess/tempfile/shutil: only when inotify is used
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_init1: {os.strerror(errno)}")
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch {directory}: {os.strerror(errno)}")
+
+    def wait(self, timeout):
+        """Names of the files that changed, or an empty set after `timeout` seconds"""
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        names = set()
+        if not ready:
+            return names
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                if mask & IN_Q_OVERFLOW:
+                    names.add(ALL_FILES)
+                elif length:
+                    names.add(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+                offset += length
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Directory changes found by comparing file sizes and modification times"""
+    kind = "polling"
+
+    def __init__(self, directory, interval=DEFAULT_POLL_INTERVAL):
+        self.directory = Path(directory)
+        self.interval = interval
+        self.state = self.scan()
+
+    def scan(self):
+        """name -> (size, mtime) of the files in the directory"""
+        try:
+            with os.scandir(self.directory) as entries:
+                return {entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+                        for entry in entries if entry.is_file()}
+        except OSError:  # folder briefly missing (e.g. while OneDrive re-syncs it)
+            return {}
+
+    def wait(self, timeout):
+        """Names of the files that changed, or an empty set after `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            current = self.scan()
+            changed = {name for name in current.keys() | self.state.keys()
+                       if current.get(name) != self.state.get(name)}
+            self.state = current
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+def open_watcher(directory, poll_interval=DEFAULT_POLL_INTERVAL, polling=False):
+    """inotify on Linux, polling elsewhere (or when inotify is unavailable)"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            warn(f"⚠️ inotify unavailable ({e}) - polling every {poll_interval:g}s instead")
+    return PollingWatcher(directory, poll_interval)
+
+
+def snapshots_complete(snap_dir):
+    """(True, '') when the required pickles (and the OMT list, if present) are complete, else (False, reason)"""
+    snap_dir = Path(snap_dir)
+    for name in SNAPSHOT_FILES:
+        path = snap_dir / name
+        if not path.exists():
+            if name in REQUIRED_FILES:
+                return False, f"{name} missing"
+            continue
+        if not pickle_complete(path):
+            return False, f"{name} incomplete"
+    return True, ""
+
+
+def is_snapshot_change(changed):
+    """True when a watcher's change set touches a snapshot pickle"""
+    return ALL_FILES in changed or any(name in SNAPSHOT_FILES for name in changed)
+
+
+def wait_until_settled(watcher, snap_dir, debounce, stop):
+    """Wait for `debounce` quiet seconds with complete snapshots; False if stopped first"""
+    last_reason = None
+    while not stop.is_set():
+        quiet_since = time.monotonic()
+        while not stop.is_set():
+            remaining = debounce - (time.monotonic() - quiet_since)
+            if remaining <= 0:
+                break
+            if watcher.wait(min(remaining, 1.0)):
+                quiet_since = time.monotonic()  # any write in the folder restarts the quiet period
+        if stop.is_set():
+            break
+        complete, reason = snapshots_complete(snap_dir)
+        if complete:
+            return True
+        if reason != last_reason:
+            say(f"⏳ {reason} - waiting for the sync to finish")
+            last_reason = reason
+    return False
+
+
+def start_background_server(paths, result, port):
+    """Serve the output folder from a daemon thread; returns the DashboardAPI to refresh after rebuilds"""
+    from avu_dashboard.stages.serve import get_local_ip, print_access_info, start_server, update_api
+    api = update_api(None, result.stage('periods'), result.stage('history'), build_id=result.stage('html').build_id)
+    print_access_info(paths.output_dir, get_local_ip(), port)
+    threading.Thread(target=start_server, args=(port, paths.output_dir, api), daemon=True).start()
+    return api
+
+
+def watch_snapshots(paths, options=None, debounce=DEFAULT_DEBOUNCE, poll_interval=DEFAULT_POLL_INTERVAL,
+                    polling=False, until='html', report=True, gif=False, serve=False, port=DEFAULT_PORT,
+                    open_browser=True, on_build=None, stop=None):
+    """Build once, then rebuild incrementally whenever the snapshots change, until Ctrl+C (or `stop` is set)
+
+    serve=True also serves the output folder; open pages reload themselves
+    after each rebuild. on_build is a shell command run after every
+    rebuild that rewrote the page (e.g. "python auto_update_and_push.py").
+    """
+    stop = stop or threading.Event()
+    options = options or PageOptions()
+    snap_dir = Path(paths.snap_dir)
+    watcher = open_watcher(snap_dir, poll_interval, polling)
+    say("👀 WATCH MODE - AVU DASHBOARD")
+    say("="*50)
+    say(f"📁 Watching: {snap_dir} ({watcher.kind})")
+    say(f"⏱️ Debounce: {debounce:g}s of quiet before rebuilding")
+
+    api = None
+    builds = 0
+
+    def rebuild(reason):
+        nonlocal api, builds
+        say(f"\n🔄 Rebuild ({reason}) at {datetime.now().strftime('%H:%M:%S')}")
+        event('rebuild', reason=reason)
+        started = time.perf_counter()
+        try:
+            result = run_pipeline(paths, options, until=until, report=report, gif=gif)
+        except Exception as e:
+            say(f"❌ Rebuild failed: {e} - still watching", level='error')
+            return
+        builds += 1
+        ran = ', '.join(result.ran) or 'nothing'
+        say(f"✅ Rebuild done in {time.perf_counter() - started:.1f}s (ran: {ran}; skipped: {len(result.skipped)})")
+        if serve and api is None:
+            api = start_background_server(paths, result, port)
+            if open_browser:
+                import webbrowser  # imports subprocess: only when a browser is opened
+                threading.Timer(0.5, webbrowser.open, args=(f"http://localhost:{port}",)).start()
+        elif serve and 'html' in result.ran:
+            # The server notices the new build.json by itself; the API needs the new frames
+            from avu_dashboard.stages.serve import update_api
+            update_api(api, result.stage('periods'), result.stage('history'), build_id=result.stage('html').build_id)
+        if on_build and 'html' in result.ran:
+            say(f"▶️ {on_build}")
+            import subprocess  # only for the --on-build command, not at startup
+            completed = subprocess.run(on_build, shell=True)
+            if completed.returncode:
+                warn(f"⚠️ Command exited with status {completed.returncode}")
+
+    try:
+        complete, reason = snapshots_complete(snap_dir)
+        if complete:
+            rebuild("start")
+        else:
+            say(f"⏳ {reason} - waiting for the first complete snapshots")
+            if wait_until_settled(watcher, snap_dir, debounce, stop):
+                rebuild("start")
+
+        say(f"\n👀 Waiting for new snapshots in {snap_dir} (Ctrl+C to stop)")
+        while not stop.is_set():
+            changed = watcher.wait(1.0)
+            if not is_snapshot_change(changed):
+                continue
+            names = ', '.join(sorted(name for name in changed if name in SNAPSHOT_FILES)) or 'folder rescan'
+            say(f"📥 Change detected: {names} - waiting {debounce:g}s for writes to settle")
+            if wait_until_settled(watcher, snap_dir, debounce, stop):
+                rebuild(names)
+                say(f"\n👀 Waiting for new snapshots in {snap_dir} (Ctrl+C to stop)")
+    except KeyboardInterrupt:
+        say("\n🛑 Watch stopped")
+    finally:
+        watcher.close()
+    return builds
@@ -0,0 +1,21 @@
+"""
+Test setup: make the avu_dashboard package importable from the repository root; shared fixtures
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+if str(REPO_DIR) not in sys.path:
+    sys.path.insert(0, str(REPO_DIR))
+
+
+@pytest.fixture(scope='session')
+def iron_data(tmp_path_factory):
+    """Small synthetic IRON_DATA folder: snapshots/ and historical/ (avu_dashboard.synthetic)"""
+    from avu_dashboard.synthetic import generate_history, generate_snapshots, write_dataset
+    root = tmp_path_factory.mktemp('iron_data')
+    data = generate_snapshots(campaigns=60, seed=1)
+    write_dataset(root, data, generate_history(data, snapshots=5))
+    return root
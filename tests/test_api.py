@@ -0,0 +1,98 @@
+"""
+DashboardAPI responses (avu_dashboard.api)
+"""
+import json
+from datetime import date, timedelta
+
+import pandas as pd
+
+import avu_dashboard.api
+from avu_dashboard.api import DashboardAPI
+
+
+def campaigns():
+    today = pd.Timestamp(date.today())
+    return pd.DataFrame({
+        'Campaign_No': ['C1', 'C2', 'C3'],
+        'Weighted_Score': [0.5, 0.9, 0.7],
+        'Starting_Date': [today - timedelta(days=1), today - timedelta(days=30), today - timedelta(days=3)],
+        'Price_Tier': ['🟨', '🟢', '🟨'],
+        'Stock_Tier': ['🟦', '🟦', '🟢'],
+        'stock_quantity': [10, 60, 80],
+        'Total_Sales_Amount_LCY': [100.0, 200.0, 300.0],
+        'Conversion_Rate_%': [1.0, 2.0, 3.0],
+    })
+
+
+def loaded_api():
+    api = DashboardAPI()
+    snapshots = [{'date': '2024-01-01', 'top_15_winners': [{'campaign_no': 'C2', 'rank': 1}]}]
+    api.update(campaigns(), snapshots, build_id='b1')
+    return api
+
+
+def get(api, path, query=''):
+    status, body, etag = api.handle(path, query)
+    return status, json.loads(body), etag
+
+
+def test_not_loaded_is_503():
+    assert DashboardAPI().handle('/api/tiers', '')[0] == 503
+
+
+def test_winners_rank_window_and_segment():
+    api = loaded_api()
+    status, body, etag = get(api, '/api/winners')
+    assert status == 200 and body['build'] == 'b1' and etag
+    assert [w['campaign_no'] for w in body['winners']] == ['C2', 'C3', 'C1']
+    assert [w['campaign_no'] for w in get(api, '/api/winners', 'window=7')[1]['winners']] == ['C3', 'C1']
+    assert [w['campaign_no'] for w in get(api, '/api/winners', 'price_tier=luxury&k=1')[1]['winners']] == ['C3']
+    assert [w['campaign_no'] for w in get(api, '/api/winners', 'min_stock=50')[1]['winners']] == ['C2', 'C3']
+
+
+def test_campaign_and_history():
+    api = loaded_api()
+    assert get(api, '/api/campaign/C3')[1]['campaign']['stock_quantity'] == 80
+    status, body, _ = get(api, '/api/history', 'campaign=C2')
+    assert status == 200 and body['snapshots'] == 1 and body['history'][0]['rank'] == 1
+
+
+def test_tiers():
+    status, body, _ = get(loaded_api(), '/api/tiers')
+    luxury = next(tier for tier in body['price_tier'] if tier['tier'] == '🟨')
+    assert status == 200 and luxury['campaigns'] == 2 and luxury['total_sales'] == 400.0
+
+
+def test_client_errors():
+    api = loaded_api()
+    for path, query in [('/api/winners', 'k=abc'), ('/api/winners', 'window=-1'),
+                        ('/api/winners', 'price_tier=bogus'), ('/api/history', '')]:
+        status, body, etag = get(api, path, query)
+        assert status == 400 and 'error' in body and etag is None, (path, query)
+    for path in ('/api/campaign/C9', '/api/nope'):
+        assert get(api, path)[0] == 404
+
+
+def test_responses_cached_until_update():
+    api = loaded_api()
+    first = api.handle('/api/winners', 'k=2')
+    assert api.handle('/api/winners/', 'k=2') is first
+    api.update(campaigns(), [], build_id='b2')
+    second = api.handle('/api/winners', 'k=2')
+    assert second is not first and json.loads(second[1])['build'] == 'b2'
+    # Errors are not cached
+    assert api.handle('/api/nope', '') is not api.handle('/api/nope', '')
+
+
+def test_window_counts_days_up_to_the_request_date(monkeypatch):
+    api = loaded_api()
+    assert len(get(api, '/api/winners', 'window=7')[1]['winners']) == 2
+
+    class Later(date):
+        @classmethod
+        def today(cls):
+            return date.today() + timedelta(days=5)
+
+    # The cached answer from yesterday is not reused once the date moves on
+    monkeypatch.setattr(avu_dashboard.api, 'date', Later)
+    assert [w['campaign_no'] for w in get(api, '/api/winners', 'window=7')[1]['winners']] == ['C1']
@@ -0,0 +1,35 @@
+"""
+Precompressed siblings and Accept-Encoding parsing (avu_dashboard.compression)
+"""
+import gzip
+
+from avu_dashboard.compression import parse_accept_encoding, precompress_file, precompress_tree
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding('gzip;q=0.5, br;q=0, identity') == {'gzip', 'identity'}
+    assert parse_accept_encoding('*') >= {'br', 'gzip'}
+    assert parse_accept_encoding(None) == set()
+
+
+def test_precompress_file_writes_gzip_sibling(tmp_path):
+    page = tmp_path / 'page.html'
+    page.write_text('<html>' + 'x' * 1000 + '</html>')
+    sizes = precompress_file(page)
+    sibling = tmp_path / 'page.html.gz'
+    assert gzip.decompress(sibling.read_bytes()) == page.read_bytes()
+    assert sizes['gzip'] == sibling.stat().st_size
+
+
+def test_precompress_tree_only_touches_targets(tmp_path):
+    (tmp_path / 'data').mkdir()
+    (tmp_path / 'profile').mkdir()
+    for name in ('page.html', 'build.json', 'data/tables.json', 'profile/run.json'):
+        (tmp_path / name).write_text('{}' * 100)
+    (tmp_path / 'build.json.gz').write_bytes(b'left over')
+    (tmp_path / 'data' / 'gone.json.gz').write_bytes(b'source deleted')
+
+    report = precompress_tree(tmp_path, ('page.html', 'data'))
+    assert sorted(report) == ['data/tables.json', 'page.html']
+    assert sorted(path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob('*.gz')) == [
+        'data/tables.json.gz', 'page.html.gz']
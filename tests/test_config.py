@@ -0,0 +1,34 @@
+"""
+Settings layers (avu_dashboard.config): defaults < dashboard.toml < AVU_* environment
+"""
+from pathlib import Path
+
+import pytest
+
+from avu_dashboard.config import load_settings
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    config = tmp_path / 'dashboard.toml'
+    config.write_text('[paths]\niron_data_dir = "/file/iron"\noutput_dir = "out"\n\n[serve]\nport = 9000\n',
+                      encoding='utf-8')
+    return config
+
+
+def test_file_layer(config_file, tmp_path):
+    settings = load_settings(config_file, environ={})
+    assert settings.paths.snap_dir == Path('/file/iron/snapshots')
+    assert settings.paths.output_dir == tmp_path / 'out'  # relative to the file, and wins over iron_data_dir
+    assert settings.port == 9000
+
+
+def test_environment_iron_data_dir_beats_file_folders(config_file):
+    settings = load_settings(config_file, environ={'AVU_IRON_DATA_DIR': '/env/iron', 'AVU_SNAP_DIR': '/env/snap'})
+    assert settings.paths.snap_dir == Path('/env/snap')
+    assert settings.paths.historical_dir == Path('/env/iron/historical')
+    assert settings.paths.output_dir == Path('/env/iron/dashboard')
+
+
+def test_empty_cache_dir_turns_cache_off(config_file):
+    assert load_settings(config_file, environ={'AVU_CACHE_DIR': ''}).paths.cache_dir is None
@@ -0,0 +1,33 @@
+"""
+FilterIndex masks (avu_dashboard.filters)
+"""
+import pandas as pd
+
+from avu_dashboard.filters import FilterIndex, at_least, below, exclude, only, price_tier, since
+
+
+def frame():
+    return pd.DataFrame({
+        'type': ['Wine', 'Spirits', 'Wine', 'Wine'],
+        'tier': pd.Categorical(['🟨', '🟢', '🟨', '💎']),
+        'stock': [10, 60, 80, None],
+        'start': pd.to_datetime(['2024-01-01', '2024-02-01', '2024-03-01', None]),
+    })
+
+
+def test_mask_combines_rules():
+    index = FilterIndex(frame())
+    assert index.mask().tolist() == [True, True, True, True]
+    assert index.mask(only('type', ['Wine'])).tolist() == [True, False, True, True]
+    assert index.mask(exclude('type', ['Wine']), at_least('stock', 50)).tolist() == [False, True, False, False]
+    assert index.rows(price_tier('luxury', column='tier'), below('stock', 50)).tolist() == [0]
+    # Missing numbers and dates never match a comparison
+    assert index.mask(since('start', '2024-02-01')).tolist() == [False, True, True, False]
+    assert index.count(at_least('stock', 0)) == 3
+
+
+def test_bits_are_cached_per_rule():
+    index = FilterIndex(frame())
+    rule = only('tier', ['🟨', 'not a tier'])
+    assert index.bits(rule) is index.bits(rule)
+    assert index.rows(rule).tolist() == [0, 2]
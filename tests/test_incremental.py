@@ -0,0 +1,49 @@
+"""
+BuildCache skip decisions (avu_dashboard.incremental)
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from avu_dashboard.incremental import BuildCache
+
+
+@dataclass
+class Result:
+    rows: int
+    label: str
+
+
+def recorded_cache(cache_dir, output=None, valid_until=None):
+    cache = BuildCache(cache_dir)
+    key = cache.stage_key('score', {'input': 'abc'})
+    outputs = [output] if output else []
+    cache.record('score', key, Result(3, 'x'), outputs=outputs, valid_until=valid_until)
+    cache.save()
+    return key
+
+
+def test_unchanged_stage_is_skipped_and_loaded(tmp_path):
+    key = recorded_cache(tmp_path)
+    cache = BuildCache(tmp_path)
+    assert cache.is_fresh('score', key)
+    assert cache.load('score') == Result(3, 'x')
+    assert not cache.is_fresh('score', cache.stage_key('score', {'input': 'changed'}))
+    assert not BuildCache(tmp_path, force=True).is_fresh('score', key)
+    assert not BuildCache(None).is_fresh('score', key)
+
+
+def test_changed_output_or_expiry_reruns(tmp_path):
+    output = tmp_path / 'page.html'
+    output.write_text('page')
+    key = recorded_cache(tmp_path / 'cache', output, valid_until=datetime.now() + timedelta(hours=1))
+    assert BuildCache(tmp_path / 'cache').is_fresh('score', key)
+    assert not BuildCache(tmp_path / 'cache').is_fresh('score', key, now=datetime.now() + timedelta(hours=2))
+    output.write_text('edited by hand')
+    assert not BuildCache(tmp_path / 'cache').is_fresh('score', key)
+
+
+def test_identical_result_keeps_digest(tmp_path):
+    cache = BuildCache(tmp_path)
+    first = cache.record('score', 'key-1', Result(3, 'x'))
+    assert cache.record('score', 'key-2', Result(3, 'x')) == first
+    assert cache.record('score', 'key-3', Result(4, 'x')) != first
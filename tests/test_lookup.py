@@ -0,0 +1,38 @@
+"""
+KeyIndex lookups (avu_dashboard.lookup) on both storage paths
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from avu_dashboard.lookup import MISSING, KeyIndex
+
+# Close keys take the dense path, keys far apart the sorted one
+DENSE_KEYS = [12, 10, 11, 10, 15]
+SPARSE_KEYS = [5_000_000, 10, 700, 10, 90_000_000]
+
+
+@pytest.mark.parametrize('keys, dense', [(DENSE_KEYS, True), (SPARSE_KEYS, False)])
+def test_positions_first_occurrence_and_misses(keys, dense):
+    index = KeyIndex(keys)
+    assert (index.dense is not None) == dense
+    query = [keys[1], keys[0], keys[4], 3, 10 ** 12, -1]
+    assert index.positions(query).tolist() == [1, 0, 4, MISSING, MISSING, MISSING]
+    assert index.first_rows.tolist() == [0, 1, 2, 4]
+
+
+@pytest.mark.parametrize('keys', [DENSE_KEYS, SPARSE_KEYS])
+def test_take_fills_misses_with_nan(keys):
+    index = KeyIndex(keys)
+    values = pd.Series([1.5, 2.5, 3.5, 4.5, 5.5], name='stock')
+    query = pd.Series([keys[2], 4, keys[4]], index=[7, 8, 9])
+    taken = index.take(values, query)
+    assert taken.name == 'stock'
+    assert taken.index.tolist() == [7, 8, 9]
+    assert taken[7] == 3.5 and taken[9] == 5.5
+    assert np.isnan(taken[8])
+
+
+def test_empty_index_misses_everything():
+    index = KeyIndex([])
+    assert index.positions([1, 2]).tolist() == [MISSING, MISSING]
@@ -0,0 +1,46 @@
+"""
+Page size budgets (avu_dashboard.page_size): warn, fail before writing, and their settings
+"""
+import pytest
+
+from avu_dashboard.config import DashboardPaths, PageOptions, load_settings
+from avu_dashboard.html_builder import DASHBOARD_FILE
+from avu_dashboard.page_size import BudgetExceeded
+from avu_dashboard.pipeline import run_pipeline
+
+# The chart titles' emoji are missing from matplotlib's default font
+pytestmark = pytest.mark.filterwarnings('ignore:Glyph.*missing from font')
+
+
+def build(iron_data, output_dir, **budgets):
+    paths = DashboardPaths(snap_dir=iron_data / 'snapshots', historical_dir=iron_data / 'historical',
+                           output_dir=output_dir, cache_dir=None)
+    return run_pipeline(paths, PageOptions(**budgets), until='html', report=False)
+
+
+def test_warn_budget_only_warns(iron_data, tmp_path, capsys):
+    build(iron_data, tmp_path, size_warn={'page': 1000, 'charts_gzip': 1000})
+    output = capsys.readouterr().out
+    assert "Page size budget exceeded: page is" in output
+    assert "Page size budget exceeded: charts_gzip is" in output
+    assert (tmp_path / DASHBOARD_FILE).is_file()
+
+
+def test_fail_budget_stops_before_the_page_is_written(iron_data, tmp_path):
+    with pytest.raises(BudgetExceeded, match="page not written: total"):
+        build(iron_data, tmp_path, size_fail={'total': 1000})
+    assert not (tmp_path / DASHBOARD_FILE).exists()
+
+
+@pytest.mark.parametrize('table', [
+    '[page.size_warn]\nbogus = 1000',
+    '[page.size_warn]\npage = -5',
+    '[page.size_fail]\npage_gzip = "big"',
+    '[page.size_fail]\ntotal = true',
+    '[page]\nsize_fail = 1000',
+])
+def test_settings_reject_malformed_budgets(tmp_path, table):
+    config = tmp_path / 'dashboard.toml'
+    config.write_text(table + '\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_settings(config, environ={})
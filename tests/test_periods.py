@@ -0,0 +1,32 @@
+"""
+Period winner selection (avu_dashboard.stages.periods)
+"""
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from avu_dashboard.stages.periods import select_period_winners
+
+NOW = datetime(2026, 1, 15, 12, 0)
+
+
+def ranked_winners():
+    """Five campaigns in ranking order, started 1, 20, 2, 40 and 3 days ago, with scattered row labels"""
+    return pd.DataFrame({
+        'Campaign_No': ['C1', 'C2', 'C3', 'C4', 'C5'],
+        'Weighted_Score': [0.9, 0.8, 0.7, 0.6, 0.5],
+        'Starting_Date_dt': [NOW - timedelta(days=days) for days in (1, 20, 2, 40, 3)],
+    }, index=[40, 11, 27, 3, 18])
+
+
+@pytest.mark.parametrize('days, expected_count, expected', [
+    (7, 3, ['C1', 'C3']),          # enough campaigns in the period
+    (1, 1, ['C1', 'C2']),          # topped up with the best overall campaigns
+    (0, 0, ['C1', 'C2']),          # empty period: the overall top
+])
+def test_selection_and_index_shape(days, expected_count, expected):
+    count, top = select_period_winners(ranked_winners(), days, NOW, min_winners=2)
+    assert count == expected_count
+    assert top['Campaign_No'].tolist() == expected
+    assert top.index.tolist() == [0, 1]
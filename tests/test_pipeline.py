@@ -0,0 +1,52 @@
+"""
+Full pipeline runs over synthetic snapshots (avu_dashboard.pipeline)
+"""
+import shutil
+
+import pytest
+
+from avu_dashboard.config import HISTORY_FILE, DashboardPaths, PageOptions
+from avu_dashboard.html_builder import DASHBOARD_FILE
+from avu_dashboard.pipeline import run_pipeline
+
+pytestmark = pytest.mark.filterwarnings('ignore:Glyph.*missing from font')
+
+
+def test_creates_missing_nested_folders(iron_data, tmp_path):
+    paths = DashboardPaths(snap_dir=iron_data / 'snapshots', historical_dir=tmp_path / 'new' / 'historical',
+                           output_dir=tmp_path / 'out' / 'nested' / 'dir', cache_dir=None)
+    run_pipeline(paths, until='html', report=False)
+    assert (paths.output_dir / DASHBOARD_FILE).is_file()
+    assert (paths.historical_dir / HISTORY_FILE).is_file()
+
+
+def test_deleted_outputs_rerun_the_html_stage(iron_data, tmp_path):
+    shutil.copytree(iron_data / 'historical', tmp_path / 'historical')
+    paths = DashboardPaths(snap_dir=iron_data / 'snapshots', historical_dir=tmp_path / 'historical',
+                           output_dir=tmp_path / 'out', cache_dir=tmp_path / 'cache')
+    options = PageOptions(asset_mode='hashed', race_data_gzip=True)
+    first = run_pipeline(paths, options, until='html', report=False)
+    files = first.stage('html').files
+    assert any(path.parent.name == 'data' for path in files)
+    assert any(path.parent.name == 'assets' for path in files)
+    assert all(path.is_file() for path in files)
+    assert 'html' in run_pipeline(paths, options, until='html', report=False).skipped
+
+    shutil.rmtree(paths.output_dir / 'data')
+    assert 'html' in run_pipeline(paths, options, until='html', report=False).ran
+    assert all(path.is_file() for path in files)
+
+    next(path for path in files if path.suffix == '.gz' and path.parent.name == 'assets').unlink()
+    assert 'html' in run_pipeline(paths, options, until='html', report=False).ran
+
+
+def test_page_and_siblings_are_replaced_not_rewritten(iron_data, tmp_path):
+    paths = DashboardPaths(snap_dir=iron_data / 'snapshots', historical_dir=tmp_path / 'historical',
+                           output_dir=tmp_path / 'out', cache_dir=None)
+    run_pipeline(paths, until='html', report=False)
+    page = paths.output_dir / DASHBOARD_FILE
+    before = {path: path.stat().st_ino for path in (page, page.with_name(page.name + '.gz'))}
+    run_pipeline(paths, until='html', report=False)
+    # A new inode: readers of the old file keep a whole page while the new one is renamed in
+    assert all(path.stat().st_ino != inode for path, inode in before.items())
+    assert not list(paths.output_dir.rglob('*.tmp'))
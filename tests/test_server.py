@@ -0,0 +1,167 @@
+"""
+DashboardServer: precompressed variants, conditional requests, live reload and /metrics (avu_dashboard.server)
+"""
+import http.client
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from avu_dashboard.server import DEFAULT_DOCUMENT, IMMUTABLE_CACHE, REVALIDATE_CACHE, DashboardServer
+
+ASSET = 'assets/dashboard.0123456789.js'
+
+
+@pytest.fixture
+def server(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    asset = tmp_path / ASSET
+    asset.write_bytes(b'console.log("dashboard");' * 20)
+    asset.with_name(asset.name + '.br').write_bytes(b'br-bytes')
+    asset.with_name(asset.name + '.gz').write_bytes(b'gz-bytes')
+    (tmp_path / DEFAULT_DOCUMENT).write_text('<html></html>', encoding='utf-8')
+    # Siblings count only when they are not older than their source
+    stat = asset.stat()
+    for suffix in ('.br', '.gz'):
+        os.utime(asset.with_name(asset.name + suffix), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    httpd = DashboardServer(('127.0.0.1', 0), tmp_path)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    thread.join()
+
+
+def request(httpd, path, **headers):
+    connection = http.client.HTTPConnection(*httpd.server_address, timeout=10)
+    try:
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        return response, response.read()
+    finally:
+        connection.close()
+
+
+def test_brotli_variant_then_304(server):
+    response, body = request(server, f'/{ASSET}', **{'Accept-Encoding': 'gzip, br'})
+    assert response.status == 200
+    assert response.getheader('Content-Encoding') == 'br' and body == b'br-bytes'
+    assert response.getheader('Vary') == 'Accept-Encoding'
+    assert response.getheader('Cache-Control') == IMMUTABLE_CACHE
+    etag = response.getheader('ETag')
+    assert etag.endswith('-br"')
+
+    response, body = request(server, f'/{ASSET}', **{'Accept-Encoding': 'gzip, br', 'If-None-Match': etag})
+    assert response.status == 304 and body == b''
+
+
+def test_encoding_follows_accept_encoding(server):
+    response, body = request(server, f'/{ASSET}', **{'Accept-Encoding': 'gzip, br;q=0'})
+    assert response.getheader('Content-Encoding') == 'gzip' and body == b'gz-bytes'
+    response, body = request(server, f'/{ASSET}', **{'Accept-Encoding': 'identity'})
+    assert response.getheader('Content-Encoding') is None and body.startswith(b'console.log')
+    # The other variant's ETag does not validate this one
+    gzip_etag = request(server, f'/{ASSET}', **{'Accept-Encoding': 'gzip'})[0].getheader('ETag')
+    assert request(server, f'/{ASSET}', **{'Accept-Encoding': 'br', 'If-None-Match': gzip_etag})[0].status == 200
+
+
+def test_document_and_missing_files(server):
+    response, body = request(server, '/')
+    assert response.status == 200 and body == b'<html></html>'
+    assert response.getheader('Cache-Control') == REVALIDATE_CACHE
+    assert request(server, '/missing.js')[0].status == 404
+    assert request(server, '/api/winners')[0].status == 404  # no API attached
+
+
+
+def next_build(stream):
+    """Build id of the next "build" event on an open /events stream"""
+    for line in stream:
+        if line.startswith(b'data: '):
+            return json.loads(line[len(b'data: '):])['build']
+
+
+def test_new_build_reaches_open_event_stream(server, tmp_path):
+    (tmp_path / 'build.json').write_text(json.dumps({'build': 'first'}))
+    server.watcher.check()
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+    try:
+        connection.request('GET', '/events')
+        stream = connection.getresponse()
+        assert stream.getheader('Content-Type').startswith('text/event-stream')
+        assert next_build(stream) == 'first'
+        # Picked up by the watcher's polling thread, not by a direct check()
+        (tmp_path / 'build.json').write_text(json.dumps({'build': 'second build'}))
+        assert next_build(stream) == 'second build'
+    finally:
+        connection.close()
+
+
+def metric_values(text):
+    """{'name{labels}': value} from a Prometheus text exposition"""
+    return {name: float(value) for name, value in
+            (line.rsplit(' ', 1) for line in text.splitlines() if line and not line.startswith('#'))}
+
+
+def wait_until_idle(httpd, timeout=5):
+    """Requests are counted after their response went out: wait for the handlers to finish"""
+    deadline = time.monotonic() + timeout
+    while httpd.metrics.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return httpd.metrics.in_flight
+
+
+def test_metrics_count_requests_and_304s(server):
+    etag = request(server, f'/{ASSET}')[0].getheader('ETag')
+    assert request(server, f'/{ASSET}', **{'If-None-Match': etag})[0].status == 304
+    assert request(server, f'/{ASSET}', **{'If-None-Match': '"stale"'})[0].status == 200
+    assert request(server, '/missing.js')[0].status == 404
+    assert wait_until_idle(server) == 0
+
+    response, body = request(server, '/metrics')
+    assert response.status == 200
+    values = metric_values(body.decode('utf-8'))
+    assert values['avu_dashboard_requests_total{route="/assets/*",method="GET",status="200"}'] == 2
+    assert values['avu_dashboard_requests_total{route="/assets/*",method="GET",status="304"}'] == 1
+    assert values['avu_dashboard_requests_total{route="/other",method="GET",status="404"}'] == 1
+    assert values['avu_dashboard_conditional_requests_total'] == 2
+    assert values['avu_dashboard_not_modified_total'] == 1
+    assert values['avu_dashboard_conditional_hit_ratio'] == 0.5
+    assert values['avu_dashboard_in_flight_requests'] == 1  # the /metrics request itself
+    assert wait_until_idle(server) == 0
+
+
+def test_deleted_files_leave_memory_on_new_build(server, tmp_path):
+    assert request(server, f'/{ASSET}')[0].status == 200
+    assert request(server, '/')[0].status == 200
+    assert len(server.store) == 2
+    (tmp_path / ASSET).unlink()
+    server.watcher.check()  # build.json is missing: nothing to announce yet
+    (tmp_path / 'build.json').write_text(json.dumps({'build': 'next'}))
+    server.watcher.check()
+    assert len(server.store) == 1
+
+
+def test_server_close_stops_the_build_watcher(tmp_path):
+    httpd = DashboardServer(('127.0.0.1', 0), tmp_path)
+    httpd.server_close()
+    assert not httpd.watcher._thread.is_alive()
+
+
+class BrokenAPI:
+    def handle(self, path, query):
+        raise RuntimeError("broken")
+
+
+def test_handler_error_counted_as_500(server):
+    server.api = BrokenAPI()
+    server.handle_error = lambda request, client_address: None  # keep the traceback out of the test output
+    with pytest.raises(http.client.RemoteDisconnected):
+        request(server, '/api/winners')
+    assert wait_until_idle(server) == 0
+    values = metric_values(request(server, '/metrics')[1].decode('utf-8'))
+    assert values['avu_dashboard_requests_total{route="/api/winners",method="GET",status="500"}'] == 1
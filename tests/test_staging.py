@@ -0,0 +1,46 @@
+"""
+Local staging of the synced inputs (avu_dashboard.staging)
+"""
+import pickle
+
+from avu_dashboard.config import CAMPAIGN_STATS_FILE, HISTORY_FILE, DashboardPaths
+from avu_dashboard.staging import file_state, publish_history, stage_inputs
+
+
+def synced_paths(tmp_path):
+    snap_dir, historical_dir = tmp_path / 'synced' / 'snapshots', tmp_path / 'synced' / 'historical'
+    snap_dir.mkdir(parents=True)
+    historical_dir.mkdir(parents=True)
+    (snap_dir / CAMPAIGN_STATS_FILE).write_bytes(pickle.dumps({'rows': 1}, protocol=4))
+    (historical_dir / HISTORY_FILE).write_text('{"snapshots": []}')
+    return DashboardPaths(snap_dir=snap_dir, historical_dir=historical_dir, output_dir=tmp_path / 'out',
+                          cache_dir=None, stage_dir=tmp_path / 'local')
+
+
+def test_copies_only_changed_files(tmp_path):
+    paths = synced_paths(tmp_path)
+    staging = stage_inputs(paths)
+    assert staging.copied == [CAMPAIGN_STATS_FILE, HISTORY_FILE]
+    assert file_state(staging.paths.snap_dir / CAMPAIGN_STATS_FILE) == file_state(paths.snap_dir / CAMPAIGN_STATS_FILE)
+    assert stage_inputs(paths).copied == []
+
+
+def test_half_synced_pickle_keeps_staged_copy(tmp_path):
+    paths = synced_paths(tmp_path)
+    staged = stage_inputs(paths).paths.snap_dir / CAMPAIGN_STATS_FILE
+    (paths.snap_dir / CAMPAIGN_STATS_FILE).write_bytes(b'\x80\x04partial')
+    assert stage_inputs(paths).copied == []
+    assert pickle.loads(staged.read_bytes()) == {'rows': 1}
+
+
+def test_publish_history_unless_changed_remotely(tmp_path):
+    paths = synced_paths(tmp_path)
+    staging = stage_inputs(paths)
+    (staging.paths.historical_dir / HISTORY_FILE).write_text('{"snapshots": [1]}')
+    assert publish_history(staging) == [HISTORY_FILE]
+    assert (paths.historical_dir / HISTORY_FILE).read_text() == '{"snapshots": [1]}'
+
+    staging = stage_inputs(paths)
+    (staging.paths.historical_dir / HISTORY_FILE).write_text('{"snapshots": [1, 2]}')
+    (paths.historical_dir / HISTORY_FILE).write_text('{"snapshots": [1, "other machine"]}')
+    assert publish_history(staging) == []
@@ -0,0 +1,11 @@
+"""
+Import-time budget of the entry points (avu_dashboard.startup), run in fresh interpreters
+"""
+from avu_dashboard.startup import check_startup
+
+
+def test_entry_points_within_startup_budget():
+    results = check_startup(runs=3, scale=2)
+    failing = [f"{result.module}: {result.median_ms} ms (budget {result.budget_ms:.0f}), imports {result.forbidden}"
+               for result in results if not result.ok]
+    assert not failing, "\n".join(failing)
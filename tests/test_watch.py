@@ -0,0 +1,97 @@
+"""
+Watch mode over a polled snapshot folder (avu_dashboard.watch)
+"""
+import pickle
+import threading
+import time
+from types import SimpleNamespace
+
+import avu_dashboard.watch as watch
+from avu_dashboard.config import CAMPAIGN_STATS_FILE, STOCK_FILE, DashboardPaths
+from avu_dashboard.watch import PollingWatcher, snapshots_complete, wait_until_settled, watch_snapshots
+
+POLL = 0.02
+DEBOUNCE = 0.3
+
+
+def write_snapshots(snap_dir, version=1):
+    for name in (CAMPAIGN_STATS_FILE, STOCK_FILE):
+        (snap_dir / name).write_bytes(pickle.dumps({'version': version}, protocol=4))
+
+
+def write_later(delay, path, data):
+    timer = threading.Timer(delay, path.write_bytes, args=(data,))
+    timer.start()
+    return timer
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    watcher = PollingWatcher(tmp_path, interval=POLL)
+    assert watcher.wait(0.05) == set()
+    (tmp_path / STOCK_FILE).write_bytes(b'x')
+    assert watcher.wait(1.0) == {STOCK_FILE}
+
+
+def test_partial_pickle_is_not_complete(tmp_path):
+    write_snapshots(tmp_path)
+    assert snapshots_complete(tmp_path) == (True, "")
+    data = (tmp_path / STOCK_FILE).read_bytes()
+    (tmp_path / STOCK_FILE).write_bytes(data[:-3])
+    assert snapshots_complete(tmp_path) == (False, f"{STOCK_FILE} incomplete")
+    (tmp_path / CAMPAIGN_STATS_FILE).unlink()
+    assert snapshots_complete(tmp_path) == (False, f"{CAMPAIGN_STATS_FILE} missing")
+
+
+def test_settles_after_quiet_period_and_complete_pickles(tmp_path):
+    write_snapshots(tmp_path)
+    data = (tmp_path / STOCK_FILE).read_bytes()
+    (tmp_path / STOCK_FILE).write_bytes(data[:-3])
+    watcher = PollingWatcher(tmp_path, interval=POLL)
+    # The sync keeps writing for a while, then finishes the pickle
+    writers = [write_later(0.1 * step, tmp_path / 'sync.tmp', b'x' * step) for step in range(1, 5)]
+    writers.append(write_later(0.6, tmp_path / STOCK_FILE, data))
+    started = time.monotonic()
+    assert wait_until_settled(watcher, tmp_path, DEBOUNCE, threading.Event())
+    assert time.monotonic() - started >= 0.6 + DEBOUNCE * 0.9
+    assert snapshots_complete(tmp_path)[0]
+    for writer in writers:
+        writer.join()
+
+
+def test_stop_ends_the_wait(tmp_path):
+    stop = threading.Event()
+    stop.set()
+    assert not wait_until_settled(PollingWatcher(tmp_path, interval=POLL), tmp_path, DEBOUNCE, stop)
+
+
+def test_new_snapshots_trigger_a_rebuild(tmp_path, monkeypatch):
+    write_snapshots(tmp_path)
+    runs = []
+
+    def fake_pipeline(paths, options, **kwargs):
+        runs.append(time.monotonic())
+        return SimpleNamespace(ran=['load'], skipped=[])
+
+    monkeypatch.setattr(watch, 'run_pipeline', fake_pipeline)
+    stop = threading.Event()
+    builds = []
+    paths = DashboardPaths(snap_dir=tmp_path, historical_dir=tmp_path, output_dir=tmp_path / 'out', cache_dir=None)
+    thread = threading.Thread(target=lambda: builds.append(watch_snapshots(
+        paths, debounce=DEBOUNCE, poll_interval=POLL, polling=True, stop=stop)))
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not runs and time.monotonic() < deadline:
+            time.sleep(POLL)
+        assert len(runs) == 1  # the start build
+        time.sleep(0.1)
+        changed = time.monotonic()
+        write_snapshots(tmp_path, version=2)
+        while len(runs) < 2 and time.monotonic() < deadline:
+            time.sleep(POLL)
+        assert len(runs) == 2
+        assert runs[1] - changed >= DEBOUNCE * 0.9
+    finally:
+        stop.set()
+        thread.join(5)
+    assert builds == [2]